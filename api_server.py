@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Servidor HTTP local (asyncio, só biblioteca padrão) para artigos relacionados e busca.
+
+Responde a partir do que o build já gravou: os relacionados de cada artigo
+vêm de assets/data/related/<id>.json e a busca do índice de
+assets/data/search/. Só um artigo que ainda não está nesses índices
+(publicado depois do último build) é comparado pelo título, sobre os
+metadados carregados na mesma ordem do update_script.py:
+
+- POST /api/related-articles  {"current_path", "current_title", "current_category"}
+- GET  /api/related-articles?path=/articles/<id>.html
+- GET  /api/search?q=<busca>&limit=8
+- GET  /api/health
+
+As respostas de relacionados têm o formato dos JSON estáticos de
+assets/data/related/ e as de busca seguem as regras do índice de
+assets/data/search/, então o blog-global.js pode usar qualquer uma das
+fontes. Cada resposta leva um ETag (If-None-Match devolve 304) e fica em um
+cache LRU. O diretório articles/ e os índices são verificados a cada
+--reload-interval segundos: quando algo muda, o acervo é recarregado em
+segundo plano e substitui o anterior de uma vez, sem derrubar conexões. Um
+erro inesperado vira uma resposta 500, sem fechar a conexão sem resposta.
+
+Feito para rodar atrás do proxy reverso (HTTP/1.1 com keep-alive, sem TLS).
+
+Uso:
+    python api_server.py --port 8081
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+from article_cache import ArticleMetadataCache, content_hash, fingerprint
+from keywords import assign_corpus_keywords
+from related_articles import CATEGORY_WEIGHT, RELATED_INDEX_DIR, RELATED_INDEX_VERSION, related_card
+from search_index import MANIFEST_FILENAME, SEARCH_INDEX_DIR, SEARCH_INDEX_VERSION, SearchIndex, build_search_index, load_search_index
+from update_script import article_filenames, article_signatures, formatar_data_pt, parse_article_metadata, read_article_source
+
+ARTICLES_DIR = 'articles'
+METADATA_CACHE = 'update_script_metadata'  # cache gravado pelo update_script.py
+NUM_RELATED = 3
+MAX_SEARCH_RESULTS = 20
+DEFAULT_SEARCH_RESULTS = 8
+
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 64 * 1024
+KEEP_ALIVE_TIMEOUT = 15  # segundos de espera pela próxima requisição da conexão
+
+REASONS = {
+    200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    413: 'Payload Too Large', 500: 'Internal Server Error',
+}
+
+class HTTPError(Exception):
+    """Erro que vira uma resposta JSON com o status dado."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# --- Acervo em memória ---
+
+def load_article_data(articles_dir=ARTICLES_DIR):
+    """Metadados de todos os artigos, como no update_script.py (sem gravar o cache).
+
+    Os artigos ficam na ordem de article_filenames, o critério de desempate
+    do build.
+    """
+    metadata_cache = ArticleMetadataCache(METADATA_CACHE)
+    article_data = {}
+    for filename in article_filenames(articles_dir):
+        file_path = os.path.join(articles_dir, filename)
+        try:
+            content = read_article_source(file_path)
+        except Exception as e:
+            print(f"⚠️  Erro ao ler {filename}: {str(e)}")
+            continue
+        metadata = metadata_cache.get(file_path, content_hash(content))
+        if metadata is None:
+            metadata, _, error = parse_article_metadata((file_path, content))
+            if metadata is None:
+                print(f"⚠️  Erro ao processar {filename}: {error}")
+                continue
+        article_data[filename[:-len('.html')]] = metadata
+    assign_corpus_keywords(article_data)
+    return article_data
+
+def index_signature(articles_dir=ARTICLES_DIR, related_dir=RELATED_INDEX_DIR, search_dir=SEARCH_INDEX_DIR):
+    """Assinatura dos artigos e dos índices gravados pelo build.
+
+    Os índices são gravados via rename, que altera a data de modificação do
+    diretório de relacionados; o index.json da busca é regravado sempre que
+    algum arquivo da busca muda.
+    """
+    signature = dict(article_signatures(articles_dir))
+    for path in (related_dir, os.path.join(search_dir, MANIFEST_FILENAME)):
+        try:
+            signature[path] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            signature[path] = None
+    return signature
+
+def read_related(article_id, related_dir=RELATED_INDEX_DIR):
+    """Cards do JSON de relacionados gravado pelo build, ou None se ele não existe."""
+    try:
+        with open(os.path.join(related_dir, f'{article_id}.json'), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    return data['related'] if data.get('version') == RELATED_INDEX_VERSION else None
+
+class ArticleCorpus:
+    """Metadados, índice de busca e relacionados gravados de uma versão do acervo."""
+
+    def __init__(self, article_data, search_index, related_dir=RELATED_INDEX_DIR, signature=None):
+        self.article_data = article_data
+        self.search_index = search_index
+        self.related_dir = related_dir
+        self.signature = signature
+        self.version = fingerprint(sorted(signature.items()) if signature is not None else sorted(article_data))[:12]
+
+    @classmethod
+    def load(cls, articles_dir=ARTICLES_DIR, related_dir=RELATED_INDEX_DIR, search_dir=SEARCH_INDEX_DIR):
+        signature = index_signature(articles_dir, related_dir, search_dir)
+        article_data = load_article_data(articles_dir)
+        try:
+            search_index = load_search_index(search_dir)
+        except (OSError, ValueError) as e:
+            # Sem build (ou com um índice de outra versão): monta o índice em memória
+            print(f"⚠️  Índice de busca indisponível ({str(e)}), montando em memória")
+            search_index = SearchIndex(*build_search_index(article_data, formatar_data_pt))
+        return cls(article_data, search_index, related_dir, signature)
+
+    def related(self, path='', title='', category=''):
+        """Cards dos artigos relacionados ao artigo do caminho dado.
+
+        Os cards vêm do JSON gravado pelo build. Um artigo que ainda não
+        está no índice (publicado depois do último build) é comparado pelo
+        título, com bônus para a mesma categoria.
+        """
+        article_id = unquote(os.path.basename(urlsplit(path).path))
+        article_id = article_id[:-len('.html')] if article_id.endswith('.html') else article_id
+        cards = read_related(article_id, self.related_dir) if article_id and article_id in self.article_data else None
+        if cards is not None:
+            return cards
+        related_ids = self.related_by_title(title, category)
+        return [related_card(self.article_data[related_id], formatar_data_pt) for related_id in related_ids]
+
+    def related_by_title(self, title, category):
+        """IDs dos artigos mais parecidos com um título e uma categoria."""
+        ids = {'/' + data['path'].lstrip('/'): article_id for article_id, data in self.article_data.items()}
+        scores = {}
+        for position, (_, path, _, _) in enumerate(self.search_index.search(title, limit=len(self.search_index.docs)) if title else ()):
+            if path in ids:
+                scores[ids[path]] = len(self.article_data) - position
+        if category:
+            for article_id, data in self.article_data.items():
+                if data['category'] == category:
+                    scores[article_id] = scores.get(article_id, 0) + CATEGORY_WEIGHT
+        order = {article_id: position for position, article_id in enumerate(self.article_data)}
+        return sorted(scores, key=lambda article_id: (-scores[article_id], order[article_id]))[:NUM_RELATED]
+
+    def search(self, query, limit=DEFAULT_SEARCH_RESULTS):
+        """Resultados da busca no formato (título, URL, resumo, data)."""
+        return [
+            {'title': title, 'path': path, 'excerpt': excerpt, 'date': date}
+            for title, path, excerpt, date in self.search_index.search(query, limit)
+        ]
+
+# --- Cache de respostas ---
+
+class ResponseCache:
+    """Cache LRU de respostas prontas (corpo e ETag), por versão do acervo."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        if self.size <= 0:
+            return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+def json_response(data):
+    """(corpo, ETag) de uma resposta JSON."""
+    body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return body, '"' + hashlib.sha256(body).hexdigest()[:20] + '"'
+
+# --- Servidor ---
+
+class APIServer:
+    """Servidor HTTP/1.1 mínimo sobre asyncio.start_server."""
+
+    def __init__(self, corpus, articles_dir=ARTICLES_DIR, cache_size=1024, reload_interval=2.0):
+        self.corpus = corpus
+        self.articles_dir = articles_dir
+        self.cache = ResponseCache(cache_size)
+        self.reload_interval = reload_interval
+        self.requests = 0
+
+    # Roteamento
+
+    def route(self, method, target, body):
+        """(status, dados) de uma requisição; levanta HTTPError para erros do cliente."""
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        if url.path == '/api/related-articles':
+            if method == 'POST':
+                try:
+                    payload = json.loads(body or b'{}')
+                except ValueError:
+                    raise HTTPError(400, 'JSON inválido')
+                if not isinstance(payload, dict):
+                    raise HTTPError(400, 'JSON inválido')
+                path, title, category = (str(payload.get(field) or '') for field in ('current_path', 'current_title', 'current_category'))
+            elif method == 'GET':
+                path, title, category = (query.get(field, [''])[0] for field in ('path', 'title', 'category'))
+            else:
+                raise HTTPError(405, 'método não permitido')
+            if not (path or title):
+                raise HTTPError(400, 'informe current_path ou current_title')
+            return {'version': RELATED_INDEX_VERSION, 'related': self.corpus.related(path, title, category)}
+        if url.path == '/api/search':
+            if method != 'GET':
+                raise HTTPError(405, 'método não permitido')
+            text = query.get('q', [''])[0]
+            try:
+                limit = min(max(int(query.get('limit', [DEFAULT_SEARCH_RESULTS])[0]), 1), MAX_SEARCH_RESULTS)
+            except ValueError:
+                raise HTTPError(400, 'limit inválido')
+            return {'version': SEARCH_INDEX_VERSION, 'query': text, 'results': self.corpus.search(text, limit)}
+        if url.path == '/api/health':
+            return {
+                'articles': len(self.corpus.article_data),
+                'version': self.corpus.version,
+                'requests': self.requests,
+                'cache': {'entries': len(self.cache.entries), 'hits': self.cache.hits, 'misses': self.cache.misses},
+            }
+        raise HTTPError(404, 'rota não encontrada')
+
+    def respond(self, method, target, body):
+        """(status, corpo, ETag, cacheável) da requisição, usando o cache LRU."""
+        cacheable = not target.startswith('/api/health')
+        key = (self.corpus.version, method, target, body)
+        if cacheable:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return (200, *cached, True)
+        try:
+            status, (payload, etag) = 200, json_response(self.route(method, target, body))
+        except HTTPError as e:
+            return (e.status, *json_response({'error': str(e)}), False)
+        except Exception as e:
+            print(f"❌ Erro em {method} {target}: {str(e)}")
+            return (500, *json_response({'error': 'erro interno'}), False)
+        if cacheable:
+            self.cache.put(key, (payload, etag))
+        return status, payload, etag, cacheable
+
+    # Protocolo HTTP
+
+    async def read_request(self, reader):
+        """(método, alvo, cabeçalhos, corpo) da próxima requisição, ou None se a conexão fechou."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, 'cabeçalhos grandes demais')
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+        lines = head.decode('latin-1').split('\r\n')
+        try:
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400, 'linha de requisição inválida')
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, 'Content-Length inválido')
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, 'corpo grande demais')
+        body = await reader.readexactly(length) if length else b''
+        headers[':version'] = version
+        return method, target, headers, body
+
+    async def handle_connection(self, reader, writer):
+        """Atende as requisições de uma conexão (keep-alive) até o cliente fechar."""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self.read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    connection = headers.get('connection', '').lower()
+                    keep_alive = connection != 'close' and (headers[':version'] == 'HTTP/1.1' or connection == 'keep-alive')
+                    self.requests += 1
+                    status, payload, etag, cacheable = self.respond(method, target, body)
+                    if status == 200 and etag in (tag.strip() for tag in headers.get('if-none-match', '').split(',')):
+                        status, payload = 304, b''
+                except HTTPError as e:
+                    (payload, etag), status, cacheable = json_response({'error': str(e)}), e.status, False
+                except asyncio.IncompleteReadError:
+                    break
+                except Exception as e:
+                    # Requisição em estado desconhecido: responde e fecha a conexão
+                    print(f"❌ Erro inesperado na conexão: {str(e)}")
+                    (payload, etag), status, cacheable = json_response({'error': 'erro interno'}), 500, False
+                    keep_alive = False
+                response_headers = [
+                    f'HTTP/1.1 {status} {REASONS[status]}',
+                    'Content-Type: application/json; charset=utf-8',
+                    f'Content-Length: {len(payload)}',
+                    f'ETag: {etag}',
+                    'Cache-Control: no-cache' if cacheable else 'Cache-Control: no-store',
+                    'Connection: ' + ('keep-alive' if keep_alive else 'close'),
+                ]
+                writer.write(('\r\n'.join(response_headers) + '\r\n\r\n').encode('latin-1') + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # Recarga do acervo
+
+    async def watch_articles(self):
+        """Recarrega o acervo quando algum artigo ou índice gravado pelo build muda."""
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                signature = await asyncio.to_thread(index_signature, self.articles_dir, self.corpus.related_dir)
+                if signature == self.corpus.signature:
+                    continue
+                started = time.perf_counter()
+                corpus = await asyncio.to_thread(ArticleCorpus.load, self.articles_dir, self.corpus.related_dir)
+            except Exception as e:
+                print(f"❌ Erro ao recarregar os artigos: {str(e)}")
+                continue
+            # Troca de uma vez: requisições em andamento terminam com a versão anterior
+            self.corpus = corpus
+            self.cache.clear()
+            print(f"🔄 Acervo recarregado: {len(corpus.article_data)} artigos em {time.perf_counter() - started:.2f}s (versão {corpus.version})")
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+        print(f"🚀 API em http://{host}:{port} ({len(self.corpus.article_data)} artigos, versão {self.corpus.version})")
+        watcher = asyncio.create_task(self.watch_articles()) if self.reload_interval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher:
+                watcher.cancel()
+
+def main(host, port, cache_size=1024, reload_interval=2.0):
+    started = time.perf_counter()
+    print("📚 Carregando artigos...")
+    corpus = ArticleCorpus.load()
+    print(f"✓ {len(corpus.article_data)} artigos carregados em {time.perf_counter() - started:.2f}s")
+    server = APIServer(corpus, cache_size=cache_size, reload_interval=reload_interval)
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        print("\n👋 Servidor encerrado")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor local de artigos relacionados e busca.')
+    parser.add_argument('--host', default='127.0.0.1', help='endereço de escuta (padrão: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8081, help='porta de escuta (padrão: 8081)')
+    parser.add_argument('--cache-size', type=int, default=1024, help='respostas guardadas no cache LRU (0 desativa)')
+    parser.add_argument('--reload-interval', type=float, default=2.0, help='segundos entre verificações de articles/ e dos índices (0 desativa a recarga)')
+    args = parser.parse_args()
+    main(args.host, args.port, cache_size=args.cache_size, reload_interval=args.reload_interval)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Cache persistente dos metadados extraídos dos artigos.
+
+Cada entrada é indexada pelo caminho do arquivo e validada pelo hash SHA-256
+do conteúdo: se o HTML não mudou desde a última execução, os metadados
+(título, tags, categoria, resumo, imagem, data e palavras-chave) são
+reaproveitados sem um novo parsing. O cache também guarda a assinatura dos
+artigos relacionados gravados em cada arquivo, para que artigos cujo resultado
+não mudou possam ser pulados por completo.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from safe_write import atomic_write
+
+CACHE_DIR = '.cache'
+CACHE_VERSION = 5
+
+def content_hash(content):
+    """Calcula o hash SHA-256 do conteúdo de um arquivo."""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def fingerprint(value):
+    """Calcula um hash estável de qualquer estrutura serializável em JSON."""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+DATE_FIELDS = ('publish_date', 'modified_date')
+
+def _serialize_metadata(metadata):
+    data = dict(metadata)
+    for field in DATE_FIELDS:
+        if isinstance(data.get(field), datetime):
+            data[field] = data[field].isoformat()
+    return data
+
+def _deserialize_metadata(data):
+    metadata = dict(data)
+    for field in DATE_FIELDS:
+        if metadata.get(field):
+            metadata[field] = datetime.fromisoformat(metadata[field])
+    return metadata
+
+class ArticleMetadataCache:
+    """Cache em disco dos metadados de artigos, indexado pelo hash do conteúdo."""
+
+    def __init__(self, name, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, f'{name}.json')
+        self.previous = {}
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def load(self):
+        """Carrega as entradas da execução anterior, se existirem."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.previous = data.get('entries', {})
+
+    def get(self, file_path, digest):
+        """Retorna os metadados em cache se o conteúdo não mudou, senão None."""
+        entry = self.previous.get(file_path)
+        if entry is None or entry['hash'] != digest:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries[file_path] = dict(entry)
+        return _deserialize_metadata(entry['metadata'])
+
+    def put(self, file_path, digest, metadata):
+        """Registra os metadados extraídos de um arquivo com o hash dado."""
+        self.entries[file_path] = {
+            'hash': digest,
+            'metadata': _serialize_metadata(metadata),
+        }
+
+    def discard(self, file_path):
+        """Esquece um arquivo que deixou de existir."""
+        self.entries.pop(file_path, None)
+
+    def related_signature(self, file_path):
+        """Assinatura dos artigos relacionados gravados no arquivo, se conhecida."""
+        entry = self.entries.get(file_path)
+        return entry.get('related') if entry else None
+
+    def set_related_signature(self, file_path, signature):
+        """Marca o arquivo como atualizado com a assinatura de relacionados dada."""
+        if file_path in self.entries:
+            self.entries[file_path]['related'] = signature
+
+    def changed(self):
+        """Caminhos cujos metadados mudaram (ou surgiram/sumiram) desde a execução anterior."""
+        paths = set(self.previous) | set(self.entries)
+        return {
+            path for path in paths
+            if (self.previous.get(path) or {}).get('metadata') != (self.entries.get(path) or {}).get('metadata')
+        }
+
+    def save(self):
+        """Grava o cache em disco, descartando arquivos que não existem mais."""
+        atomic_write(self.path, json.dumps({'version': CACHE_VERSION, 'entries': self.entries}, ensure_ascii=False))
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Catálogo persistente dos artigos em SQLite (.cache/catalog.sqlite3).
+
+Cada artigo é uma linha com colunas indexadas para o slug (o nome do arquivo),
+a data de publicação e a categoria; as tags ficam em uma tabela própria,
+indexada pelo slug da tag, e o texto do corpo em uma tabela FTS5. Listagens
+como "artigos da categoria X", "todas as tags" ou "publicados nos últimos 3
+dias" são consultas sobre esses índices, em vez de varreduras das listas de
+metadados.
+
+O catálogo é sincronizado a cada build a partir dos metadados do
+update_script.py: só linhas que mudaram são regravadas, e o texto do corpo
+só é extraído de novo quando o hash do arquivo muda. O hash guardado é o do
+arquivo como foi gravado ao final do build (com breadcrumbs e relacionados),
+que é o que a próxima execução lê. Sem FTS5 no SQLite do
+Python, a busca usa apenas o título.
+
+Uso:
+    python article_catalog.py --recent 3
+    python article_catalog.py --category inteligencia-artificial
+    python article_catalog.py --tags
+    python article_catalog.py --search "carro autônomo"
+"""
+
+import argparse
+import os
+import sqlite3
+from datetime import datetime, timedelta
+from article_cache import CACHE_DIR
+from site_urls import slugify
+
+CATALOG_PATH = os.path.join(CACHE_DIR, 'catalog.sqlite3')
+CATALOG_VERSION = 1
+# Ordem das listagens: mais recentes primeiro, empates pela ordem do diretório
+LISTING_ORDER = 'publish_date DESC, position'
+
+FIELDS = ('position', 'path', 'title', 'author', 'excerpt', 'image_url', 'category', 'category_slug', 'publish_date', 'modified_date')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS articles (
+    number INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    position INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    excerpt TEXT NOT NULL,
+    image_url TEXT NOT NULL,
+    category TEXT NOT NULL,
+    category_slug TEXT NOT NULL,
+    publish_date TEXT NOT NULL,
+    modified_date TEXT,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS articles_by_date ON articles (publish_date DESC, position);
+CREATE INDEX IF NOT EXISTS articles_by_category ON articles (category_slug, publish_date DESC, position);
+CREATE TABLE IF NOT EXISTS article_tags (
+    article_id TEXT NOT NULL REFERENCES articles (id) ON DELETE CASCADE,
+    tag_slug TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (article_id, tag_slug)
+);
+CREATE INDEX IF NOT EXISTS article_tags_by_slug ON article_tags (tag_slug, article_id);
+'''
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS article_text USING fts5 (
+    title, body, tokenize = 'unicode61 remove_diacritics 2'
+);
+'''
+
+def _date(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def article_row(position, metadata):
+    """Valores das colunas de `articles` (na ordem de FIELDS) para os metadados de um artigo."""
+    category = metadata['category']
+    return (
+        position, metadata['path'], metadata['title'], metadata['author'], metadata['excerpt'],
+        metadata['image_url'], category, slugify(category) if category else '',
+        _date(metadata['publish_date']), _date(metadata.get('modified_date')),
+    )
+
+ROW_COLUMNS = ('id',) + FIELDS
+
+def catalog_row(values):
+    """Dicionário de uma linha de `articles` lida em ROW_COLUMNS, com as datas como datetime."""
+    row = dict(zip(ROW_COLUMNS, values))
+    for field in ('publish_date', 'modified_date'):
+        if row[field]:
+            row[field] = datetime.fromisoformat(row[field])
+    return row
+
+def article_tags(metadata):
+    """{slug: nome} das tags de um artigo (nomes com o mesmo slug contam uma vez)."""
+    return {slugify(name): name for name in metadata['tags'] if name and slugify(name)}
+
+def fts_query(query):
+    """Busca FTS5 com cada palavra entre aspas e a última como prefixo ("robotax" -> robotaxi)."""
+    words = ['"' + word.replace('"', '""') + '"' for word in query.split()]
+    return ' '.join(words) + '*' if words else ''
+
+def most_used(names):
+    """{slug: (nome mais usado, artigos)} a partir de linhas (slug, nome, artigos)."""
+    groups = {}
+    for slug, name, count in names:
+        groups.setdefault(slug, []).append((name, count))
+    return {
+        slug: (min(counts, key=lambda item: (-item[1], item[0]))[0], sum(count for _, count in counts))
+        for slug, counts in groups.items()
+    }
+
+class ArticleCatalog:
+    """Catálogo SQLite dos artigos, sincronizado com os metadados de cada build."""
+
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != CATALOG_VERSION:
+            self.connection.executescript(
+                'DROP TABLE IF EXISTS article_tags; DROP TABLE IF EXISTS articles; DROP TABLE IF EXISTS article_text;'
+                f'PRAGMA user_version = {CATALOG_VERSION};'
+            )
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            print("⚠️  SQLite sem FTS5: a busca do catálogo usa só os títulos")
+            self.fts = False
+
+    def close(self):
+        self.connection.close()
+
+    def hashes(self):
+        """{artigo: hash do conteúdo cujo texto está no catálogo}."""
+        return dict(self.connection.execute('SELECT id, hash FROM articles'))
+
+    def sync(self, article_data, bodies=None, hashes=None):
+        """Atualiza o catálogo para os artigos de `article_data` (na ordem do diretório).
+
+        `bodies` traz {artigo: texto do corpo} dos artigos cujo texto mudou e
+        `hashes` traz {artigo: hash do arquivo gravado}; só hashes diferentes
+        dos guardados são regravados. Artigos que não estão em `article_data`
+        são removidos. Retorna quantos artigos foram inseridos, alterados ou
+        removidos.
+        """
+        bodies = bodies or {}
+        hashes = hashes or {}
+        stored_hashes = self.hashes()
+        columns = ', '.join(ROW_COLUMNS)
+        current = {row[0]: row[1:] for row in self.connection.execute(f'SELECT {columns} FROM articles')}
+        current_tags = {}
+        for article_id, slug, tag in self.connection.execute('SELECT article_id, tag_slug, tag FROM article_tags'):
+            current_tags.setdefault(article_id, {})[slug] = tag
+
+        upserts, tag_rows, texts, digests = [], [], [], []
+        for position, (article_id, metadata) in enumerate(article_data.items()):
+            row = article_row(position, metadata)
+            tags = article_tags(metadata)
+            if current.get(article_id) != row or current_tags.get(article_id, {}) != tags:
+                upserts.append((article_id,) + row)
+                tag_rows.append((article_id, tags))
+            if article_id in bodies:
+                texts.append((article_id, metadata['title'], bodies[article_id]))
+            if article_id in hashes and stored_hashes.get(article_id) != hashes[article_id]:
+                digests.append((hashes[article_id], article_id))
+        removed = [(article_id,) for article_id in current if article_id not in article_data]
+
+        with self.connection:
+            # O texto de cada artigo usa o `number` dele como rowid na tabela FTS5
+            if self.fts:
+                stale = removed + [(article_id,) for article_id, _, _ in texts]
+                self.connection.executemany(
+                    'DELETE FROM article_text WHERE rowid = (SELECT number FROM articles WHERE id = ?)', stale,
+                )
+            self.connection.executemany('DELETE FROM articles WHERE id = ?', removed)
+            placeholders = ', '.join('?' * (len(FIELDS) + 1))
+            updates = ', '.join(f'{field} = excluded.{field}' for field in FIELDS)
+            self.connection.executemany(
+                f'INSERT INTO articles ({columns}) VALUES ({placeholders}) ON CONFLICT (id) DO UPDATE SET {updates}', upserts,
+            )
+            for article_id, tags in tag_rows:
+                self.connection.execute('DELETE FROM article_tags WHERE article_id = ?', (article_id,))
+                self.connection.executemany(
+                    'INSERT INTO article_tags (article_id, tag_slug, tag) VALUES (?, ?, ?)',
+                    [(article_id, slug, tag) for slug, tag in tags.items()],
+                )
+            self.connection.executemany('UPDATE articles SET hash = ? WHERE id = ?', digests)
+            if self.fts:
+                self.connection.executemany(
+                    'INSERT INTO article_text (rowid, title, body) SELECT number, ?, ? FROM articles WHERE id = ?',
+                    [(title, body, article_id) for article_id, title, body in texts],
+                )
+        return len(upserts) + len(removed)
+
+    def _ids(self, sql, parameters=()):
+        return [row[0] for row in self.connection.execute(sql, parameters)]
+
+    def latest(self, limit=-1):
+        """Artigos do mais recente para o mais antigo (todos, ou os `limit` primeiros)."""
+        return self._ids(f'SELECT id FROM articles ORDER BY {LISTING_ORDER} LIMIT ?', (limit,))
+
+    def published_since(self, since):
+        """Artigos publicados a partir de `since` (datetime), do mais recente para o mais antigo."""
+        return self._ids(f'SELECT id FROM articles WHERE publish_date >= ? ORDER BY {LISTING_ORDER}', (since.isoformat(),))
+
+    def recent(self, days, now=None):
+        """Artigos publicados nos últimos `days` dias."""
+        today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return self.published_since(today - timedelta(days=days))
+
+    def in_category(self, slug):
+        """Artigos de uma categoria (pelo slug), do mais recente para o mais antigo."""
+        return self._ids(f'SELECT id FROM articles WHERE category_slug = ? ORDER BY {LISTING_ORDER}', (slug,))
+
+    def with_tag(self, slug):
+        """Artigos de uma tag (pelo slug), do mais recente para o mais antigo."""
+        return self._ids(
+            'SELECT id FROM article_tags JOIN articles ON articles.id = article_tags.article_id '
+            f'WHERE tag_slug = ? ORDER BY {LISTING_ORDER}', (slug,),
+        )
+
+    def categories(self):
+        """{slug: (nome mais usado, número de artigos)} de todas as categorias."""
+        return most_used(self.connection.execute(
+            "SELECT category_slug, category, COUNT(*) FROM articles WHERE category_slug != '' GROUP BY category_slug, category"
+        ))
+
+    def tags(self):
+        """{slug: (nome mais usado, número de artigos)} de todas as tags."""
+        return most_used(self.connection.execute('SELECT tag_slug, tag, COUNT(*) FROM article_tags GROUP BY tag_slug, tag'))
+
+    def search(self, query, limit=10):
+        """Artigos cujo título ou corpo contém as palavras da busca, os mais relevantes primeiro."""
+        if not query.split():
+            return []
+        if not self.fts:
+            return self._ids(
+                f'SELECT id FROM articles WHERE title LIKE ? ORDER BY {LISTING_ORDER} LIMIT ?', (f'%{query.strip()}%', limit),
+            )
+        return self._ids(
+            'SELECT id FROM article_text JOIN articles ON articles.number = article_text.rowid '
+            'WHERE article_text MATCH ? ORDER BY bm25(article_text, 4, 1) LIMIT ?',
+            (fts_query(query), limit),
+        )
+
+    def articles(self, article_ids):
+        """Linhas do catálogo (dicionários, com as datas como datetime) dos artigos dados, na mesma ordem."""
+        rows = {}
+        for start in range(0, len(article_ids), 500):
+            chunk = article_ids[start:start + 500]
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(ROW_COLUMNS)} FROM articles WHERE id IN ({', '.join('?' * len(chunk))})", chunk,
+            )
+            for values in cursor:
+                row = catalog_row(values)
+                rows[row['id']] = row
+        return [rows[article_id] for article_id in article_ids if article_id in rows]
+
+    def iter_latest(self):
+        """Linhas de todos os artigos, do mais recente para o mais antigo, lidas do cursor uma a uma."""
+        cursor = self.connection.execute(f"SELECT {', '.join(ROW_COLUMNS)} FROM articles ORDER BY {LISTING_ORDER}")
+        for values in cursor:
+            yield catalog_row(values)
+
+    def last_modified(self):
+        """Maior data de modificação (ou de publicação) entre os artigos, ou None se não houver artigos."""
+        value = self.connection.execute(
+            'SELECT MAX(MAX(publish_date, COALESCE(modified_date, publish_date))) FROM articles'
+        ).fetchone()[0]
+        return datetime.fromisoformat(value) if value else None
+
+def print_articles(catalog, article_ids):
+    for row in catalog.articles(article_ids):
+        print(f"{row['publish_date']:%Y-%m-%d}  {row['category']:<24.24}  {row['path']}")
+    print(f"📚 {len(article_ids)} artigos")
+
+def print_groups(groups):
+    for slug, (name, count) in sorted(groups.items(), key=lambda item: (-item[1][1], item[1][0])):
+        print(f"{count:>5}  {name}  ({slug})")
+    print(f"🏷️  {len(groups)} no total")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Consulta o catálogo de artigos gerado pelo update_script.py.')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--recent', type=int, metavar='DIAS', help='artigos publicados nos últimos DIAS dias')
+    query.add_argument('--category', metavar='SLUG', help='artigos de uma categoria')
+    query.add_argument('--tag', metavar='SLUG', help='artigos de uma tag')
+    query.add_argument('--categories', action='store_true', help='todas as categorias, com o número de artigos')
+    query.add_argument('--tags', action='store_true', help='todas as tags, com o número de artigos')
+    query.add_argument('--search', metavar='BUSCA', help='busca no título e no corpo dos artigos')
+    parser.add_argument('--catalog', default=CATALOG_PATH, help=f'caminho do catálogo (padrão: {CATALOG_PATH})')
+    args = parser.parse_args()
+    if not os.path.exists(args.catalog):
+        raise SystemExit(f"Catálogo não encontrado em {args.catalog}: execute o update_script.py antes")
+
+    catalog = ArticleCatalog(args.catalog)
+    if args.recent is not None:
+        print_articles(catalog, catalog.recent(args.recent))
+    elif args.category:
+        print_articles(catalog, catalog.in_category(args.category))
+    elif args.tag:
+        print_articles(catalog, catalog.with_tag(args.tag))
+    elif args.categories:
+        print_groups(catalog.categories())
+    elif args.tags:
+        print_groups(catalog.tags())
+    else:
+        print_articles(catalog, catalog.search(args.search))
+    catalog.close()
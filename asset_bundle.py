@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Versões minificadas e com fingerprint do blog-global.css e do blog-global.js.
+
+Cada arquivo de BUNDLES é minificado e gravado ao lado do original com o
+hash do conteúdo no nome (assets/css/blog-global.<hash>.min.css). Como o
+nome muda sempre que o conteúdo muda, esses arquivos podem ser servidos com
+cache de longa duração (Cache-Control: max-age=31536000, immutable).
+
+O manifesto assets/data/assets.json liga cada original à sua versão atual, e
+todas as páginas (index.html, artigos e listagens) têm seus <link>/<script>
+apontados para ela, mantendo o prefixo de cada página (../, /, URL
+absoluta). Os originais continuam sendo os arquivos editados; o template de
+artigos também continua apontando para eles, e a próxima execução atualiza
+as referências dos artigos novos.
+
+A minificação é conservadora (remove comentários e espaços, preservando
+strings, template strings e expressões regulares do JavaScript) para não
+depender de ferramentas externas.
+
+Uso:
+    python asset_bundle.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from asset_graph import site_files
+from safe_write import write_if_changed
+from build_profile import BuildProfiler, add_profile_argument
+
+BUNDLES = (
+    os.path.join('assets', 'css', 'blog-global.css'),
+    os.path.join('assets', 'js', 'blog-global.js'),
+)
+MANIFEST_PATH = os.path.join('assets', 'data', 'assets.json')
+MANIFEST_VERSION = 1
+HASH_LENGTH = 10
+# Páginas que não são publicadas como estão
+EXCLUDED_PAGES = ('templates/',)
+
+# --- CSS ---
+
+CSS_TOKEN = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/)''', re.DOTALL)
+CSS_SPACE = re.compile(r'\s+')
+# Espaços removíveis: em volta de { } ; , > e depois de : (antes de : não,
+# pois "a :hover" e "a:hover" são seletores diferentes)
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*|:\s+')
+
+def minify_css(css):
+    """CSS sem comentários e espaços desnecessários (strings preservadas)."""
+    # Trechos alternados [código, string, código, ...], com os comentários já removidos
+    parts = ['']
+    for index, part in enumerate(CSS_TOKEN.split(css)):
+        if index % 2 == 0 or part.startswith('/*'):
+            parts[-1] += part if index % 2 == 0 else ' '
+        else:
+            parts.extend((part, ''))
+    for index in range(0, len(parts), 2):
+        code = CSS_SPACE.sub(' ', parts[index])
+        parts[index] = CSS_PUNCTUATION.sub(lambda match: match.group(1) or ':', code)
+    return ''.join(parts).replace(';}', '}').strip() + '\n'
+
+# --- JavaScript ---
+
+# Depois destes caracteres (ou palavras), uma / inicia uma expressão regular
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'instanceof', 'yield', 'await'}
+IDENTIFIER_END = re.compile(r'[\w$]+$')
+# Espaços em volta destes caracteres nunca separam tokens
+JS_PUNCTUATION = '{}()[];,:=<>!&|?*%'
+JS_SPACE = re.compile(r' ?([%s]) ?' % re.escape(JS_PUNCTUATION))
+# Quebras de linha depois destes caracteres não afetam a inserção automática de ;
+JS_JOIN_AFTER = '{;,(['
+
+def _regex_allowed(previous):
+    """True se uma / depois do texto `previous` inicia uma expressão regular."""
+    previous = previous.rstrip()
+    if not previous or previous[-1] in REGEX_PRECEDERS:
+        return True
+    word = IDENTIFIER_END.search(previous)
+    return bool(word) and word.group() in REGEX_KEYWORDS
+
+def _literal_end(js, start):
+    """Posição logo após a string ou expressão regular iniciada em `start`."""
+    quote = js[start]
+    position = start + 1
+    in_class = False
+    while position < len(js) and js[position] != '\n':
+        char = js[position]
+        if char == '\\':
+            position += 1
+        elif quote == '/' and char in '[]':
+            in_class = char == '['
+        elif char == quote and not in_class:
+            return position + 1
+        position += 1
+    raise ValueError(f'literal não terminado na posição {start}')
+
+def _template_end(js, start):
+    """Fim do trecho de template string iniciado em `start` (até o ` ou o próximo ${)."""
+    position = start + 1
+    while position < len(js):
+        if js[position] == '\\':
+            position += 2
+        elif js[position] == '`':
+            return position + 1, False
+        elif js.startswith('${', position):
+            return position + 2, True
+        else:
+            position += 1
+    raise ValueError(f'template string não terminada na posição {start}')
+
+def js_segments(js):
+    """Divide o código em trechos [código, literal, código, ...].
+
+    Os literais (strings, expressões regulares e os trechos de texto das
+    template strings) são copiados como estão; os comentários são trocados
+    por um espaço (ou uma quebra de linha, se tinham uma).
+    """
+    segments = []
+    code = []
+    position = 0
+    stack = []  # chaves abertas dentro de cada ${...} em andamento
+    while position < len(js):
+        char = js[position]
+        following = js[position + 1:position + 2]
+        if char == '/' and following == '/':
+            end = js.find('\n', position)
+            position = len(js) if end == -1 else end
+            code.append(' ')
+            continue
+        if char == '/' and following == '*':
+            end = js.index('*/', position + 2) + 2
+            code.append('\n' if '\n' in js[position:end] else ' ')
+            position = end
+            continue
+        if char == '/':
+            # Divisão ou expressão regular, conforme o que vem antes
+            previous = ''.join(code).strip() or (segments[-1] if segments else '')
+            is_literal = _regex_allowed(previous)
+        else:
+            is_literal = char in '"\''
+        if is_literal:
+            end = _literal_end(js, position)
+        elif char == '`' or (char == '}' and stack and stack[-1] == 0):
+            if char == '}':
+                stack.pop()
+            end, opened = _template_end(js, position)
+            if opened:
+                stack.append(0)
+        else:
+            if stack and char in '{}':
+                stack[-1] += 1 if char == '{' else -1
+            code.append(char)
+            position += 1
+            continue
+        segments.extend((''.join(code), js[position:end]))
+        code = []
+        position = end
+    segments.append(''.join(code))
+    return segments
+
+def compact_js(code):
+    """Reduz os espaços de um trecho de código, sem juntar tokens nem mudar a inserção de ;."""
+    body = code.strip()
+    if not body:
+        return '\n' if '\n' in code else code[:1]
+    lines = [' '.join(line.split()) for line in body.split('\n')]
+    result = ''
+    for line in filter(None, lines):
+        separator = '' if not result or result[-1] in JS_JOIN_AFTER else '\n'
+        result += separator + JS_SPACE.sub(r'\1', line)
+    leading = code[:len(code) - len(code.lstrip())]
+    trailing = code[len(code.rstrip()):]
+    if '\n' in leading:
+        result = '\n' + result
+    elif leading and result[0] not in JS_PUNCTUATION:
+        result = ' ' + result
+    if trailing and result[-1] not in JS_PUNCTUATION:
+        result += '\n' if '\n' in trailing else ' '
+    elif '\n' in trailing and result[-1] not in JS_JOIN_AFTER:
+        result += '\n'
+    return result
+
+def minify_js(js):
+    """JavaScript sem comentários, linhas em branco e indentação.
+
+    Strings, template strings e expressões regulares são copiadas sem
+    alteração; as quebras de linha só são removidas onde não podem mudar a
+    inserção automática de ponto e vírgula.
+    """
+    segments = js_segments(js)
+    return ''.join(
+        compact_js(segment) if index % 2 == 0 else segment
+        for index, segment in enumerate(segments)
+    ).strip() + '\n'
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+# --- Fingerprint e manifesto ---
+
+def fingerprint_path(source, content):
+    """Caminho da versão minificada: <nome>.<hash>.min.<extensão>, ao lado do original."""
+    base, extension = os.path.splitext(source)
+    digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+    return f'{base}.{digest}.min{extension}'
+
+def fingerprint_pattern(source):
+    """Expressão que reconhece o nome original e todas as versões com fingerprint de um arquivo."""
+    base, extension = os.path.splitext(os.path.basename(source))
+    return re.escape(base) + r'(?:\.[0-9a-f]{%d}\.min)?' % HASH_LENGTH + re.escape(extension)
+
+def remove_stale_bundles(source, current):
+    """Remove versões antigas de um arquivo. Retorna quantas foram removidas."""
+    directory = os.path.dirname(source)
+    pattern = re.compile(fingerprint_pattern(source) + '$')
+    removed = 0
+    for filename in os.listdir(directory):
+        path = os.path.join(directory, filename)
+        if pattern.match(filename) and path not in (source, current):
+            os.remove(path)
+            removed += 1
+    return removed
+
+def build_bundle(source):
+    """Minifica um arquivo e grava sua versão com fingerprint. Retorna (caminho, tamanho original, tamanho final)."""
+    with open(source, 'r', encoding='utf-8') as f:
+        original = f.read()
+    extension = os.path.splitext(source)[1]
+    minified = MINIFIERS[extension](original)
+    path = fingerprint_path(source, minified)
+    write_if_changed(path, minified)
+    return path, len(original.encode('utf-8')), len(minified.encode('utf-8'))
+
+def reference_pattern(bundles):
+    """Expressão que encontra, em atributos href/src, referências a qualquer versão dos arquivos."""
+    alternatives = '|'.join(
+        re.escape(os.path.dirname(source).replace(os.path.sep, '/') + '/') + f'(?P<b{index}>{fingerprint_pattern(source)})'
+        for index, source in enumerate(bundles)
+    )
+    return re.compile(r'''(?P<prefix>\b(?:href|src)\s*=\s*["'][^"'<>]*?)(?:%s)(?=["'?#])''' % alternatives)
+
+def rewrite_references(html, pattern, manifest):
+    """Aponta os <link>/<script> de uma página para as versões atuais, mantendo o prefixo da URL."""
+    def replace(match):
+        index = next(int(name[1:]) for name, value in match.groupdict().items() if name != 'prefix' and value)
+        return match.group('prefix') + manifest[BUNDLES[index].replace(os.path.sep, '/')]
+    return pattern.sub(replace, html)
+
+def read_manifest(path=MANIFEST_PATH):
+    """Manifesto gravado pela última execução (vazio se não houver)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('assets', {}) if data.get('version') == MANIFEST_VERSION else {}
+
+def update_pages(manifest, profiler):
+    """Atualiza as referências de todas as páginas publicadas. Retorna quantas mudaram."""
+    pattern = reference_pattern(BUNDLES)
+    changed = 0
+    for path in site_files():
+        if not path.endswith('.html') or path.startswith(EXCLUDED_PAGES):
+            continue
+        with profiler.article(path):
+            with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                html = f.read()
+            rewritten = rewrite_references(html, pattern, manifest)
+            if rewritten != html and write_if_changed(path, rewritten.encode('utf-8', 'surrogateescape')):
+                changed += 1
+    return changed
+
+def build_assets(profile=None):
+    """Gera as versões minificadas, grava o manifesto e atualiza as páginas."""
+    profiler = BuildProfiler('asset_bundle', profile)
+    print("📦 Minificando CSS e JavaScript...")
+    manifest = {}
+    removed = 0
+    with profiler.stage('minify'):
+        for source in BUNDLES:
+            path, original_size, minified_size = build_bundle(source)
+            manifest[source.replace(os.path.sep, '/')] = path.replace(os.path.sep, '/')
+            removed += remove_stale_bundles(source, path)
+            print(f"  ✓ {path} ({original_size / 1024:.1f} KB -> {minified_size / 1024:.1f} KB)")
+    with profiler.stage('manifest'):
+        write_if_changed(MANIFEST_PATH, json.dumps({'version': MANIFEST_VERSION, 'assets': manifest}, indent=1) + '\n')
+    with profiler.stage('pages'):
+        changed = update_pages(manifest, profiler)
+    print(f"\n📊 Páginas atualizadas: {changed} | 🗑️  Versões antigas removidas: {removed}")
+    profiler.finish()
+    return manifest
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Minifica e versiona o CSS e o JavaScript do blog.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    build_assets(profile=args.profile)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Grafo de referências entre as páginas e os arquivos do site.
+
+Cada página HTML (index.html, artigos, listagens), folha de estilo, script e
+JSON publicado em assets/data é lido uma única vez, e as referências locais
+(src, href, srcset, og:image, url() do CSS, caminhos nos scripts) são
+resolvidas para arquivos do repositório. Com o grafo montado, o relatório
+aponta:
+
+- referências quebradas (imagens e links para arquivos que não existem);
+- imagens que nenhuma página referencia (e que podem ser removidas com
+  --prune, apenas dentro de assets/imagens);
+- artigos que nenhuma outra página referencia;
+- arquivos com conteúdo idêntico (hash SHA-256, calculado apenas entre
+  arquivos do mesmo tamanho).
+
+O relatório completo é gravado em .cache/asset_graph.json.
+
+Uso:
+    python asset_graph.py             # apenas relatório
+    python asset_graph.py --prune     # remove as imagens órfãs de assets/imagens
+    python asset_graph.py --strict    # termina com erro se houver referências quebradas
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+from collections import defaultdict
+from html import unescape
+from urllib.parse import unquote, urlsplit
+from safe_write import atomic_write, file_hash
+from site_urls import SITE_HOSTS
+from image_pipeline import MANIFEST_PATH, OUTPUT_DIR, SOURCE_DIR
+from build_profile import BuildProfiler, add_profile_argument
+
+REPORT_PATH = os.path.join('.cache', 'asset_graph.json')
+EXCLUDED_DIRS = {'.git', '.github', '.cache', 'templates', 'node_modules', '__pycache__'}
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.avif', '.gif', '.svg', '.ico')
+# Arquivos estáticos comparados na busca por duplicatas (páginas e JSON são gerados)
+ASSET_EXTENSIONS = IMAGE_EXTENSIONS + ('.css', '.js')
+PRUNABLE_DIRS = (SOURCE_DIR.replace(os.path.sep, '/') + '/',)
+# Variantes do image_pipeline: ele mesmo remove as de imagens que deixaram de existir
+GENERATED_DIRS = (OUTPUT_DIR.replace(os.path.sep, '/') + '/',)
+# Gerado a partir de assets/imagens: não conta como referência às imagens originais
+IGNORED_SOURCES = {MANIFEST_PATH.replace(os.path.sep, '/')}
+
+HTML_ATTRIBUTE = re.compile(r'''\s(src|href|srcset|content|poster|data-src)\s*=\s*(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+CSS_URL = re.compile(r'''url\(\s*['"]?([^'")]+?)['"]?\s*\)''')
+SCRIPT_PATH = re.compile(r'''['"`](/?(?:assets|articles)/[^'"`$\s]+)['"`]''')
+IGNORED_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:')
+
+def site_files(root='.'):
+    """Todos os arquivos do site, com caminhos relativos e separados por '/'."""
+    files = []
+    for directory, dirs, filenames in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in EXCLUDED_DIRS)
+        for filename in sorted(filenames):
+            path = os.path.relpath(os.path.join(directory, filename), root)
+            files.append(path.replace(os.path.sep, '/'))
+    return files
+
+def resolve_reference(reference, source):
+    """Caminho local de uma referência feita em `source`, ou None se ela for externa.
+
+    URLs absolutas do próprio domínio, caminhos a partir da raiz e caminhos
+    relativos são aceitos; diretórios apontam para seu index.html.
+    """
+    reference = reference.strip()
+    if not reference or reference.startswith('#') or reference.lower().startswith(IGNORED_SCHEMES):
+        return None
+    parts = urlsplit(reference)
+    if (parts.scheme and parts.scheme not in ('http', 'https')) or parts.netloc not in SITE_HOSTS:
+        return None
+    path = unquote(parts.path)
+    if not path:
+        return None
+    if path.startswith('/'):
+        resolved = posixpath.normpath(path.lstrip('/') or '.')
+    else:
+        resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+    if resolved == '.':
+        return 'index.html'
+    if path.endswith('/'):
+        return f'{resolved}/index.html'
+    return resolved
+
+def html_references(content):
+    """Referências (valores crus) dos atributos de uma página HTML."""
+    references = []
+    for match in HTML_ATTRIBUTE.finditer(content):
+        attribute = match.group(1).lower()
+        value = unescape(match.group(2) if match.group(2) is not None else match.group(3))
+        if attribute == 'srcset':
+            references.extend(candidate.split()[0] for candidate in value.split(',') if candidate.strip())
+        elif attribute == 'content':
+            # Só meta tags com URL (og:image, twitter:image...), não textos
+            if value.startswith(('http://', 'https://', '/')):
+                references.append(value)
+        else:
+            references.append(value)
+    return references
+
+def json_references(value):
+    """Strings de um JSON publicado que parecem caminhos do site (inclusive srcset)."""
+    if isinstance(value, dict):
+        return [reference for item in value.values() for reference in json_references(item)]
+    if isinstance(value, list):
+        return [reference for item in value for reference in json_references(item)]
+    if isinstance(value, str) and value.startswith(('http://', 'https://', '/', '../')):
+        return [candidate.split()[0] for candidate in value.split(', ') if candidate.strip()]
+    return []
+
+def file_references(path, content):
+    """Referências feitas por um arquivo, de acordo com seu tipo."""
+    if path.endswith('.html'):
+        return html_references(content)
+    if path.endswith('.css'):
+        return CSS_URL.findall(content)
+    if path.endswith('.js'):
+        # Prefixos de diretório (como '/assets/data/related/') não são arquivos
+        return [reference for reference in SCRIPT_PATH.findall(content) if not reference.endswith('/')]
+    if path.endswith('.json'):
+        try:
+            return json_references(json.loads(content))
+        except ValueError:
+            return []
+    return []
+
+class AssetGraph:
+    """Arquivos do site e as referências entre eles."""
+
+    def __init__(self, root='.'):
+        self.root = root
+        self.files = site_files(root)
+        self.file_set = set(self.files)
+        self.references = {}             # arquivo -> {destino: referência original}
+        self.inbound = defaultdict(set)  # destino -> arquivos que o referenciam
+
+    def scan(self):
+        """Lê cada arquivo que pode conter referências uma única vez."""
+        for path in self.files:
+            if path in IGNORED_SOURCES or not path.endswith(('.html', '.css', '.js', '.json')):
+                continue
+            with open(os.path.join(self.root, path), 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+            targets = {}
+            for reference in file_references(path, content):
+                target = resolve_reference(reference, path)
+                if target and target != path:
+                    targets.setdefault(target, reference)
+            self.references[path] = targets
+            for target in targets:
+                self.inbound[target].add(path)
+        return self
+
+    def broken_references(self):
+        """(arquivo, referência, destino) de cada referência a um arquivo inexistente."""
+        return [
+            (source, reference, target)
+            for source, targets in self.references.items()
+            for target, reference in targets.items()
+            if target not in self.file_set
+        ]
+
+    def orphan_images(self):
+        """Imagens que nenhum arquivo referencia."""
+        return [
+            path for path in self.files
+            if path.lower().endswith(IMAGE_EXTENSIONS) and not path.startswith(GENERATED_DIRS)
+            and not self.inbound.get(path)
+        ]
+
+    def orphan_articles(self):
+        """Artigos que nenhuma outra página referencia."""
+        return [
+            path for path in self.files
+            if path.startswith('articles/') and path.endswith('.html') and not self.inbound.get(path)
+        ]
+
+    def duplicates(self):
+        """Grupos de imagens, estilos e scripts com conteúdo idêntico."""
+        by_size = defaultdict(list)
+        for path in self.files:
+            if path.lower().endswith(ASSET_EXTENSIONS) and not path.startswith(GENERATED_DIRS):
+                by_size[os.path.getsize(os.path.join(self.root, path))].append(path)
+        groups = []
+        for size, paths in by_size.items():
+            if len(paths) < 2 or size == 0:
+                continue
+            by_hash = defaultdict(list)
+            for path in paths:
+                by_hash[file_hash(os.path.join(self.root, path))].append(path)
+            groups.extend(group for group in by_hash.values() if len(group) > 1)
+        return sorted(groups)
+
+def prune_orphan_images(graph, orphans):
+    """Remove as imagens órfãs dentro de PRUNABLE_DIRS. Retorna (arquivos, bytes) removidos."""
+    removed, freed = 0, 0
+    for path in orphans:
+        if path.startswith(PRUNABLE_DIRS):
+            full_path = os.path.join(graph.root, path)
+            freed += os.path.getsize(full_path)
+            os.remove(full_path)
+            removed += 1
+    return removed, freed
+
+def format_bytes(size):
+    """Tamanho legível (KB/MB)."""
+    return f"{size / 1024 / 1024:.1f} MB" if size >= 1024 * 1024 else f"{size / 1024:.1f} KB"
+
+def main(prune=False, strict=False, output=REPORT_PATH, profile=None):
+    """Monta o grafo, imprime o resumo e grava o relatório. Retorna o código de saída."""
+    profiler = BuildProfiler('asset_graph', profile)
+    print("🔎 Montando o grafo de referências do site...")
+    with profiler.stage('scan'):
+        graph = AssetGraph().scan()
+    with profiler.stage('analyze'):
+        broken = graph.broken_references()
+        orphan_images = graph.orphan_images()
+        orphan_articles = graph.orphan_articles()
+    with profiler.stage('hash'):
+        duplicates = graph.duplicates()
+
+    orphan_bytes = sum(os.path.getsize(path) for path in orphan_images)
+    duplicate_bytes = sum(os.path.getsize(group[0]) * (len(group) - 1) for group in duplicates)
+    report = {
+        'files': len(graph.files),
+        'scanned': len(graph.references),
+        'references': sum(len(targets) for targets in graph.references.values()),
+        'broken': [{'source': source, 'reference': reference, 'target': target} for source, reference, target in broken],
+        'orphan_images': orphan_images,
+        'orphan_articles': orphan_articles,
+        'duplicates': duplicates,
+    }
+    atomic_write(output, json.dumps(report, ensure_ascii=False, indent=2))
+
+    print(f"\n📊 Arquivos: {report['files']} | Lidos: {report['scanned']} | Referências locais: {report['references']}")
+    print(f"   ❌ Referências quebradas: {len(broken)} (em {len({source for source, _, _ in broken})} arquivos)")
+    for source, reference, _ in broken[:10]:
+        print(f"      {source} -> {reference}")
+    print(f"   🖼️  Imagens órfãs: {len(orphan_images)} ({format_bytes(orphan_bytes)})")
+    print(f"   📄 Artigos sem nenhum link: {len(orphan_articles)}")
+    print(f"   ♊ Grupos de arquivos idênticos: {len(duplicates)} ({format_bytes(duplicate_bytes)} repetidos)")
+
+    if prune:
+        removed, freed = prune_orphan_images(graph, orphan_images)
+        print(f"   🗑️  Imagens removidas de {', '.join(PRUNABLE_DIRS)}: {removed} ({format_bytes(freed)})")
+    print(f"Relatório completo gravado em {output}")
+    profiler.finish()
+    return 1 if strict and broken else 0
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Verifica referências, arquivos órfãos e duplicados do site.')
+    parser.add_argument('--prune', action='store_true', help='remove as imagens órfãs de assets/imagens')
+    parser.add_argument('--strict', action='store_true', help='termina com erro se houver referências quebradas')
+    parser.add_argument('--output', default=REPORT_PATH, metavar='ARQUIVO', help=f'relatório JSON (padrão: {REPORT_PATH})')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    sys.exit(main(prune=args.prune, strict=args.strict, output=args.output, profile=args.profile))
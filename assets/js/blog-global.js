@@ -173,97 +173,68 @@ function trackEvent(category, action, label) {
     });
 }
 
-// ===== FILTRO POR CATEGORIA =====
-function filterArticlesByCategory() {
-    // Verificar se existe um parâmetro 'categoria' na URL
+// ===== CATEGORIAS E TAGS =====
+// Cada categoria e tag tem uma página estática (/categorias/<slug>/, /tags/<slug>/)
+// gerada pelo update_script.py; links antigos (/?categoria=..., /?tag=...) são redirecionados
+function slugify(name) {
+    return name
+        .normalize('NFKD')
+        .replace(/[^\x00-\x7f]/g, '')
+        .toLowerCase()
+        .replace(/[^a-z0-9_.-]+/g, '-')
+        .replace(/^[-.]+|[-.]+$/g, '');
+}
+
+function redirectLegacyListingUrl() {
     const urlParams = new URLSearchParams(window.location.search);
     const category = urlParams.get('categoria');
     const tag = urlParams.get('tag');
     
-    if (!category && !tag) return; // Se não há categoria nem tag, mostra todos os artigos
-    
-    // Atualizar título da seção
-    const newsTitle = document.querySelector('#ultimas-noticias .section-title');
-    if (newsTitle) {
-        if (category) {
-            const displayCategory = decodeURIComponent(category).replace(/-/g, ' ');
-            const capitalizedCategory = displayCategory.charAt(0).toUpperCase() + displayCategory.slice(1);
-            newsTitle.innerHTML = `Artigos: <span class="category-highlight">${capitalizedCategory}</span>`;
-        } else if (tag) {
-            const displayTag = decodeURIComponent(tag).replace(/-/g, ' ');
-            newsTitle.innerHTML = `Tag: <span class="category-highlight">${displayTag}</span>`;
-        }
-    }
-    
-    // Selecionar todos os cards de artigos
-    const articleCards = document.querySelectorAll('.article-card');
-    
-    // Contador de artigos visíveis
-    let visibleCount = 0;
-    
-    // Filtrar artigos
-    articleCards.forEach(card => {
-        let shouldDisplay = false;
-        
-        if (category) {
-            // Usar o atributo de dados para o filtro de categoria
-            const cardCategory = card.getAttribute('data-category');
-            shouldDisplay = cardCategory === category;
-        } else if (tag) {
-            // Para tags, verificar no conteúdo do card
-            const cardContent = card.textContent.toLowerCase();
-            shouldDisplay = cardContent.includes(tag.toLowerCase().replace(/-/g, ' '));
-        }
-        
-        if (shouldDisplay) {
-            card.style.display = 'block';
-            visibleCount++;
-        } else {
-            card.style.display = 'none';
-        }
-    });
-    
-    // Mensagem se não houver artigos
-    const noArticlesMsg = document.querySelector('.no-articles-message');
-    if (noArticlesMsg) noArticlesMsg.remove(); // Remove mensagem anterior se existir
-    
-    if (visibleCount === 0) {
-        const articlesContainer = document.querySelector('#recent-articles-container');
-        if (articlesContainer) {
-            const noArticlesMsg = document.createElement('div');
-            noArticlesMsg.className = 'no-articles-message';
-            if (category) {
-                noArticlesMsg.innerHTML = `<p>Nenhum artigo encontrado na categoria "${decodeURIComponent(category).replace(/-/g, ' ')}". <a href="/">Ver todos</a></p>`;
-            } else if (tag) {
-                noArticlesMsg.innerHTML = `<p>Nenhum artigo encontrado com a tag "${decodeURIComponent(tag).replace(/-/g, ' ')}". <a href="/">Ver todos</a></p>`;
-            }
-            articlesContainer.appendChild(noArticlesMsg);
-        }
+    if (category && slugify(category)) {
+        window.location.replace(`/categorias/${encodeURIComponent(slugify(category))}/`);
+    } else if (tag && slugify(tag)) {
+        window.location.replace(`/tags/${encodeURIComponent(slugify(tag))}/`);
     }
 }
 
 // ===== ARTIGOS RELACIONADOS =====
-function loadRelatedArticles() {
-    const relatedSection = document.querySelector('#related-articles');
-    if (!relatedSection) return;
-    
-    const articlesGrid = relatedSection.querySelector('.articles-grid');
-    if (!articlesGrid) return;
-    
-    // Obter metadados do artigo atual
-    const currentArticle = {
-        title: document.querySelector('title')?.textContent || '',
-        category: document.querySelector('.article-meta a[href*="categoria"]')?.textContent || '',
-        tags: Array.from(document.querySelectorAll('meta[name="keywords"]')).map(meta => 
-            meta.getAttribute('content')?.split(',').map(tag => tag.trim()) || []
-        ).flat()
-    };
-    
-    // Buscar artigos relacionados baseados em categoria e tags
-    const allArticles = getArticlesFromIndex();
-    const relatedArticles = findRelatedArticles(currentArticle, allArticles, 3);
+// As listas são pré-calculadas no build (um JSON por artigo em /assets/data/related/).
+// Os cards gravados no HTML continuam como fallback se o índice não puder ser carregado.
+const RELATED_INDEX_URL = '/assets/data/related/';
+const RELATED_INDEX_VERSION = 1;
+
+function getCurrentArticleId() {
+    const fileName = decodeURIComponent(window.location.pathname.split('/').pop() || '');
+    return fileName.endsWith('.html') ? fileName.slice(0, -'.html'.length) : '';
+}
+
+function fetchRelatedArticles(articleId) {
+    // Cache da sessão: cada índice é baixado uma única vez por visita
+    const cacheKey = `related:v${RELATED_INDEX_VERSION}:${articleId}`;
+    try {
+        const cached = sessionStorage.getItem(cacheKey);
+        if (cached) return Promise.resolve(JSON.parse(cached));
+    } catch (e) {
+        // sessionStorage indisponível (modo privado, cookies bloqueados)
+    }
     
-    // Limpar grid existente
+    return fetch(`${RELATED_INDEX_URL}${encodeURIComponent(articleId)}.json`)
+        .then(response => {
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            return response.json();
+        })
+        .then(data => {
+            if (data.version !== RELATED_INDEX_VERSION) throw new Error(`versão ${data.version} do índice não suportada`);
+            try {
+                sessionStorage.setItem(cacheKey, JSON.stringify(data.related));
+            } catch (e) {
+                // Sem espaço ou sem acesso ao sessionStorage: segue sem cache
+            }
+            return data.related;
+        });
+}
+
+function renderRelatedArticles(articlesGrid, relatedArticles) {
     articlesGrid.innerHTML = '';
     
     if (relatedArticles.length === 0) {
@@ -274,23 +245,43 @@ function loadRelatedArticles() {
         return;
     }
     
-    // Adicionar artigos relacionados
     relatedArticles.forEach(article => {
-        const articleCard = createArticleCard(article);
-        articlesGrid.appendChild(articleCard);
+        articlesGrid.appendChild(createArticleCard(article));
     });
 }
 
-function getArticlesFromIndex() {
-    // Esta função seria chamada via AJAX para buscar artigos do index.html
-    // Por simplicidade, vamos usar uma abordagem diferente
-    return [];
+function loadRelatedArticles() {
+    const relatedSection = document.querySelector('#related-articles');
+    if (!relatedSection) return;
+    
+    const articlesGrid = relatedSection.querySelector('.articles-grid');
+    if (!articlesGrid) return;
+    
+    const articleId = getCurrentArticleId();
+    if (!articleId) return;
+    
+    fetchRelatedArticles(articleId)
+        .then(relatedArticles => renderRelatedArticles(articlesGrid, relatedArticles))
+        .catch(error => {
+            // Mantém os cards gerados no HTML do artigo
+            console.warn('Índice de artigos relacionados indisponível:', error);
+        });
 }
 
-function findRelatedArticles(currentArticle, allArticles, numRelated = 3) {
-    // Algoritmo simplificado para encontrar artigos relacionados
-    // Em uma implementação real, isso seria feito no servidor
-    return [];
+function escapeHtml(value) {
+    const div = document.createElement('div');
+    div.textContent = value == null ? '' : String(value);
+    return div.innerHTML.replace(/"/g, '&quot;');
+}
+
+// Imagem do card, com srcset/dimensões e fonte AVIF quando a imagem foi otimizada
+function createCardImage(article) {
+    const responsive = article.srcset
+        ? ` srcset="${escapeHtml(article.srcset)}" sizes="${escapeHtml(article.sizes)}" width="${escapeHtml(article.width)}" height="${escapeHtml(article.height)}"`
+        : '';
+    const image = `<img src="${escapeHtml(article.image_url)}" alt="${escapeHtml(article.title)}" loading="lazy"${responsive}>`;
+    if (!article.srcset_avif) return image;
+    return `<picture><source type="image/avif" srcset="${escapeHtml(article.srcset_avif)}" sizes="${escapeHtml(article.sizes)}">${image}</picture>`;
 }
 
 function createArticleCard(article) {
@@ -299,16 +290,16 @@ function createArticleCard(article) {
     
     card.innerHTML = `
         <div class="article-image">
-            <a href="${article.path}">
-                <img src="${article.image_url}" alt="${article.title}" loading="lazy">
+            <a href="${escapeHtml(article.path)}">
+                ${createCardImage(article)}
             </a>
         </div>
         <div class="article-content">
-            <h3><a href="${article.path}">${article.title}</a></h3>
-            <p class="article-excerpt">${article.excerpt}</p>
+            <h3><a href="${escapeHtml(article.path)}">${escapeHtml(article.title)}</a></h3>
+            <p class="article-excerpt">${escapeHtml(article.excerpt)}</p>
             <div class="article-meta">
-                <span>Por ${article.author}</span>
-                <time datetime="${article.publish_date}">${article.formatted_date}</time>
+                <span>Por ${escapeHtml(article.author)}</span>
+                <time datetime="${escapeHtml(article.publish_date)}">${escapeHtml(article.formatted_date)}</time>
             </div>
         </div>
     `;
@@ -316,51 +307,202 @@ function createArticleCard(article) {
     return card;
 }
 
-// ===== CARREGAMENTO DINÂMICO DE ARTIGOS RELACIONADOS =====
-function loadRelatedArticlesFromAPI() {
-    const relatedSection = document.querySelector('#related-articles');
-    if (!relatedSection) return;
-    
-    const articlesGrid = relatedSection.querySelector('.articles-grid');
-    if (!articlesGrid) return;
-    
-    // Obter informações do artigo atual
-    const currentPath = window.location.pathname;
-    const currentTitle = document.querySelector('title')?.textContent || '';
-    const currentCategory = document.querySelector('.article-meta a[href*="categoria"]')?.textContent || '';
-    
-    // Fazer requisição para obter artigos relacionados
-    fetch('/api/related-articles', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-            current_path: currentPath,
-            current_title: currentTitle,
-            current_category: currentCategory
-        })
-    })
-    .then(response => response.json())
-    .then(data => {
-        articlesGrid.innerHTML = '';
-        
-        if (data.related_articles && data.related_articles.length > 0) {
-            data.related_articles.forEach(article => {
-                const articleCard = createArticleCard(article);
-                articlesGrid.appendChild(articleCard);
+// ===== BUSCA =====
+// Índice invertido pré-calculado no build (search_index.py), dividido por prefixo
+// dos termos: o index.json é baixado no primeiro foco da busca, cada arquivo de
+// termos só quando a busca precisa dele e cada bloco de artigos só quando um
+// resultado exibido está nele.
+const SEARCH_INDEX_URL = '/assets/data/search/';
+const SEARCH_INDEX_VERSION = 2;
+const SEARCH_MAX_RESULTS = 8;
+
+let searchIndexPromise = null;
+const searchShards = new Map();
+const searchDocShards = new Map();
+
+function loadSearchIndex() {
+    if (!searchIndexPromise) {
+        searchIndexPromise = fetch(`${SEARCH_INDEX_URL}index.json`)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => {
+                if (data.version !== SEARCH_INDEX_VERSION) throw new Error(`versão ${data.version} do índice não suportada`);
+                data.stopwords = new Set(data.stopwords);
+                data.shards = new Map(Object.entries(data.shards));
+                return data;
+            })
+            .catch(error => {
+                searchIndexPromise = null; // Permite tentar de novo na próxima busca
+                throw error;
             });
-        } else {
-            const noRelatedMsg = document.createElement('p');
-            noRelatedMsg.textContent = 'Nenhum artigo relacionado encontrado no momento.';
-            noRelatedMsg.style.cssText = 'text-align: center; color: #666; font-style: italic;';
-            articlesGrid.appendChild(noRelatedMsg);
+    }
+    return searchIndexPromise;
+}
+
+// Mesma normalização do build: minúsculas, sem pontuação, sem stopwords e sem acentos
+function searchTerms(query, index) {
+    return query.toLowerCase()
+        .replace(/[^\p{L}\p{N}\p{M}_\s]/gu, '')
+        .split(/\s+/)
+        .filter(word => word.length >= index.min_length && !index.stopwords.has(word))
+        .map(word => word.normalize('NFD').replace(/\p{M}/gu, ''));
+}
+
+function searchShardKey(term, index) {
+    return term.slice(0, index.prefix_length).replace(/[^a-z0-9]/g, '_');
+}
+
+// Arquivo do índice (termos ou bloco de artigos), com o hash do index.json na URL
+function loadSearchFile(cache, key, url, field) {
+    if (!cache.has(key)) {
+        const request = fetch(url)
+            .then(response => {
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                return response.json();
+            })
+            .then(data => data[field])
+            .catch(error => {
+                cache.delete(key);
+                throw error;
+            });
+        cache.set(key, request);
+    }
+    return cache.get(key);
+}
+
+function loadSearchShard(key, index) {
+    if (!index.shards.has(key)) return Promise.resolve({});
+    return loadSearchFile(searchShards, key, `${SEARCH_INDEX_URL}${key}.json?v=${index.shards.get(key)}`, 'terms');
+}
+
+function loadSearchDocShard(number, index) {
+    return loadSearchFile(searchDocShards, number, `${SEARCH_INDEX_URL}docs/${number}.json?v=${index.docs[number]}`, 'docs');
+}
+
+// Pontuação de cada artigo para um termo; o último termo da busca vale como prefixo
+function scoreTerm(term, terms, isPrefix, index) {
+    const scores = new Map();
+    Object.keys(terms).forEach(candidate => {
+        if (candidate !== term && !(isPrefix && candidate.startsWith(term))) return;
+        const postings = terms[candidate];
+        const idf = Math.log(1 + index.count / (postings.length / 2));
+        for (let i = 0; i < postings.length; i += 2) {
+            const score = postings[i + 1] * idf;
+            scores.set(postings[i], Math.max(scores.get(postings[i]) || 0, score));
         }
-    })
-    .catch(error => {
-        console.error('Erro ao carregar artigos relacionados:', error);
-        // Fallback: mostrar mensagem de erro
-        articlesGrid.innerHTML = '<p style="text-align: center; color: #666; font-style: italic;">Erro ao carregar artigos relacionados.</p>';
+    });
+    return scores;
+}
+
+function searchArticles(query) {
+    return loadSearchIndex().then(index => {
+        const terms = searchTerms(query, index);
+        if (terms.length === 0) return [];
+        const keys = [...new Set(terms.map(term => searchShardKey(term, index)))];
+        return Promise.all(keys.map(key => loadSearchShard(key, index))).then(shards => {
+            const shardByKey = new Map(keys.map((key, i) => [key, shards[i]]));
+            const termScores = terms.map((term, i) =>
+                scoreTerm(term, shardByKey.get(searchShardKey(term, index)), i === terms.length - 1, index));
+            
+            const totals = new Map();
+            const matches = new Map();
+            termScores.forEach(scores => scores.forEach((score, doc) => {
+                totals.set(doc, (totals.get(doc) || 0) + score);
+                matches.set(doc, (matches.get(doc) || 0) + 1);
+            }));
+            // Artigos com todos os termos primeiro; sem nenhum, vale qualquer termo.
+            // No empate, o número maior (o artigo mais recente) vem antes
+            let docs = [...totals.keys()];
+            const complete = docs.filter(doc => matches.get(doc) === terms.length);
+            if (complete.length > 0) docs = complete;
+            docs.sort((a, b) => totals.get(b) - totals.get(a) || b - a);
+            docs = docs.slice(0, SEARCH_MAX_RESULTS);
+            
+            const blocks = [...new Set(docs.map(doc => Math.floor(doc / index.docs_per_shard)))];
+            return Promise.all(blocks.map(block => loadSearchDocShard(block, index))).then(docShards => {
+                const blockDocs = new Map(blocks.map((block, i) => [block, docShards[i]]));
+                return docs.map(doc => {
+                    const [title, path, excerpt, date] = blockDocs.get(Math.floor(doc / index.docs_per_shard))[doc % index.docs_per_shard];
+                    return { title, path, excerpt, date };
+                });
+            });
+        });
+    });
+}
+
+function renderSearchResults(container, results, query) {
+    if (!query) {
+        container.innerHTML = '';
+        container.hidden = true;
+        return;
+    }
+    container.innerHTML = results.length === 0
+        ? `<p class="site-search-empty">Nenhum artigo encontrado para "${escapeHtml(query)}".</p>`
+        : results.map(result => `
+            <a class="site-search-result" href="${escapeHtml(result.path)}">
+                <strong>${escapeHtml(result.title)}</strong>
+                <span>${escapeHtml(result.excerpt)}</span>
+                <time>${escapeHtml(result.date)}</time>
+            </a>
+        `).join('');
+    container.hidden = false;
+}
+
+function setupSearch() {
+    const navContainer = document.querySelector('.nav-container');
+    if (!navContainer || navContainer.querySelector('.site-search')) return;
+    
+    const form = document.createElement('form');
+    form.className = 'site-search';
+    form.setAttribute('role', 'search');
+    form.innerHTML = `
+        <input type="search" class="site-search-input" placeholder="Buscar artigos..." aria-label="Buscar artigos" autocomplete="off">
+        <div class="site-search-results" aria-live="polite" hidden></div>
+    `;
+    navContainer.insertBefore(form, navContainer.querySelector('.mobile-menu-btn'));
+    
+    const input = form.querySelector('.site-search-input');
+    const results = form.querySelector('.site-search-results');
+    let latestQuery = '';
+    
+    const runSearch = debounce(() => {
+        const query = input.value.trim();
+        latestQuery = query;
+        if (!query) {
+            renderSearchResults(results, [], '');
+            return;
+        }
+        searchArticles(query)
+            .then(found => {
+                // Ignora respostas de buscas que já foram substituídas
+                if (query === latestQuery) renderSearchResults(results, found, query);
+            })
+            .catch(error => console.warn('Índice de busca indisponível:', error));
+    }, 120);
+    
+    input.addEventListener('focus', () => loadSearchIndex().catch(() => {}), { once: true });
+    input.addEventListener('input', runSearch);
+    input.addEventListener('keydown', event => {
+        if (event.key === 'Escape') {
+            input.value = '';
+            renderSearchResults(results, [], '');
+        }
+    });
+    form.addEventListener('submit', event => {
+        event.preventDefault();
+        const first = results.querySelector('.site-search-result');
+        if (first) {
+            trackEvent('Search', 'submit', input.value.trim());
+            window.location.href = first.href;
+        }
+    });
+    document.addEventListener('click', event => {
+        if (!form.contains(event.target)) results.hidden = true;
+    });
+    input.addEventListener('focus', () => {
+        if (results.innerHTML) results.hidden = false;
     });
 }
 
@@ -458,8 +600,8 @@ function lazyLoadImages() {
 
 // ===== INICIALIZAÇÃO GERAL =====
 function init() {
-    // Filtrar artigos por categoria (se houver parâmetro na URL)
-    filterArticlesByCategory();
+    // Redirecionar links antigos de categoria/tag para as páginas estáticas
+    redirectLegacyListingUrl();
     
     // Inicializa observadores de animação (para elementos como imagens de artigos ou seções)
     setupIntersectionObserver();
@@ -475,9 +617,12 @@ function init() {
     handleHeaderScroll();
     updateActiveNavLink();
     
+    // Caixa de busca no header (índice carregado sob demanda)
+    setupSearch();
+    
     // Carregar artigos relacionados se estivermos em uma página de artigo
     if (document.querySelector('#related-articles')) {
-        loadRelatedArticlesFromAPI();
+        loadRelatedArticles();
     }
     
     // Adiciona classe ao body para indicar que JS está habilitado (para CSS condicional)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Benchmark do build do blog sobre um acervo sintético.
+
+Gera N artigos a partir de templates/article-template.html (1.000, 10.000 e
+100.000 por padrão), executa os scripts de build sobre esse acervo em um
+diretório temporário e mede o tempo de cada etapa (via --profile), o tempo
+total e o pico de memória. Para cada tamanho são medidas:
+
+- update_script.py sem cache (primeira execução) e com cache (segunda);
+- generate_related_articles.py;
+- content_analyzer.py (relatório de leiturabilidade).
+
+Cada etapa recebe o expoente de crescimento estimado entre os tamanhos
+medidos (1.0 = linear, 2.0 = quadrático), para detectar etapas que não
+escalam antes que elas cheguem à produção. Com --baseline, os resultados são
+comparados com um baseline salvo antes (--save-baseline). O baseline é local
+e não é versionado: os tempos só são comparáveis na mesma máquina. Tudo roda
+offline.
+
+Uso:
+    python benchmark_build.py --sizes 1000,10000
+    python benchmark_build.py --sizes 1000 --baseline .cache/benchmark_baseline.json --save-baseline
+    python benchmark_build.py --sizes 1000 --baseline .cache/benchmark_baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import math
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from site_urls import slugify
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_PATH = os.path.join(REPO_DIR, 'templates', 'article-template.html')
+DEFAULT_SIZES = (1000, 10000, 100000)
+REGRESSION_THRESHOLD = 0.20  # 20% mais lento que o baseline
+DOMAIN = 'https://blog.iautomatize.com'
+
+MESES_PT = ["", "janeiro", "fevereiro", "março", "abril", "maio", "junho",
+            "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
+
+CATEGORIES = [
+    'Inteligência Artificial', 'Tecnologia', 'IAutomatize', 'Startups', 'Robótica',
+    'Cibersegurança', 'Segurança', 'Eventos de Tecnologia', 'Veículos Autônomos',
+    'Mobilidade Aérea Urbana', 'Inovação', 'Fintech', 'Carros Autônomos',
+    'Internet das Coisas', 'Automação Residencial', 'Saúde Digital', 'Energia',
+    'Computação Quântica', 'Negócios', 'Educação', 'Varejo', 'Games', 'Hardware',
+    'Semicondutores', 'Cloud', 'Dados', 'Privacidade', 'Regulação', 'Mercado',
+    'Investimentos', 'Biotecnologia', 'Espaço', 'Clima', 'Agronegócio',
+]
+
+VOCABULARY = (
+    'inteligência artificial modelo dados empresa mercado tecnologia startup investimento '
+    'plataforma usuários agentes automação segurança privacidade nuvem computação chips '
+    'treinamento linguagem generativa produto lançamento pesquisa desenvolvimento robôs '
+    'veículos autônomos energia sustentabilidade regulação governo europa estados unidos '
+    'china brasil bilhões milhões receita crescimento rodada capital risco fundadores '
+    'engenheiros código software hardware servidores infraestrutura latência desempenho '
+    'eficiência custos clientes parceria aquisição concorrência inovação transformação '
+    'digital saúde diagnóstico hospitais pacientes educação alunos professores varejo '
+    'consumidores pagamentos bancos fintech criptomoedas blockchain cibersegurança ataque '
+    'vulnerabilidade ransomware hackers dispositivos sensores internet coisas casa '
+    'inteligente assistente virtual voz imagem vídeo música criadores conteúdo redes '
+    'sociais anúncios publicidade busca navegador aplicativo celular smartphone bateria '
+    'satélites espaço foguete missão clima emissões carbono agricultura produtividade '
+    'trabalho empregos habilidades futuro tendências relatório estudo especialistas'
+).split()
+CONNECTORS = 'o a os as um uma de do da dos das no na em para com por que e mas ou como também'.split()
+
+# --- Geração do acervo sintético ---
+
+def load_template():
+    """Lê o template de artigo usado pelo blog."""
+    with open(TEMPLATE_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def zipf_weights(count, exponent=1.1):
+    """Pesos acumulados de uma distribuição de Zipf (poucos itens muito frequentes)."""
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+CATEGORY_WEIGHTS = zipf_weights(len(CATEGORIES))
+
+def sentence(rng, min_words=8, max_words=20):
+    """Frase sintética com o vocabulário do blog."""
+    words = []
+    for _ in range(rng.randint(min_words, max_words)):
+        words.append(rng.choice(CONNECTORS) if rng.random() < 0.35 else rng.choice(VOCABULARY))
+    text = ' '.join(words)
+    return text[0].upper() + text[1:] + '.'
+
+def paragraph(rng, sentences=(3, 7)):
+    """Parágrafo sintético com algumas frases."""
+    return ' '.join(sentence(rng) for _ in range(rng.randint(*sentences)))
+
+def synthetic_article(rng, template, number, tag_pool, tag_weights, start_date):
+    """Gera o nome de arquivo e o HTML de um artigo sintético."""
+    title_words = [rng.choice(VOCABULARY) for _ in range(rng.randint(5, 10))]
+    title = ' '.join(title_words).capitalize() + f' {number}'
+    slug = slugify(title)
+    category = rng.choices(CATEGORIES, cum_weights=CATEGORY_WEIGHTS)[0]
+    tags = sorted(set(rng.choices(tag_pool, cum_weights=tag_weights, k=rng.randint(3, 6))))
+    author = rng.choice(['IAutomatize', 'IAutomatize Team', 'Redação IAUTOMATIZE'])
+    publish_date = start_date + timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+    description = sentence(rng, 18, 30)
+    url = f'{DOMAIN}/articles/{slug}.html'
+    image_url = f'{DOMAIN}/assets/imagens/{slug}.webp'
+
+    values = {
+        'TITULO_ARTIGO': title,
+        'DESCRICAO_ARTIGO': description,
+        'TAG1, TAG2, TAG3': ', '.join(tags),
+        'AUTOR': author,
+        'CATEGORIA_PRINCIPAL': category,
+        'CATEGORIA_URL': slugify(category),
+        'URL_IMAGEM': image_url,
+        'ALT_IMAGEM': title,
+        'URL_COMPLETA_DO_ARTIGO': url,
+        'DATA_ISO': publish_date.strftime('%Y-%m-%dT%H:%M:%S-03:00'),
+        'DATA_FORMATADA': f'{publish_date.day:02d} de {MESES_PT[publish_date.month]} de {publish_date.year}',
+        'TEMPO_LEITURA': str(rng.randint(3, 9)),
+        'FONTE_URL': f'https://example.com/noticias/{number}',
+        'FONTE_NOME': 'Example News',
+        'URL_ENCODED': quote(url, safe=''),
+        'TITULO_ENCODED': quote(title, safe=''),
+        'URL_ARTIGO_ANTERIOR': '#',
+        'URL_PROXIMO_ARTIGO': '#',
+    }
+    for index in range(1, 5):
+        values[f'PARAGRAFO_{index}'] = paragraph(rng)
+        values[f'INTERTITULO_{index}'] = sentence(rng, 4, 8).rstrip('.')
+
+    html = re.sub(r'\[([A-Z0-9_, ]+)\]', lambda match: values.get(match.group(1), match.group(0)), template)
+    return f'{slug}.html', html
+
+def generate_corpus(site_dir, size, seed=42):
+    """Cria em `site_dir` um site com `size` artigos sintéticos, index.html e config/."""
+    rng = random.Random(seed)
+    template = load_template()
+    # O número de tags distintas cresce com o acervo (~1.400 tags para ~800 artigos no blog real)
+    tag_pool = [
+        ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 3))).title() + f' {index}'
+        for index in range(max(50, int(size ** 0.9 * 3)))
+    ]
+    tag_weights = zipf_weights(len(tag_pool))
+    start_date = datetime(2024, 1, 1)
+
+    articles_dir = os.path.join(site_dir, 'articles')
+    os.makedirs(articles_dir, exist_ok=True)
+    os.makedirs(os.path.join(site_dir, 'config'), exist_ok=True)
+    shutil.copy(os.path.join(REPO_DIR, 'index.html'), os.path.join(site_dir, 'index.html'))
+    for number in range(size):
+        filename, html = synthetic_article(rng, template, number, tag_pool, tag_weights, start_date)
+        with open(os.path.join(articles_dir, filename), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+# --- Execução e medição ---
+
+def run_script(site_dir, name, script, args=(), profile=True):
+    """Executa um script do repositório sobre o acervo e mede tempo, CPU e memória."""
+    command = [sys.executable, os.path.join(REPO_DIR, script), *args]
+    profile_path = os.path.join(site_dir, '.cache', 'profiles', f'{name}.json')
+    if profile:
+        command += ['--profile', profile_path]
+    log_path = os.path.join(site_dir, f'{name}.log')
+
+    with open(log_path, 'w', encoding='utf-8') as log:
+        wall_start = time.perf_counter()
+        process = subprocess.Popen(command, cwd=site_dir, stdout=log, stderr=subprocess.STDOUT)
+        _, status, rusage = os.wait4(process.pid, 0)
+        wall = time.perf_counter() - wall_start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    result = {
+        'wall': round(wall, 3),
+        'cpu': round(rusage.ru_utime + rusage.ru_stime, 3),
+        'peak_rss_mb': round(rusage.ru_maxrss / 1024, 1),
+        'exit_code': process.returncode,
+    }
+    if process.returncode != 0:
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+            result['error'] = f.read().strip().splitlines()[-1:] or ['sem saída']
+        return result
+    if profile and os.path.exists(profile_path):
+        with open(profile_path, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+        result['stages'] = {stage: values['wall'] for stage, values in report['stages'].items()}
+        if report.get('peak_rss_kb'):
+            result['peak_rss_mb'] = round(max(report['peak_rss_kb'].values()) / 1024, 1)
+    return result
+
+def benchmark_size(size, jobs=1, seed=42, keep=False):
+    """Gera um acervo de `size` artigos e mede todos os scripts sobre ele."""
+    site_dir = tempfile.mkdtemp(prefix=f'blog-bench-{size}-')
+    try:
+        print(f"\n=== {size} artigos ({site_dir}) ===")
+        started = time.perf_counter()
+        generate_corpus(site_dir, size, seed)
+        print(f"Acervo gerado em {time.perf_counter() - started:.1f}s")
+
+        jobs_args = ('--jobs', str(jobs))
+        runs = {}
+        for name, script, args, profile in (
+            ('update_cold', 'update_script.py', jobs_args, True),
+            ('update_warm', 'update_script.py', jobs_args, True),
+            ('related', 'generate_related_articles.py', jobs_args, True),
+            ('readability', 'content_analyzer.py', jobs_args, True),
+        ):
+            runs[name] = run_script(site_dir, name, script, args, profile)
+            status = 'ok' if runs[name]['exit_code'] == 0 else f"erro: {runs[name]['error'][0]}"
+            print(f"  {name:<12} {runs[name]['wall']:>9.2f}s  {runs[name]['peak_rss_mb']:>8.1f} MB  {status}")
+        return runs
+    finally:
+        if keep:
+            print(f"Acervo mantido em {site_dir}")
+        else:
+            shutil.rmtree(site_dir, ignore_errors=True)
+
+# --- Relatório ---
+
+def growth_exponents(results):
+    """Expoente de crescimento (log t2/t1 / log n2/n1) de cada execução e etapa."""
+    sizes = sorted(int(size) for size in results)
+    exponents = {}
+    for small, large in zip(sizes, sizes[1:]):
+        for run_name, run in results[str(large)].items():
+            previous = results[str(small)].get(run_name, {})
+            pairs = [('total', previous.get('wall'), run.get('wall'))]
+            pairs += [
+                (stage, previous.get('stages', {}).get(stage), wall)
+                for stage, wall in run.get('stages', {}).items()
+            ]
+            for stage, before, after in pairs:
+                # Etapas muito curtas são dominadas por ruído
+                if before and after and before >= 0.05:
+                    exponent = math.log(after / before) / math.log(large / small)
+                    exponents.setdefault(f'{small}->{large}', {}).setdefault(run_name, {})[stage] = round(exponent, 2)
+    return exponents
+
+def compare_with_baseline(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """Lista as execuções e etapas mais lentas que o baseline além do limite."""
+    regressions = []
+    for size, runs in results.items():
+        for run_name, run in runs.items():
+            base_run = baseline.get(size, {}).get(run_name)
+            if not base_run:
+                continue
+            pairs = [('total', base_run.get('wall'), run.get('wall'))]
+            pairs += [
+                (stage, base_run.get('stages', {}).get(stage), wall)
+                for stage, wall in run.get('stages', {}).items()
+            ]
+            for stage, before, after in pairs:
+                if before and after and before >= 0.05 and after > before * (1 + threshold):
+                    regressions.append({
+                        'size': int(size), 'run': run_name, 'stage': stage,
+                        'baseline': before, 'current': after, 'ratio': round(after / before, 2),
+                    })
+    return regressions
+
+def print_report(results, exponents, regressions, baseline=None):
+    """Imprime o crescimento por etapa e as regressões encontradas."""
+    print("\n=== Crescimento por etapa (1.0 = linear, 2.0 = quadrático) ===")
+    for interval, runs in exponents.items():
+        print(f"{interval}:")
+        for run_name, stages in runs.items():
+            worst = sorted(stages.items(), key=lambda item: -item[1])
+            print(f"  {run_name:<12} " + ', '.join(f"{stage} {exponent:.2f}" for stage, exponent in worst))
+
+    if not baseline:
+        print("\nSem baseline para comparar (--baseline).")
+    elif regressions:
+        print(f"\n⚠️  {len(regressions)} regressões em relação ao baseline:")
+        for item in regressions:
+            print(f"  {item['size']:>7} {item['run']:<12} {item['stage']:<14} "
+                  f"{item['baseline']:.2f}s -> {item['current']:.2f}s ({item['ratio']:.2f}x)")
+    else:
+        print("\nNenhuma regressão em relação ao baseline.")
+
+def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(description='Benchmark do build do blog sobre um acervo sintético.')
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='tamanhos do acervo, separados por vírgula (padrão: %(default)s)')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='repassado aos scripts de build (padrão: 1)')
+    parser.add_argument('--seed', type=int, default=42, help='semente do gerador de acervo')
+    parser.add_argument('--baseline', help='arquivo de baseline local, comparado com os resultados')
+    parser.add_argument('--save-baseline', action='store_true', help='grava os resultados como novo baseline em --baseline')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='fração de lentidão tolerada antes de acusar regressão (padrão: %(default)s)')
+    parser.add_argument('--output', help='grava os resultados completos em JSON')
+    parser.add_argument('--keep', action='store_true', help='mantém os acervos gerados')
+    args = parser.parse_args()
+    if args.save_baseline and not args.baseline:
+        parser.error('--save-baseline requer --baseline')
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    results = {str(size): benchmark_size(size, args.jobs, args.seed, args.keep) for size in sizes}
+    exponents = growth_exponents(results)
+
+    baseline = {}
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f).get('results', {})
+    regressions = compare_with_baseline(results, baseline, args.threshold)
+    print_report(results, exponents, regressions, baseline)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'jobs': args.jobs,
+        'seed': args.seed,
+        'results': results,
+        'growth': exponents,
+        'regressions': regressions,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Baseline gravado em {args.baseline}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
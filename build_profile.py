@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Medição de tempo dos scripts de build (opção --profile).
+
+Cada etapa do build (leitura, parsing, metadados, palavras-chave, relacionados,
+renderização, gravação, páginas de listagem, sitemap...) é medida em tempo de
+relógio (wall) e de CPU. Os tempos são exclusivos: uma etapa aninhada em outra
+(palavras-chave dentro de metadados, por exemplo) é descontada da etapa externa,
+então a soma das etapas corresponde ao tempo medido. O trabalho feito nos
+processos de --jobs é medido nos próprios processos e somado ao relatório.
+
+Ao final, um relatório JSON é gravado (por padrão em .cache/profiles/<script>.json)
+e uma tabela resumida é impressa, com as etapas, os artigos mais lentos e o pico
+de memória (RSS).
+"""
+
+import functools
+import heapq
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from parallel_build import map_articles, resolve_jobs
+from safe_write import atomic_write
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PROFILE_DIR = os.path.join('.cache', 'profiles')
+SLOWEST_ARTICLES = 10
+
+# Estado por processo: nos processos de --jobs, os tempos acumulados aqui são
+# devolvidos ao processo principal junto com o resultado de cada artigo
+_enabled = False
+_stages = {}   # etapa -> [wall, cpu, chamadas]
+_stack = []    # etapas abertas: [nome, wall aninhado, cpu aninhado]
+
+def add_profile_argument(parser):
+    """Adiciona a opção --profile a um ArgumentParser."""
+    parser.add_argument(
+        '--profile', nargs='?', const='', default=None, metavar='ARQUIVO',
+        help=f'mede o tempo de cada etapa e grava um relatório JSON (padrão: {PROFILE_DIR}/<script>.json)'
+    )
+
+@contextmanager
+def profile_stage(name):
+    """Mede uma etapa do build (não faz nada se o profiling estiver desligado)."""
+    if not _enabled:
+        yield
+        return
+    frame = [name, 0.0, 0.0]
+    _stack.append(frame)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        _stack.pop()
+        totals = _stages.setdefault(name, [0.0, 0.0, 0])
+        totals[0] += wall - frame[1]
+        totals[1] += cpu - frame[2]
+        totals[2] += 1
+        if _stack:
+            _stack[-1][1] += wall
+            _stack[-1][2] += cpu
+
+def _snapshot():
+    return {name: list(values) for name, values in _stages.items()}
+
+def _delta(before):
+    delta = {}
+    for name, (wall, cpu, calls) in _stages.items():
+        old = before.get(name, (0.0, 0.0, 0))
+        if calls != old[2]:
+            delta[name] = [wall - old[0], cpu - old[1], calls - old[2]]
+    return delta
+
+def _merge(stages):
+    for name, (wall, cpu, calls) in stages.items():
+        totals = _stages.setdefault(name, [0.0, 0.0, 0])
+        totals[0] += wall
+        totals[1] += cpu
+        totals[2] += calls
+
+def _profiled_call(func, item):
+    """Executa `func(item)` medindo o tempo; usado dentro dos processos de --jobs."""
+    global _enabled
+    _enabled = True
+    before = _snapshot()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    result = func(item)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return result, wall, cpu, _delta(before)
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    scale = 1024 if sys.platform == 'darwin' else 1  # ru_maxrss em bytes no macOS
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale,
+    }
+
+class BuildProfiler:
+    """Coleta os tempos de um script de build e gera o relatório de --profile.
+
+    Com `output` None o profiler fica desligado e todas as operações são
+    praticamente gratuitas.
+    """
+
+    def __init__(self, script, output=None, jobs=1):
+        global _enabled
+        self.script = script
+        self.enabled = output is not None
+        self.output = output or os.path.join(PROFILE_DIR, f'{script}.json')
+        self.jobs = resolve_jobs(jobs)
+        self.articles = {}  # caminho -> [wall, cpu]
+        self.started_at = datetime.now()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._worker_cpu = 0.0
+        _enabled = self.enabled
+        _stages.clear()
+        _stack.clear()
+
+    def stage(self, name):
+        """Context manager que mede uma etapa."""
+        return profile_stage(name)
+
+    @contextmanager
+    def article(self, file_path):
+        """Mede o trabalho feito sobre um artigo no processo principal."""
+        if not self.enabled:
+            yield
+            return
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self._add_article(file_path, time.perf_counter() - wall_start, time.process_time() - cpu_start)
+
+    def _add_article(self, file_path, wall, cpu):
+        totals = self.articles.setdefault(file_path, [0.0, 0.0])
+        totals[0] += wall
+        totals[1] += cpu
+
+    def map(self, func, items, jobs=1, label=None):
+        """map_articles com medição por artigo, inclusive nos processos de --jobs.
+
+        `label(item)` identifica o artigo de cada item (padrão: o primeiro
+        elemento da tupla).
+        """
+        if not self.enabled:
+            return map_articles(func, items, jobs)
+        items = list(items)
+        label = label or (lambda item: item[0] if isinstance(item, tuple) else item)
+        parallel = min(resolve_jobs(jobs), len(items)) > 1
+        results = []
+        for item, (result, wall, cpu, stages) in zip(items, map_articles(functools.partial(_profiled_call, func), items, jobs)):
+            if parallel:
+                _merge(stages)
+                self._worker_cpu += cpu
+            self._add_article(label(item), wall, cpu)
+            results.append(result)
+        return results
+
+    def report(self):
+        """Monta o relatório (dicionário serializável em JSON)."""
+        total_wall = time.perf_counter() - self._wall_start
+        total_cpu = time.process_time() - self._cpu_start + self._worker_cpu
+        stages = {
+            name: {'wall': round(wall, 4), 'cpu': round(cpu, 4), 'calls': calls}
+            for name, (wall, cpu, calls) in sorted(_stages.items(), key=lambda item: -item[1][0])
+        }
+        article_walls = sorted(wall for wall, _ in self.articles.values())
+        slowest = heapq.nlargest(SLOWEST_ARTICLES, self.articles.items(), key=lambda item: item[1][0])
+        return {
+            'script': self.script,
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'jobs': self.jobs,
+            'total': {'wall': round(total_wall, 4), 'cpu': round(total_cpu, 4)},
+            'stages': stages,
+            'articles': {
+                'count': len(article_walls),
+                'mean_wall': round(sum(article_walls) / len(article_walls), 4) if article_walls else 0,
+                'p95_wall': round(article_walls[int(len(article_walls) * 0.95)], 4) if article_walls else 0,
+                'slowest': [
+                    {'path': path, 'wall': round(wall, 4), 'cpu': round(cpu, 4)}
+                    for path, (wall, cpu) in slowest
+                ],
+            },
+            'peak_rss_kb': _peak_rss_kb(),
+        }
+
+    def finish(self):
+        """Grava o relatório JSON e imprime o resumo (se o profiling estiver ligado)."""
+        if not self.enabled:
+            return None
+        report = self.report()
+        atomic_write(self.output, json.dumps(report, ensure_ascii=False, indent=2))
+        print(format_summary(report))
+        print(f"Relatório de profiling gravado em {self.output}")
+        return report
+
+def format_summary(report):
+    """Tabela resumida de um relatório de profiling."""
+    total_wall = report['total']['wall'] or 1
+    lines = [
+        '',
+        f"=== Profiling: {report['script']} ({report['jobs']} processo(s)) ===",
+        f"{'Etapa':<16}{'Wall (s)':>10}{'CPU (s)':>10}{'% wall':>8}{'Chamadas':>10}",
+    ]
+    for name, stage in report['stages'].items():
+        lines.append(
+            f"{name:<16}{stage['wall']:>10.2f}{stage['cpu']:>10.2f}"
+            f"{100 * stage['wall'] / total_wall:>7.1f}%{stage['calls']:>10}"
+        )
+    lines.append(f"{'total':<16}{report['total']['wall']:>10.2f}{report['total']['cpu']:>10.2f}")
+    if report['jobs'] > 1:
+        lines.append("(etapas executadas nos processos de --jobs somam o tempo de todos os processos)")
+
+    articles = report['articles']
+    if articles['count']:
+        lines.append(
+            f"\nArtigos: {articles['count']} | média {articles['mean_wall'] * 1000:.1f} ms"
+            f" | p95 {articles['p95_wall'] * 1000:.1f} ms | mais lentos:"
+        )
+        for article in articles['slowest']:
+            lines.append(f"  {article['wall'] * 1000:8.1f} ms  {article['path']}")
+
+    rss = report['peak_rss_kb']
+    if rss:
+        lines.append(f"\nPico de memória (RSS): {rss['self'] / 1024:.1f} MB (processos filhos: {rss['children'] / 1024:.1f} MB)")
+    return '\n'.join(lines)
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Templates compilados dos cards, breadcrumbs e itens de listagem.
+
+Cada template é compilado uma única vez, na importação, em uma lista de
+trechos fixos e campos: renderizar é só escapar os valores e juntar as
+partes, sem montar nem parsear HTML. Os templates que vão para dentro de
+artigos (regravados com BeautifulSoup) são compilados passando uma vez pelo
+mesmo serializador: atributos em ordem alfabética, espaços entre tags
+reduzidos e o mesmo escape de textos e aspas. O HTML gerado é idêntico ao
+que o parsing de cada card produzia, e entra na árvore do artigo como um
+marcador <!--slot:...--> substituído depois do str() (splice_fragments).
+
+Os fragmentos renderizados ficam em um cache (FragmentCache) indexado pelos
+valores usados no card e pela versão do manifesto de imagens (de onde vêm o
+srcset e as dimensões): o card de um artigo exibido em várias páginas
+(relacionados, home, categoria e cada tag) é montado uma vez por build. O
+cache tem tamanho máximo, e processos de longa duração (o modo --watch)
+chamam reset_render_caches a cada rebuild.
+"""
+
+import re
+from html import escape
+from bs4 import BeautifulSoup
+from html_backend import REWRITE_BACKEND
+from image_pipeline import card_image_data, image_attributes, image_manifest_version, picture, reset_image_manifest
+from site_urls import category_url, slugify
+
+FIELD = re.compile(r'\{(!?)(\w+)\}')
+MARKER = 'tplfield%dx'
+MARKER_PATTERN = re.compile(r'(=")?tplfield(\d+)x')
+RAW_ELEMENT = re.compile(r'<(tplfield\d+x)></\1>')
+SLOT = re.compile(r'<!--slot:([\w:-]+)-->')
+FRAGMENT_CACHE_SIZE = 20000  # fragmentos guardados; os mais antigos saem primeiro
+
+def serializer_text(value):
+    """Texto escapado como o serializador do BeautifulSoup (&, < e >)."""
+    return str(value).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+def serializer_attribute(value):
+    """Valor de atributo escapado e entre aspas, como o serializador do BeautifulSoup."""
+    value = serializer_text(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', '&quot;') + '"'
+
+class Template:
+    """Template HTML compilado em trechos fixos e campos.
+
+    `{nome}` é um campo escapado e `{!nome}` um campo com HTML pronto (outro
+    fragmento). Com `serialize`, o template passa uma vez pelo serializador
+    do BeautifulSoup e os campos são escapados como ele faria; sem, os campos
+    usam html.escape, como as páginas de listagem.
+    """
+
+    def __init__(self, source, serialize=False):
+        fields = []
+
+        def mark(match):
+            fields.append((match.group(2), match.group(1) == '!'))
+            marker = MARKER % (len(fields) - 1)
+            # Um fragmento pronto é serializado como um elemento (espaços em volta reduzidos)
+            return f'<{marker}></{marker}>' if serialize and match.group(1) else marker
+
+        marked = FIELD.sub(mark, source)
+        if serialize:
+            marked = RAW_ELEMENT.sub(r'\1', str(BeautifulSoup(marked, REWRITE_BACKEND)))
+        # [trecho, (nome, tipo), trecho, (nome, tipo), ..., trecho]
+        self.parts = []
+        position = 0
+        for match in MARKER_PATTERN.finditer(marked):
+            name, raw = fields[int(match.group(2))]
+            # Valor inteiro de um atributo: o serializador escolhe as próprias aspas
+            attribute = serialize and not raw and match.group(1) and marked.startswith('"', match.end())
+            if attribute:
+                self.parts.append(marked[position:match.start()] + '=')
+                position = match.end() + 1
+            else:
+                self.parts.append(marked[position:match.start()] + (match.group(1) or ''))
+                position = match.end()
+            kind = 'raw' if raw else 'escape' if not serialize else 'attribute' if attribute else 'text'
+            self.parts.append((name, kind))
+        self.parts.append(marked[position:])
+
+    def render(self, **values):
+        output = []
+        for part in self.parts:
+            if isinstance(part, str):
+                output.append(part)
+                continue
+            name, kind = part
+            value = values[name]
+            if kind == 'raw':
+                output.append(value)
+            elif kind == 'escape':
+                output.append(escape(str(value)))
+            elif kind == 'attribute':
+                output.append(serializer_attribute(value))
+            else:
+                output.append(serializer_text(value))
+        return ''.join(output)
+
+class FragmentCache:
+    """Fragmentos já renderizados, indexados pelo template e pelos valores usados."""
+
+    def __init__(self, size=FRAGMENT_CACHE_SIZE):
+        self.size = size
+        self.fragments = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        fragment = self.fragments.get(key)
+        if fragment is None:
+            self.misses += 1
+            fragment = self.fragments[key] = render()
+            if len(self.fragments) > self.size:
+                del self.fragments[next(iter(self.fragments))]
+        else:
+            self.hits += 1
+        return fragment
+
+    def clear(self):
+        self.fragments.clear()
+
+fragment_cache = FragmentCache()
+
+def reset_render_caches():
+    """Descarta os fragmentos renderizados e o manifesto de imagens lido (novo rebuild)."""
+    fragment_cache.clear()
+    reset_image_manifest()
+
+def splice_fragments(html, fragments):
+    """Substitui os marcadores <!--slot:nome--> pelos fragmentos de `fragments`."""
+    if not fragments:
+        return html
+    return SLOT.sub(lambda match: fragments.get(match.group(1), match.group(0)), html)
+
+def card_image_url(image_url):
+    """URL da imagem de um card, relativa ao diretório articles/ quando for relativa."""
+    if not image_url.startswith(('http://', 'https://', '/')):
+        return image_url if '../' in image_url else '../' + image_url
+    return image_url
+
+# --- Card de artigo relacionado (dentro dos artigos) ---
+
+RELATED_IMAGE = Template('<img src="{src}" alt="{alt}" loading="lazy">', serialize=True)
+RELATED_RESPONSIVE_IMAGE = Template(
+    '<img src="{src}" alt="{alt}" loading="lazy" srcset="{srcset}" sizes="{sizes}" width="{width}" height="{height}">',
+    serialize=True,
+)
+RELATED_PICTURE = Template('<picture><source type="image/avif" srcset="{srcset}" sizes="{sizes}">{!img}</picture>', serialize=True)
+RELATED_CARD = Template('''<article class="article-card fade-in-on-scroll">
+                        <div class="article-image">
+                            <a href="{path}">
+                                {!image}
+                            </a>
+                        </div>
+                        <div class="article-content">
+                            <h3><a href="{path}">{title}</a></h3>
+                            <p class="article-excerpt">{excerpt}...</p>
+                            <div class="article-meta">
+                                <span>Por {author}</span>
+                                <time datetime="{date}">
+                                    {formatted_date}
+                                </time>
+                            </div>
+                        </div>
+                    </article>''', serialize=True)
+
+def render_related_image(image_url, title):
+    """<img> (ou <picture>) do card de relacionados, com as variantes responsivas."""
+    src = card_image_url(image_url)
+    data = card_image_data(src)
+    if not data:
+        return RELATED_IMAGE.render(src=src, alt=title)
+    img = RELATED_RESPONSIVE_IMAGE.render(
+        src=src, alt=title, srcset=data['srcset'], sizes=data['sizes'], width=data['width'], height=data['height'],
+    )
+    if 'srcset_avif' not in data:
+        return img
+    return RELATED_PICTURE.render(srcset=data['srcset_avif'], sizes=data['sizes'], img=img)
+
+def render_related_card(article, format_date):
+    """HTML do card de um artigo na seção de artigos relacionados."""
+    values = (
+        # Link absoluto, como em related_articles.related_card: o card fica dentro de articles/
+        '/' + article['path'].lstrip('/'), article['image_url'], article['title'], article['excerpt'][:150],
+        article['author'], article['publish_date'].strftime('%Y-%m-%d'), format_date(article['publish_date']),
+    )
+    path, image_url, title, excerpt, author, date, formatted_date = values
+    return fragment_cache.get(('related', image_manifest_version(), values), lambda: RELATED_CARD.render(
+        path=path, image=render_related_image(image_url, title), title=title, excerpt=excerpt,
+        author=author, date=date, formatted_date=formatted_date,
+    ))
+
+# --- Breadcrumbs (dentro dos artigos) ---
+
+BREADCRUMBS = Template('''
+        <nav aria-label="Breadcrumb" class="breadcrumbs">
+          <div class="container">
+            <ol itemscope itemtype="https://schema.org/BreadcrumbList">
+              <li itemprop="itemListElement" itemscope itemtype="https://schema.org/ListItem">
+                <a itemprop="item" href="/">
+                  <span itemprop="name">Home</span>
+                </a>
+                <meta itemprop="position" content="1" />
+              </li>
+              <li itemprop="itemListElement" itemscope itemtype="https://schema.org/ListItem">
+                <a itemprop="item" href="{category_url}">
+                  <span itemprop="name">{category}</span>
+                </a>
+                <meta itemprop="position" content="2" />
+              </li>
+              <li itemprop="itemListElement" itemscope itemtype="https://schema.org/ListItem">
+                <span itemprop="name">{title}</span>
+                <meta itemprop="position" content="3" />
+              </li>
+            </ol>
+          </div>
+        </nav>
+        ''', serialize=True)
+
+def render_breadcrumbs(metadata):
+    """HTML dos breadcrumbs de um artigo (Home > categoria > título)."""
+    category = metadata.get('category', 'Geral')
+    title = metadata.get('title', 'Artigo').split(' - ')[0].strip()
+    return BREADCRUMBS.render(category_url=category_url(category), category=category, title=title)
+
+# --- Card das páginas de listagem (home, arquivo, categorias e tags) ---
+
+LISTING_IMAGE = Template('<img alt="{alt}" loading="lazy" src="{src}"{!attributes}>')
+LISTING_CARD = Template(
+    '<article class="article-card fade-in-on-scroll" data-category="{category_slug}">'
+    '<div class="article-image"><a href="{href}">{!image}</a></div>'
+    '<div class="article-content"><h3><a href="{href}">{title}</a></h3>'
+    '<p class="article-excerpt">{excerpt}</p>'
+    '<div class="article-meta"><span>Por {author}</span>'
+    '<time datetime="{date}">{formatted_date}</time>'
+    '<span class="article-category">Em <a href="{category_url}">{category}</a></span>'
+    '</div></div></article>\n'
+)
+
+def render_listing_card(article, format_date, root=''):
+    """HTML do card de um artigo nas páginas de listagem (`root` prefixa o link do artigo)."""
+    values = (
+        root, article['path'], article['image_url'], article['title'], article['excerpt'], article['author'],
+        article['category'], article['publish_date'].strftime('%Y-%m-%d'), format_date(article['publish_date']),
+    )
+
+    def render():
+        image_url = card_image_url(article['image_url'])
+        image = LISTING_IMAGE.render(alt=article['title'], src=image_url, attributes=image_attributes(image_url))
+        return LISTING_CARD.render(
+            category_slug=slugify(article['category']), href=root + article['path'],
+            image=picture(image, image_url), title=article['title'], excerpt=article['excerpt'],
+            author=article['author'], date=values[7], formatted_date=values[8],
+            category_url=category_url(article['category']), category=article['category'],
+        )
+
+    return fragment_cache.get(('listing', image_manifest_version(), values), render)
@@ -1,157 +1,247 @@
+#!/usr/bin/env python3
+"""
+Análise de leiturabilidade dos artigos (índice Flesch adaptado ao português).
+
+Cada artigo é lido, analisado e descartado: apenas uma linha compacta de
+resultado (contagens, índice, classificação e termos mais frequentes) é
+mantida por artigo, e com --jobs os artigos são analisados em paralelo. A
+contagem de sílabas usa tabelas e expressões regulares e é memorizada por
+palavra, já que o vocabulário se repete muito entre os artigos.
+
+Ao final são gravados os relatórios em Markdown, JSON e CSV (por padrão
+readability_report.md/.json/.csv), com as palavras-chave TF-IDF calculadas
+sobre todos os artigos analisados.
+
+Uso:
+    python content_analyzer.py                      # todos os artigos
+    python content_analyzer.py articles/novo.html   # só os artigos dados
+    python content_analyzer.py --jobs 0 --formats json,csv
+    python content_analyzer.py --recent 3           # publicados nos últimos 3 dias
+    python content_analyzer.py --category robotica  # artigos de uma categoria
+
+As seleções --recent, --category e --tag são consultas ao catálogo de
+artigos (article_catalog.py), gerado pelo update_script.py.
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
 import re
-import math
 from collections import Counter
-from textblob import TextBlob
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from article_catalog import CATALOG_PATH, ArticleCatalog
+from html_backend import extract_text
+from keywords import assign_corpus_keywords, term_counts
+from parallel_build import add_jobs_argument
+from safe_write import write_if_changed
+from build_profile import BuildProfiler, add_profile_argument, profile_stage
+
+REPORT_BASENAME = 'readability_report'
+REPORT_FORMATS = ('md', 'json', 'csv')
+CSV_FIELDS = ('id', 'path', 'words', 'sentences', 'syllables', 'score', 'grade', 'keywords')
+
+WORD = re.compile(r'\b\w+\b')
+SENTENCE_END = re.compile(r'[.!?]+')
+VOWEL_GROUP = re.compile(r'[aeiouyáàâãéèêíìîóòôõúùûç]+')
+# Ditongos e hiatos descontados da contagem de grupos de vogais (com lookahead,
+# para contar ocorrências sobrepostas como em "eia")
+DIPHTHONG = re.compile(r'(?=ai|ao|ei|eu|ia|ie|io|iu|oi|ou|ua|ue|ui|uo)')
+
+GRADES = (
+    (90, "Muito fácil"),
+    (80, "Fácil"),
+    (70, "Razoavelmente fácil"),
+    (60, "Padrão"),
+    (50, "Razoavelmente difícil"),
+    (30, "Difícil"),
+)
 
 def extract_text_from_html(html_content):
     """Extrai texto puro do HTML de um artigo."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    # Remove scripts, styles, etc.
-    for script in soup(["script", "style", "header", "footer", "nav"]):
-        script.extract()
-    text = soup.get_text(separator=' ')
-    # Limpa espaços extras
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return extract_text(html_content)
+
+@lru_cache(maxsize=None)
+def count_syllables_pt(word):
+    """Estimativa de sílabas para português."""
+    word = word.lower()
+    count = len(VOWEL_GROUP.findall(word)) - len(DIPHTHONG.findall(word))
+    # Garantir pelo menos 1 sílaba
+    return max(1, count)
+
+def readability_grade(score):
+    """Classificação textual de um índice Flesch."""
+    for threshold, grade in GRADES:
+        if score >= threshold:
+            return grade
+    return "Muito difícil"
+
+def readability_counts(text):
+    """Número de palavras, frases e sílabas do texto."""
+    words = Counter(WORD.findall(text.lower()))
+    sentence_count = sum(1 for sentence in SENTENCE_END.split(text) if sentence.strip())
+    syllable_count = sum(count_syllables_pt(word) * count for word, count in words.items())
+    return sum(words.values()), sentence_count, syllable_count
 
 def calculate_readability(text):
     """Calcula o índice de leiturabilidade Flesch."""
     if not text:
         return {"score": 0, "grade": "N/A"}
-    
-    # Contagem básica
-    words = re.findall(r'\b\w+\b', text.lower())
-    sentences = re.split(r'[.!?]+', text)
-    sentences = [s for s in sentences if s.strip()]
-    
-    if not words or not sentences:
+    return readability_from_counts(*readability_counts(text))
+
+def readability_from_counts(word_count, sentence_count, syllable_count):
+    """Índice Flesch e classificação a partir das contagens do texto."""
+    if not word_count or not sentence_count:
         return {"score": 0, "grade": "N/A"}
-    
-    # Cálculo do índice Flesch adaptado para português
-    word_count = len(words)
-    sentence_count = len(sentences)
-    syllable_count = sum(count_syllables_pt(word) for word in words)
-    
+
     # Fórmula adaptada para português
     score = 206.835 - (1.015 * (word_count / sentence_count)) - (84.6 * (syllable_count / word_count))
-    
-    # Classificação
-    if score >= 90:
-        grade = "Muito fácil"
-    elif score >= 80:
-        grade = "Fácil"
-    elif score >= 70:
-        grade = "Razoavelmente fácil"
-    elif score >= 60:
-        grade = "Padrão"
-    elif score >= 50:
-        grade = "Razoavelmente difícil"
-    elif score >= 30:
-        grade = "Difícil"
+    return {"score": round(score, 1), "grade": readability_grade(score)}
+
+def analyze_article(file_path):
+    """Analisa um artigo (executado em paralelo com --jobs).
+
+    Retorna (resultado, None) ou (None, mensagem de erro). O resultado traz
+    apenas contagens e termos, nunca o texto do artigo.
+    """
+    try:
+        with profile_stage('read'), open(file_path, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        with profile_stage('parse'):
+            text = extract_text_from_html(html_content)
+        with profile_stage('readability'):
+            word_count, sentence_count, syllable_count = readability_counts(text)
+            readability = readability_from_counts(word_count, sentence_count, syllable_count)
+        with profile_stage('keywords'):
+            terms = term_counts(text)
+    except Exception as e:
+        return None, str(e)
+    return {
+        'id': os.path.basename(file_path).replace('.html', ''),
+        'path': file_path.replace(os.path.sep, '/'),
+        'words': word_count,
+        'sentences': sentence_count,
+        'syllables': syllable_count,
+        'score': readability['score'],
+        'grade': readability['grade'],
+        'terms': terms,
+    }, None
+
+def render_markdown(rows):
+    """Relatório em Markdown, um bloco por artigo."""
+    lines = ["# Relatório de Leiturabilidade\n"]
+    scored = [row['score'] for row in rows if row['grade'] != 'N/A']
+    if scored:
+        lines.append(f"Artigos analisados: {len(rows)} | Índice Flesch médio: {sum(scored) / len(scored):.1f}\n")
+    for row in rows:
+        lines.append(f"## {row['id']}")
+        lines.append(f"- Índice Flesch: {row['score']}")
+        lines.append(f"- Classificação: {row['grade']}")
+        lines.append(f"- Palavras-chave: {', '.join(row['keywords'])}\n")
+    return '\n'.join(lines) + '\n'
+
+def render_json(rows):
+    """Relatório em JSON, uma entrada por artigo."""
+    return json.dumps([{field: row[field] for field in CSV_FIELDS} for row in rows], ensure_ascii=False, indent=2) + '\n'
+
+def render_csv(rows):
+    """Relatório em CSV (palavras-chave separadas por ponto e vírgula)."""
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction='ignore', lineterminator='\n')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(dict(row, keywords=';'.join(row['keywords'])))
+    return output.getvalue()
+
+RENDERERS = {'md': render_markdown, 'json': render_json, 'csv': render_csv}
+
+def write_reports(rows, basename=REPORT_BASENAME, formats=REPORT_FORMATS):
+    """Grava os relatórios pedidos; retorna os caminhos que mudaram."""
+    written = []
+    for report_format in formats:
+        path = f'{basename}.{report_format}'
+        if write_if_changed(path, RENDERERS[report_format](rows)):
+            written.append(path)
+    return written
+
+def parse_formats(value):
+    """Converte '--formats md,json' em uma tupla validada."""
+    formats = tuple(part.strip() for part in value.split(',') if part.strip())
+    unknown = [report_format for report_format in formats if report_format not in RENDERERS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(f"formatos válidos: {', '.join(REPORT_FORMATS)}")
+    return formats
+
+def catalog_paths(recent=None, category=None, tag=None):
+    """Caminhos dos artigos selecionados no catálogo (últimos dias, categoria ou tag)."""
+    if not os.path.exists(CATALOG_PATH):
+        raise SystemExit(f"Catálogo não encontrado em {CATALOG_PATH}: execute o update_script.py antes")
+    catalog = ArticleCatalog()
+    if recent is not None:
+        article_ids = catalog.recent(recent)
+    elif category:
+        article_ids = catalog.in_category(category)
     else:
-        grade = "Muito difícil"
-    
-    return {"score": round(score, 1), "grade": grade}
+        article_ids = catalog.with_tag(tag)
+    paths = [row['path'] for row in catalog.articles(article_ids)]
+    catalog.close()
+    return paths
 
-def count_syllables_pt(word):
-    """Estimativa de sílabas para português."""
-    word = word.lower()
-    # Conta vogais
-    vowels = "aeiouyáàâãéèêíìîóòôõúùûç"
-    count = 0
-    prev_is_vowel = False
-    
-    for char in word:
-        is_vowel = char in vowels
-        if is_vowel and not prev_is_vowel:
-            count += 1
-        prev_is_vowel = is_vowel
-    
-    # Ajustes para ditongos, etc.
-    for pattern in ["ai", "ao", "ei", "eu", "ia", "ie", "io", "iu", "oi", "ou", "ua", "ue", "ui", "uo"]:
-        count -= word.count(pattern)
-    
-    # Garantir pelo menos 1 sílaba
-    return max(1, count)
+def main(paths=None, jobs=1, formats=REPORT_FORMATS, output=REPORT_BASENAME, profile=None, recent=None, category=None, tag=None):
+    """Analisa os artigos dados (ou todos em articles/) e grava os relatórios."""
+    profiler = BuildProfiler('content_analyzer', profile, jobs)
+    if recent is not None or category or tag:
+        with profiler.stage('catalog'):
+            paths = catalog_paths(recent, category, tag)
+    elif not paths:
+        articles_dir = 'articles'
+        paths = [
+            os.path.join(articles_dir, filename)
+            for filename in os.listdir(articles_dir) if filename.endswith('.html')
+        ]
 
-def extract_keywords(text, num_keywords=5):
-    """Extrai palavras-chave do texto."""
-    # Remove pontuação e converte para minúsculas
-    text = re.sub(r'[^\w\s]', '', text.lower())
-    
-    # Remove stopwords em português
-    stopwords = ["o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das", 
-                "no", "na", "nos", "nas", "ao", "aos", "à", "às", "pelo", "pela", "por", "para", 
-                "em", "que", "com", "se", "não", "e", "é", "são", "mas", "ou"]
-    
-    words = [word for word in text.split() if word not in stopwords and len(word) > 3]
-    
-    # Conta frequência
-    word_counts = Counter(words)
-    
-    # Retorna as mais frequentes
-    return [word for word, _ in word_counts.most_common(num_keywords)]
-
-def find_related_articles(article_id, article_data, num_related=3):
-    """Encontra artigos relacionados baseados em tags e conteúdo."""
-    target = article_data[article_id]
-    scores = {}
-    
-    for id, data in article_data.items():
-        if id == article_id:
+    rows = []
+    for file_path, (row, error) in zip(paths, profiler.map(analyze_article, paths, jobs)):
+        if row is None:
+            print(f"❌ Erro ao analisar {file_path}: {error}")
             continue
-        
-        score = 0
-        
-        # Correspondência de tags (peso alto)
-        common_tags = set(target['tags']).intersection(set(data['tags']))
-        score += len(common_tags) * 3
-        
-        # Correspondência de categoria (peso médio)
-        if target['category'] == data['category']:
-            score += 2
-        
-        # Correspondência de palavras-chave (peso baixo)
-        common_keywords = set(target['keywords']).intersection(set(data['keywords']))
-        score += len(common_keywords)
-        
-        scores[id] = score
-    
-    # Ordena por pontuação e retorna os top N
-    related = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:num_related]
-    return [article_id for article_id, _ in related]
-
-# Exemplo de uso:
+        rows.append(row)
+
+    # Palavras-chave por TF-IDF sobre todos os artigos analisados
+    with profiler.stage('keywords'):
+        assign_corpus_keywords({row['id']: row for row in rows})
+    with profiler.stage('write'):
+        written = write_reports(rows, output, formats)
+
+    print(f"📊 Artigos analisados: {len(rows)} de {len(paths)}")
+    for path in written:
+        print(f"✅ Relatório gravado em {path}")
+    if not written:
+        print("⏭️  Relatórios inalterados")
+    profiler.finish()
+
 if __name__ == "__main__":
-    # Integrando com update_script.py
-    import os
-    
-    articles_dir = 'articles'
-    all_articles_data = {}
-    
-    for filename in os.listdir(articles_dir):
-        if filename.endswith('.html'):
-            file_path = os.path.join(articles_dir, filename)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                html_content = f.read()
-            
-            text = extract_text_from_html(html_content)
-            readability = calculate_readability(text)
-            keywords = extract_keywords(text)
-            
-            article_id = filename.replace('.html', '')
-            all_articles_data[article_id] = {
-                'readability': readability,
-                'keywords': keywords,
-                # Outros metadados seriam adicionados aqui
-            }
-    
-    # Gerar relatório de leiturabilidade
-    with open('readability_report.md', 'w', encoding='utf-8') as f:
-        f.write("# Relatório de Leiturabilidade\n\n")
-        for article_id, data in all_articles_data.items():
-            f.write(f"## {article_id}\n")
-            f.write(f"- Índice Flesch: {data['readability']['score']}\n")
-            f.write(f"- Classificação: {data['readability']['grade']}\n")
-            f.write(f"- Palavras-chave: {', '.join(data['keywords'])}\n\n")
+    parser = argparse.ArgumentParser(description='Gera o relatório de leiturabilidade dos artigos.')
+    parser.add_argument('paths', nargs='*', metavar='ARTIGO', help='artigos a analisar (padrão: todos em articles/)')
+    parser.add_argument(
+        '--formats', type=parse_formats, default=REPORT_FORMATS, metavar='FORMATOS',
+        help=f"formatos do relatório, separados por vírgula (padrão: {','.join(REPORT_FORMATS)})"
+    )
+    parser.add_argument(
+        '--output', default=REPORT_BASENAME, metavar='ARQUIVO',
+        help=f'caminho dos relatórios, sem extensão (padrão: {REPORT_BASENAME})'
+    )
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument('--recent', type=int, metavar='DIAS', help='só os artigos publicados nos últimos DIAS dias (via catálogo)')
+    selection.add_argument('--category', metavar='SLUG', help='só os artigos de uma categoria (via catálogo)')
+    selection.add_argument('--tag', metavar='SLUG', help='só os artigos de uma tag (via catálogo)')
+    add_jobs_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    if args.paths and (args.recent is not None or args.category or args.tag):
+        parser.error('informe artigos ou uma seleção do catálogo, não ambos')
+    main(
+        args.paths, jobs=args.jobs, formats=args.formats, output=args.output, profile=args.profile,
+        recent=args.recent, category=args.category, tag=args.tag,
+    )
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+CSS crítico embutido nas páginas, com o blog-global.css carregado depois.
+
+Para cada tipo de página (artigos e home/listagens) o blog-global.css é
+filtrado contra um documento de referência (o template de artigos e o
+index.html): ficam apenas as regras que se aplicam aos elementos visíveis
+sem rolagem (PAGE_TYPES), inclusive as de @media. Classes que o
+blog-global.js adiciona depois do carregamento (STATE_CLASSES) e estados
+como :hover contam como presentes, para que a página não mude de aparência
+antes de o CSS completo chegar.
+
+O CSS crítico vai em um <style id="critical-css"> no lugar do <link> do
+blog-global.css, que passa a ser carregado sem bloquear a renderização
+(rel="preload" + onload, com <noscript> para navegadores sem JavaScript).
+Execuções seguintes apenas atualizam o conteúdo do <style>. O href do
+<link> é mantido, então o asset_bundle.py continua atualizando o
+fingerprint normalmente, em qualquer ordem.
+
+Uso:
+    python critical_css.py
+"""
+
+import argparse
+import re
+from html import escape
+from asset_bundle import BUNDLES, EXCLUDED_PAGES, minify_css
+from asset_graph import site_files
+from html_backend import parse_document
+from safe_write import write_if_changed
+from build_profile import BuildProfiler, add_profile_argument
+
+STYLESHEET = BUNDLES[0]
+# Documento de referência, elementos visíveis sem rolagem e elementos visíveis
+# inseridos pelo build ou pelo blog-global.js (ausentes do documento de referência)
+# de cada tipo de página
+PAGE_TYPES = {
+    'article': (
+        'templates/article-template.html',
+        ('.progress-bar-container', '.main-header', '.mobile-menu', '#article-hero', '#article-content'),
+        ('.breadcrumbs', '.site-search'),
+    ),
+    'home': (
+        'index.html',
+        ('.progress-bar-container', '.main-header', '.mobile-menu', '#hero', '#ultimas-noticias'),
+        ('.site-search',),
+    ),
+}
+# Classes adicionadas pelo blog-global.js (rolagem, menu aberto, animação de entrada)
+STATE_CLASSES = ('scrolled', 'active', 'visible', 'js-enabled')
+# Regras que nunca afetam a primeira renderização
+SKIPPED_MEDIA = ('print',)
+
+DYNAMIC_PSEUDO = re.compile(
+    r'::?(?:hover|focus(?:-visible|-within)?|active|visited|link|target|before|after|placeholder|'
+    r'selection|marker|first-letter|first-line|-(?:webkit|moz|ms)-[\w-]+)(?:\([^)]*\))?'
+)
+STATE_CLASS = re.compile(r'\.(?:%s)(?![\w-])' % '|'.join(STATE_CLASSES))
+ANIMATION_NAME = re.compile(r'animation(?:-name)?:([^;}]+)')
+CRITICAL_STYLE = re.compile(r'(<style id="critical-css">)(.*?)(</style>)', re.DOTALL)
+STYLESHEET_LINK = re.compile(r'<link\b(?=[^>]*\brel="stylesheet")[^>]*\bhref="(?P<href>[^"]*/?blog-global(?:\.[0-9a-f]+\.min)?\.css)"[^>]*>')
+
+# --- Leitura do CSS ---
+
+def _scan(css, position, stops):
+    """Posição do primeiro caractere de `stops` a partir de `position`, fora de strings."""
+    quote = None
+    while position < len(css):
+        char = css[position]
+        if quote:
+            if char == '\\':
+                position += 1
+            elif char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char in stops:
+            return position
+        position += 1
+    return len(css)
+
+def _block_end(css, position):
+    """Posição logo após o } que fecha o bloco aberto antes de `position`."""
+    depth = 1
+    while depth:
+        position = _scan(css, position, '{}') + 1
+        if position > len(css):
+            raise ValueError('bloco CSS não fechado')
+        depth += 1 if css[position - 1] == '{' else -1
+    return position
+
+def parse_rules(css, position=0):
+    """Regras de um CSS minificado: [(prelúdio, corpo)], com @media e @supports aninhados.
+
+    O corpo é o texto das declarações (ou de um @keyframes), a lista de
+    regras internas de um @media, ou None para instruções como @import.
+    """
+    rules = []
+    while position < len(css):
+        if css[position] == '}':
+            return rules, position + 1
+        end = _scan(css, position, '{;}')
+        prelude = css[position:end].strip()
+        if end >= len(css) or css[end] != '{':
+            if prelude:
+                rules.append((prelude, None))
+            position = end + 1 if end < len(css) and css[end] == ';' else end
+            continue
+        if prelude.startswith(('@media', '@supports')):
+            body, position = parse_rules(css, end + 1)
+        else:
+            close = _block_end(css, end + 1)
+            body, position = css[end + 1:close - 1], close
+        rules.append((prelude, body))
+    return rules, position
+
+def serialize_rules(rules):
+    """CSS de uma lista de regras de parse_rules."""
+    parts = []
+    for prelude, body in rules:
+        if body is None:
+            parts.append(prelude + ';')
+        elif isinstance(body, list):
+            parts.append(prelude + '{' + serialize_rules(body) + '}')
+        else:
+            parts.append(prelude + '{' + body + '}')
+    return ''.join(parts)
+
+def split_selectors(prelude):
+    """Seletores de uma lista separada por vírgulas (respeitando :not(a, b))."""
+    selectors, depth, start = [], 0, 0
+    for position, char in enumerate(prelude):
+        depth += (char == '(') - (char == ')')
+        if char == ',' and depth == 0:
+            selectors.append(prelude[start:position])
+            start = position + 1
+    selectors.append(prelude[start:])
+    return [selector.strip() for selector in selectors if selector.strip()]
+
+# --- Seleção das regras críticas ---
+
+def critical_elements(document, roots):
+    """ids dos elementos visíveis sem rolagem: os de `roots`, seus descendentes e ancestrais."""
+    elements = set()
+    for root in roots:
+        for element in document.select(root):
+            elements.add(id(element))
+            elements.update(id(child) for child in element.find_all(True))
+            elements.update(id(parent) for parent in element.parents)
+    return elements
+
+def static_selector(selector):
+    """Seletor sem estados dinâmicos (:hover, ::before, classes do JS), testável no HTML gravado."""
+    selector = STATE_CLASS.sub('', DYNAMIC_PSEUDO.sub('', selector)).strip()
+    if not selector or selector[-1] in '>+~':
+        selector += '*'
+    return selector
+
+def selector_is_critical(document, selector, elements, generated=()):
+    """True se o seletor se aplica a algum elemento visível sem rolagem."""
+    if selector.startswith(generated):
+        return True
+    try:
+        matches = document.select(static_selector(selector))
+    except Exception:
+        # Seletor que o soupsieve não entende: mantido por segurança
+        return True
+    return any(id(match) in elements for match in matches)
+
+def filter_rules(rules, document, elements, generated=()):
+    """Regras (inclusive dentro de @media) que se aplicam aos elementos visíveis sem rolagem."""
+    kept = []
+    for prelude, body in rules:
+        if isinstance(body, list):
+            if prelude.startswith('@media') and prelude[len('@media'):].strip().startswith(SKIPPED_MEDIA):
+                continue
+            inner = filter_rules(body, document, elements, generated)
+            if inner:
+                kept.append((prelude, inner))
+        elif prelude.startswith('@keyframes') or prelude.startswith('@-webkit-keyframes'):
+            kept.append((prelude, body))  # filtrado depois, pelas animações usadas
+        elif prelude.startswith('@'):
+            if prelude.startswith(('@font-face', '@import', '@charset')):
+                kept.append((prelude, body))
+        elif any(selector_is_critical(document, selector, elements, generated) for selector in split_selectors(prelude)):
+            kept.append((prelude, body))
+    return kept
+
+def used_animations(rules):
+    """Nomes de animações referenciados pelas declarações das regras."""
+    names = set()
+    for _, body in rules:
+        if isinstance(body, list):
+            names |= used_animations(body)
+        elif body:
+            for value in ANIMATION_NAME.findall(body):
+                names.update(value.replace(',', ' ').split())
+    return names
+
+def drop_unused_keyframes(rules, names):
+    """Remove os @keyframes cujas animações nenhuma regra crítica usa."""
+    return [
+        (prelude, body) for prelude, body in rules
+        if not prelude.startswith(('@keyframes', '@-webkit-keyframes')) or prelude.split()[-1] in names
+    ]
+
+def extract_critical_css(css, html, roots, generated=()):
+    """CSS crítico (minificado) de um documento de referência."""
+    document = parse_document(html)
+    rules, _ = parse_rules(minify_css(css))
+    kept = filter_rules(rules, document, critical_elements(document, roots), generated)
+    return serialize_rules(drop_unused_keyframes(kept, used_animations(kept)))
+
+# --- Aplicação nas páginas ---
+
+def page_type(path):
+    """Tipo de página de um arquivo publicado."""
+    return 'article' if path.startswith('articles/') else 'home'
+
+def deferred_stylesheet(href, critical_css):
+    """<style> com o CSS crítico e o <link> do CSS completo carregado sem bloquear a renderização.
+
+    A marcação é a que o html.parser do BeautifulSoup grava (atributos em
+    ordem alfabética e <link .../>), para que a regravação dos artigos pelo
+    update_script.py não altere a página de novo.
+    """
+    href = escape(href)
+    return (
+        f'<style id="critical-css">{critical_css}</style>'
+        f'<noscript><link href="{href}" rel="stylesheet"/></noscript>'
+        f'<link as="style" href="{href}" onload="this.onload=null;this.rel=\'stylesheet\'" rel="preload"/>'
+    )
+
+def apply_critical_css(html, critical_css):
+    """Página com o CSS crítico atualizado (ou embutido pela primeira vez)."""
+    if CRITICAL_STYLE.search(html):
+        return CRITICAL_STYLE.sub(lambda match: match.group(1) + critical_css + match.group(3), html, count=1)
+    return STYLESHEET_LINK.sub(lambda match: deferred_stylesheet(match.group('href'), critical_css), html, count=1)
+
+def build_critical_css(profile=None):
+    """Calcula o CSS crítico de cada tipo de página e o aplica a todas as páginas publicadas."""
+    profiler = BuildProfiler('critical_css', profile)
+    print("🎨 Extraindo CSS crítico...")
+    with open(STYLESHEET, 'r', encoding='utf-8') as f:
+        css = f.read()
+    critical = {}
+    with profiler.stage('extract'):
+        for name, (reference, roots, generated) in PAGE_TYPES.items():
+            with open(reference, 'r', encoding='utf-8') as f:
+                critical[name] = extract_critical_css(css, f.read(), roots, generated)
+            print(f"  ✓ {name}: {len(critical[name].encode('utf-8')) / 1024:.1f} KB (de {reference})")
+
+    changed = 0
+    with profiler.stage('pages'):
+        for path in site_files():
+            if not path.endswith('.html') or path.startswith(EXCLUDED_PAGES):
+                continue
+            with profiler.article(path):
+                with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+                    html = f.read()
+                rewritten = apply_critical_css(html, critical[page_type(path)])
+                if rewritten != html and write_if_changed(path, rewritten.encode('utf-8', 'surrogateescape')):
+                    changed += 1
+    print(f"\n📊 Páginas atualizadas: {changed}")
+    profiler.finish()
+    return critical
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Embute o CSS crítico nas páginas e adia o carregamento do CSS completo.')
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    build_critical_css(profile=args.profile)
@@ -3,11 +3,17 @@
 Script para padronizar todos os artigos HTML:
 1. Adicionar seção de artigos relacionados se não existir
 2. Padronizar o bloco do Google AdSense no head
+3. Apontar links antigos /?categoria= e /?tag= para as páginas estáticas
 """
 
+import argparse
 import os
 import re
-from bs4 import BeautifulSoup
+from parallel_build import add_jobs_argument
+from site_urls import rewrite_legacy_listing_links
+from safe_write import write_if_changed
+from html_backend import parse_html
+from build_profile import BuildProfiler, add_profile_argument, profile_stage
 
 def fix_adsense_block(soup):
     """Padroniza o bloco do Google AdSense no head."""
@@ -79,44 +85,53 @@ def add_related_articles_section(soup):
 def standardize_article(file_path):
     """Padroniza um artigo individual."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with profile_stage('read'), open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
+        with profile_stage('parse'):
+            soup = parse_html(content)
         
         # Aplica as correções
-        soup = fix_adsense_block(soup)
-        soup = add_related_articles_section(soup)
+        with profile_stage('render'):
+            soup = fix_adsense_block(soup)
+            soup = add_related_articles_section(soup)
+            rewrite_legacy_listing_links(soup)
         
-        # Salva o arquivo
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
+        # Salva o arquivo (apenas se algo mudou)
+        with profile_stage('write'):
+            write_if_changed(file_path, str(soup))
         
         return True
     except Exception as e:
         print(f"❌ Erro ao processar {file_path}: {str(e)}")
         return False
 
-def main():
+def process_article_file(file_path):
+    """Padroniza um artigo e registra o resultado (executado em paralelo com --jobs)."""
+    filename = os.path.basename(file_path)
+    print(f"📝 Processando: {filename}")
+    
+    if standardize_article(file_path):
+        print(f"  ✅ {filename} - Padronizado com sucesso")
+        return True
+    print(f"  ❌ {filename} - Erro no processamento")
+    return False
+
+def main(jobs=1, profile=None):
     """Função principal."""
+    profiler = BuildProfiler('fix_articles_standardization', profile, jobs)
     print("🚀 Iniciando padronização dos artigos...")
     
     articles_dir = 'articles'
-    processed_count = 0
-    error_count = 0
     
     # Lista todos os arquivos HTML
-    for filename in os.listdir(articles_dir):
-        if filename.endswith('.html'):
-            file_path = os.path.join(articles_dir, filename)
-            
-            print(f"📝 Processando: {filename}")
-            
-            if standardize_article(file_path):
-                processed_count += 1
-                print(f"  ✅ {filename} - Padronizado com sucesso")
-            else:
-                error_count += 1
-                print(f"  ❌ {filename} - Erro no processamento")
+    file_paths = [
+        os.path.join(articles_dir, filename)
+        for filename in os.listdir(articles_dir)
+        if filename.endswith('.html')
+    ]
+    results = profiler.map(process_article_file, file_paths, jobs)
+    processed_count = sum(1 for ok in results if ok)
+    error_count = len(results) - processed_count
     
     print(f"\n📊 Resumo:")
     print(f"  ✅ Artigos processados com sucesso: {processed_count}")
@@ -127,8 +142,15 @@ def main():
         print("\n🎉 Todos os artigos foram padronizados com sucesso!")
         print("   - Bloco do Google AdSense padronizado")
         print("   - Seção de artigos relacionados adicionada")
+        print("   - Links de categorias e tags apontando para as páginas estáticas")
     else:
         print(f"\n⚠️  {error_count} artigos tiveram problemas. Verifique os logs acima.")
+    
+    profiler.finish()
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Padroniza o HTML de todos os artigos.')
+    add_jobs_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    main(jobs=args.jobs, profile=args.profile)
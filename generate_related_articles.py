@@ -2,249 +2,202 @@
 """
 Script para gerar artigos relacionados automaticamente
 Executa após o update_script.py para adicionar artigos relacionados a todos os artigos
+
+Os metadados (parse_article_metadata) e os cards (card_templates) são os mesmos
+do update_script.py, então os dois scripts gravam exatamente o mesmo HTML e
+um não desfaz o que o outro gravou.
 """
 
+import argparse
 import os
-import re
-from datetime import datetime
-from bs4 import BeautifulSoup
-from collections import Counter
-
-def extract_text_from_html(html_content):
-    """Extrai texto puro do HTML de um artigo."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    # Remove scripts, styles, etc.
-    for script in soup(["script", "style", "header", "footer", "nav"]):
-        script.extract()
-    text = soup.get_text(separator=' ')
-    # Limpa espaços extras
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-def extract_keywords(text, num_keywords=5):
-    """Extrai palavras-chave do texto."""
-    # Remove pontuação e converte para minúsculas
-    text = re.sub(r'[^\w\s]', '', text.lower())
-    
-    # Remove stopwords em português
-    stopwords = ["o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das", 
-                "no", "na", "nos", "nas", "ao", "aos", "à", "às", "pelo", "pela", "por", "para", 
-                "em", "que", "com", "se", "não", "e", "é", "são", "mas", "ou"]
-    
-    words = [word for word in text.split() if word not in stopwords and len(word) > 3]
-    
-    # Conta frequência
-    word_counts = Counter(words)
-    
-    # Retorna as mais frequentes
-    return [word for word, _ in word_counts.most_common(num_keywords)]
+from article_cache import ArticleMetadataCache, content_hash
+from related_articles import (
+    add_similarity_argument, build_related_index, find_related_articles, related_articles_signature, write_related_index,
+)
+from parallel_build import add_jobs_argument
+from build_profile import BuildProfiler, add_profile_argument, profile_stage
+from keywords import assign_corpus_keywords
+from update_script import (
+    add_related_articles_to_soup, article_filenames, formatar_data_pt, parse_article_metadata,
+    read_article, read_article_source, related_cards, write_article,
+)
 
-def get_article_metadata(file_path):
-    """Extrai metadados de um arquivo HTML de artigo."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f, 'html.parser')
+def write_related_articles(file_path, cards):
+    """Grava os cards de artigos relacionados em um artigo.
 
-    # Extração básica de metadados
-    title_tag = soup.find('title')
-    title = title_tag.text.strip() if title_tag else ''
-
-    # Keywords/tags
-    meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
-    tags = []
-    if meta_keywords and meta_keywords.get('content'):
-        tags = [tag.strip() for tag in meta_keywords['content'].split(',')]
-    
-    # Categoria
-    category = 'Tecnologia'
-    meta_category = soup.find('meta', attrs={'name': 'category'})
-    if meta_category and meta_category.get('content'):
-        category = meta_category['content'].strip()
-    else:
-        # Tenta extrair da meta description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content') and 'Em ' in meta_desc['content']:
-            category = meta_desc['content'].split('Em ')[1].split('.')[0]
-    
-    # Autor
-    meta_author = soup.find('meta', attrs={'name': 'author'})
-    author = 'IAUTOMATIZE'
-    if meta_author and meta_author.get('content'):
-        author = meta_author['content'].strip()
-    
-    # Descrição
-    meta_description = soup.find('meta', attrs={'name': 'description'})
-    excerpt = ''
-    if meta_description and meta_description.get('content'):
-        excerpt = meta_description['content'].strip()
-    
-    # Imagem
-    meta_image = soup.find('meta', attrs={'property': 'og:image'})
-    image_url = '../assets/images/articles/default.jpg'
-    if meta_image and meta_image.get('content'):
-        image_url = meta_image['content'].strip()
-    
-    # Data
-    publish_date = datetime.fromtimestamp(os.path.getmtime(file_path))
-    
-    # Palavras-chave do conteúdo
-    text = extract_text_from_html(str(soup))
-    keywords = extract_keywords(text)
-
-    return {
-        'title': title,
-        'tags': tags,
-        'category': category,
-        'author': author,
-        'excerpt': excerpt,
-        'image_url': image_url,
-        'publish_date': publish_date,
-        'path': file_path.replace(os.path.sep, '/'),
-        'keywords': keywords
-    }
-
-def find_related_articles(article_id, article_data, num_related=3):
-    """Encontra artigos relacionados baseados em tags e conteúdo."""
-    target = article_data[article_id]
-    scores = {}
-    
-    for id, data in article_data.items():
-        if id == article_id:
-            continue
-        
-        score = 0
-        
-        # Correspondência de tags (peso alto)
-        common_tags = set(target['tags']).intersection(set(data['tags']))
-        score += len(common_tags) * 3
-        
-        # Correspondência de categoria (peso médio)
-        if target['category'] == data['category']:
-            score += 2
+    Recebe o HTML dos cards já renderizado (card_templates, o mesmo do
+    update_script.py), para que possa ser executado em um processo separado.
+    Retorna o hash do conteúdo gravado, None se o artigo não tem onde receber
+    os cards, ou False em caso de erro. Os cards ficam fora do <head> e do
+    texto, então os metadados já conhecidos valem para o conteúdo gravado.
+    """
+    try:
+        soup = read_article(file_path)
+        fragments = {}
+        if not add_related_articles_to_soup(soup, file_path, cards, fragments):
+            return None
         
-        # Correspondência de palavras-chave (peso baixo)
-        common_keywords = set(target['keywords']).intersection(set(data['keywords']))
-        score += len(common_keywords)
+        # Salvar o arquivo atualizado (apenas se o HTML mudou)
+        content, written = write_article(file_path, soup, fragments)
+        if written:
+            print(f"✅ Artigos relacionados adicionados em {os.path.basename(file_path)}")
+        else:
+            print(f"⏭️  Artigos relacionados inalterados em {os.path.basename(file_path)}")
+        return content_hash(content)
         
-        scores[id] = score
-    
-    # Ordena por pontuação e retorna os top N
-    related = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:num_related]
-    return [article_id for article_id, _ in related]
+    except Exception as e:
+        print(f"❌ Erro ao adicionar artigos relacionados em {file_path}: {str(e)}")
+        return False
 
-def formatar_data_pt(dt):
-    """Formata data para português."""
-    meses = ["", "janeiro", "fevereiro", "março", "abril", "maio", "junho",
-             "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"]
-    return f"{dt.day:02d} de {meses[dt.month]} de {dt.year}"
+def apply_related_articles(task):
+    """Versão de write_related_articles para uso com map_articles (--jobs)."""
+    # Leitura, parsing e gravação são descontados; o restante é a renderização
+    with profile_stage('render'):
+        return write_related_articles(*task)
 
-def add_related_articles_to_article(file_path, article_data, all_articles_data):
+def add_related_articles_to_article(file_path, article_data, all_articles_data, metadata_cache=None, related_index=None):
     """Adiciona artigos relacionados ao final do artigo."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
-        
         # Obter o ID do artigo (nome do arquivo sem extensão)
         article_id = os.path.basename(file_path).replace('.html', '')
         
         # Encontrar artigos relacionados
-        related_ids = find_related_articles(article_id, all_articles_data, num_related=3)
-        
-        # Encontrar a seção de artigos relacionados
-        related_section = soup.find('section', id='related-articles')
-        if not related_section:
-            print(f"Seção de artigos relacionados não encontrada em {file_path}")
-            return
-        
-        articles_grid = related_section.find('div', class_='articles-grid')
-        if not articles_grid:
-            print(f"Grid de artigos não encontrado em {file_path}")
-            return
-        
-        # Limpar conteúdo existente
-        articles_grid.clear()
-        
-        if not related_ids:
-            # Se não há artigos relacionados, adicionar mensagem
-            no_related_msg = soup.new_tag('p')
-            no_related_msg.string = "Nenhum artigo relacionado encontrado no momento."
-            no_related_msg['style'] = "text-align: center; color: #666; font-style: italic;"
-            articles_grid.append(no_related_msg)
+        if related_index is not None:
+            related_ids = related_index.find(article_id, num_related=3)
         else:
-            # Adicionar artigos relacionados
-            for related_id in related_ids:
-                if related_id in all_articles_data:
-                    related_article = all_articles_data[related_id]
-                    
-                    # Criar card do artigo relacionado
-                    article_card = soup.new_tag('article', **{'class': 'article-card fade-in-on-scroll'})
-                    
-                    # Corrige URLs de imagem se necessário
-                    image_url = related_article['image_url']
-                    if not image_url.startswith(('http://', 'https://', '/')):
-                        image_url = image_url if '../' in image_url else '../' + image_url
-                    
-                    # Criar HTML do card
-                    card_html = f'''
-                        <div class="article-image">
-                            <a href="{related_article['path']}">
-                                <img src="{image_url}" alt="{related_article['title']}" loading="lazy">
-                            </a>
-                        </div>
-                        <div class="article-content">
-                            <h3><a href="{related_article['path']}">{related_article['title']}</a></h3>
-                            <p class="article-excerpt">{related_article['excerpt'][:150]}...</p>
-                            <div class="article-meta">
-                                <span>Por {related_article['author']}</span>
-                                <time datetime="{related_article['publish_date'].strftime('%Y-%m-%d')}">
-                                    {formatar_data_pt(related_article['publish_date'])}
-                                </time>
-                            </div>
-                        </div>
-                    '''
-                    
-                    article_card.append(BeautifulSoup(card_html, 'html.parser'))
-                    articles_grid.append(article_card)
-        
-        # Salvar o arquivo atualizado
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
-            
-        print(f"✅ Artigos relacionados adicionados em {os.path.basename(file_path)}")
-        
+            related_ids = find_related_articles(article_id, all_articles_data, num_related=3)
+        signature = related_articles_signature(related_ids, all_articles_data)
     except Exception as e:
         print(f"❌ Erro ao adicionar artigos relacionados em {file_path}: {str(e)}")
+        return
+    
+    # Conteúdo e relacionados iguais aos da última execução: nada a fazer
+    if metadata_cache and metadata_cache.related_signature(file_path) == signature:
+        print(f"⏭️  Artigos relacionados inalterados em {os.path.basename(file_path)}")
+        return
+    
+    result = write_related_articles(file_path, related_cards(related_ids, all_articles_data))
+    
+    # Registra o conteúdo gravado para que a próxima execução o reaproveite
+    if metadata_cache and result is not False:
+        if result is not None and article_id in all_articles_data:
+            metadata_cache.put(file_path, result, all_articles_data[article_id])
+        metadata_cache.set_related_signature(file_path, signature)
+
+def main(jobs=1, json_only=False, profile=None, similarity=False):
+    """Função principal.
 
-def main():
-    """Função principal."""
+    Com `json_only`, apenas o índice estático de relacionados é atualizado,
+    sem regravar o HTML dos artigos. Com `profile`, o tempo de cada etapa é
+    medido e um relatório é gravado ao final. Com `similarity`, os artigos
+    relacionados também são pontuados pela similaridade do texto.
+    """
+    profiler = BuildProfiler('generate_related_articles', profile, jobs)
     print("🚀 Iniciando geração de artigos relacionados...")
     
     articles_dir = 'articles'
     all_articles_data = {}
+    metadata_cache = ArticleMetadataCache('related_articles_metadata')
+    article_files = article_filenames(articles_dir)
     
-    # Coleta metadados de todos os artigos
+    # Coleta metadados de todos os artigos (apenas arquivos novos ou alterados são parseados)
     print("\n📖 Coletando metadados dos artigos...")
-    for filename in os.listdir(articles_dir):
-        if filename.endswith('.html'):
-            file_path = os.path.join(articles_dir, filename)
-            try:
-                metadata = get_article_metadata(file_path)
-                article_id = filename.replace('.html', '')
-                all_articles_data[article_id] = metadata
-                print(f"  ✓ {filename}")
-            except Exception as e:
-                print(f"  ❌ Erro ao processar {filename}: {str(e)}")
+    collected = {}
+    pending = []
+    for filename in article_files:
+        file_path = os.path.join(articles_dir, filename)
+        try:
+            content = read_article_source(file_path)
+        except Exception as e:
+            print(f"  ❌ Erro ao processar {filename}: {str(e)}")
+            continue
+        with profile_stage('cache'):
+            digest = content_hash(content)
+            metadata = metadata_cache.get(file_path, digest)
+        if metadata is None:
+            pending.append((filename, file_path, digest, content))
+        else:
+            collected[filename] = metadata
+    
+    results = profiler.map(parse_article_metadata, [(file_path, content) for _, file_path, _, content in pending], jobs)
+    for (filename, file_path, digest, _), (metadata, _, error) in zip(pending, results):
+        if metadata is None:
+            print(f"  ❌ Erro ao processar {filename}: {error}")
+            continue
+        metadata_cache.put(file_path, digest, metadata)
+        collected[filename] = metadata
+    
+    # Mantém a ordem de listagem do diretório (usada como critério de desempate)
+    for filename in article_files:
+        if filename in collected:
+            article_id = filename.replace('.html', '')
+            all_articles_data[article_id] = collected[filename]
+            print(f"  ✓ {filename}")
     
     print(f"\n📊 Total de artigos processados: {len(all_articles_data)}")
+    print(f"   ♻️  Reaproveitados do cache: {metadata_cache.hits} | Parseados: {metadata_cache.misses}")
+    
+    with profiler.stage('keywords'):
+        assign_corpus_keywords(all_articles_data)
     
     # Adicionar artigos relacionados a cada artigo
     print("\n🔗 Adicionando artigos relacionados...")
-    for filename in os.listdir(articles_dir):
-        if filename.endswith('.html'):
-            file_path = os.path.join(articles_dir, filename)
-            add_related_articles_to_article(file_path, all_articles_data, all_articles_data)
+    with profiler.stage('related'):
+        related_index = build_related_index(all_articles_data, similarity)
+    tasks = []
+    signatures = {}
+    related_by_id = {}
+    for filename in article_files:
+        file_path = os.path.join(articles_dir, filename)
+        article_id = filename.replace('.html', '')
+        if article_id not in all_articles_data:
+            if not json_only:
+                with profiler.article(file_path), profile_stage('render'):
+                    add_related_articles_to_article(file_path, all_articles_data, all_articles_data)
+            continue
+        with profiler.stage('related'):
+            related_ids = related_index.find(article_id, num_related=3)
+            related_by_id[article_id] = related_ids
+        if json_only:
+            continue
+        with profiler.stage('related'):
+            signature = related_articles_signature(related_ids, all_articles_data)
+        # Conteúdo e relacionados iguais aos da última execução: nada a fazer
+        if metadata_cache.related_signature(file_path) == signature:
+            print(f"⏭️  Artigos relacionados inalterados em {filename}")
+            continue
+        with profiler.stage('render'):
+            cards = related_cards(related_ids, all_articles_data)
+        tasks.append((file_path, cards))
+        signatures[file_path] = signature
+    
+    for task, result in zip(tasks, profiler.map(apply_related_articles, tasks, jobs)):
+        file_path = task[0]
+        if result is False:
+            continue
+        if result is not None:
+            metadata_cache.put(file_path, result, all_articles_data[os.path.basename(file_path)[:-len('.html')]])
+        metadata_cache.set_related_signature(file_path, signatures[file_path])
+    
+    print(f"\n📝 Metadados alterados desde a última execução: {len(metadata_cache.changed())}")
+    with profiler.stage('cache'):
+        metadata_cache.save()
+    
+    with profiler.stage('related_json'):
+        written = write_related_index(related_by_id, all_articles_data, formatar_data_pt)
+    print(f"🗂️  Índice estático de relacionados: {written} arquivos gravados")
     
     print("\n✅ Processo concluído! Artigos relacionados foram adicionados a todos os artigos.")
+    profiler.finish()
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Gera os artigos relacionados de todos os artigos.')
+    add_jobs_argument(parser)
+    parser.add_argument(
+        '--json-only', action='store_true',
+        help='atualiza apenas o índice JSON de relacionados, sem regravar o HTML dos artigos'
+    )
+    add_profile_argument(parser)
+    add_similarity_argument(parser)
+    args = parser.parse_args()
+    main(jobs=args.jobs, json_only=args.json_only, profile=args.profile, similarity=args.similarity)
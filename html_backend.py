@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Camada de parsing de HTML compartilhada pelos scripts do blog.
+
+- parse_html: árvore completa, para artigos que serão modificados e
+  regravados. Usa o html.parser, cujo str() reproduz byte a byte os arquivos
+  já gravados pelos scripts (o lxml altera o doctype e espaços em branco, o
+  que sujaria os diffs de todos os artigos).
+- parse_document: árvore completa apenas para leitura, com o backend mais
+  rápido disponível.
+- parse_article: um único parsing do documento com o backend mais rápido,
+  do qual saem os campos do <head> (título, meta tags, JSON-LD), os links
+  de .article-meta e o texto visível (o mesmo de extract_text). É a leitura
+  de metadados, palavras-chave e texto do catálogo de cada artigo.
+- extract_text: texto visível do artigo para análise de palavras-chave,
+  extraído diretamente com lxml.html (cerca de 10x mais rápido que percorrer
+  a árvore do BeautifulSoup), com o mesmo resultado. O que o próprio build
+  grava nos artigos (GENERATED_SELECTORS: cards de relacionados e
+  breadcrumbs) fica de fora, para que as palavras-chave de uma execução não
+  dependam dos relacionados gravados pela anterior.
+
+O backend rápido pode ser escolhido com a variável de ambiente
+BLOG_HTML_PARSER (lxml ou html.parser); sem lxml instalado, tudo usa o
+html.parser.
+"""
+
+import os
+import re
+from bs4 import BeautifulSoup, CData, NavigableString
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+REWRITE_BACKEND = 'html.parser'
+BACKENDS = ('lxml', 'html.parser')
+HIDDEN_TAGS = ('script', 'style', 'header', 'footer', 'nav')
+# Trechos gravados pelo build (update_script.py e generate_related_articles.py)
+GENERATED_SELECTORS = ('#related-articles', '.breadcrumbs')
+GENERATED_XPATH = (
+    '//*[@id="related-articles"]'
+    ' | //*[contains(concat(" ", normalize-space(@class), " "), " breadcrumbs ")]'
+)
+
+def available_backends():
+    """Backends de parsing instalados, do mais rápido para o mais lento."""
+    return [backend for backend in BACKENDS if backend != 'lxml' or lxml is not None]
+
+def fast_backend():
+    """Backend usado nas leituras que não regravam o arquivo."""
+    backend = os.environ.get('BLOG_HTML_PARSER')
+    if backend in available_backends():
+        return backend
+    return available_backends()[0]
+
+def parse_html(content):
+    """Árvore completa de um documento, segura para ser regravada com str()."""
+    return BeautifulSoup(content, REWRITE_BACKEND)
+
+def parse_document(content):
+    """Árvore completa de um documento que não será regravado."""
+    return BeautifulSoup(content, fast_backend())
+
+def collapse_whitespace(text):
+    """Troca sequências de espaços em branco por um único espaço."""
+    return re.sub(r'\s+', ' ', text).strip()
+
+def extract_text_from_soup(soup):
+    """Texto visível de uma árvore já parseada, sem modificá-la."""
+    ignored = {id(tag) for tag in soup(list(HIDDEN_TAGS))}
+    ignored.update(id(tag) for tag in soup.select(', '.join(GENERATED_SELECTORS)))
+    parts = []
+    for string in soup.descendants:
+        if type(string) not in (NavigableString, CData):
+            continue
+        if any(id(parent) in ignored for parent in string.parents):
+            continue
+        parts.append(string)
+    return collapse_whitespace(' '.join(parts))
+
+ARTICLE_META_LINKS = '//*[contains(concat(" ", normalize-space(@class), " "), " article-meta ")]//a'
+LD_JSON_TYPE = 'application/ld+json'
+
+def _article_fields(title, meta, json_ld, meta_links, text):
+    return {'title': title, 'meta': meta, 'json_ld': json_ld, 'meta_links': meta_links, 'text': text}
+
+def _article_from_soup(soup):
+    meta = {}
+    for tag in soup.find_all('meta'):
+        for attribute in ('name', 'property'):
+            if tag.get(attribute) is not None:
+                meta.setdefault((attribute, tag[attribute]), tag.get('content'))
+    title = soup.find('title')
+    script = soup.find('script', attrs={'type': LD_JSON_TYPE})
+    meta_links = [(link.get('href'), link.text) for link in soup.select('.article-meta a')]
+    return _article_fields(
+        title.text if title else None, meta, script.string if script else None, meta_links, extract_text_from_soup(soup),
+    )
+
+def parse_article(content):
+    """Campos do <head>, links de .article-meta e texto visível, com um único parsing.
+
+    Retorna {'title', 'meta': {(atributo, valor): content}, 'json_ld',
+    'meta_links': [(href, texto)], 'text'}; de cada meta tag (por name ou
+    property) vale a primeira ocorrência, como no find() do BeautifulSoup.
+    """
+    if lxml is not None and fast_backend() == 'lxml':
+        try:
+            document = lxml.html.document_fromstring(content)
+        except (etree.ParserError, ValueError):
+            pass
+        else:
+            meta = {}
+            for tag in document.iter('meta'):
+                for attribute in ('name', 'property'):
+                    if tag.get(attribute) is not None:
+                        meta.setdefault((attribute, tag.get(attribute)), tag.get('content'))
+            title = next(document.iter('title'), None)
+            script = next(iter(document.xpath('//script[@type=$type]', type=LD_JSON_TYPE)), None)
+            meta_links = [(link.get('href'), link.text_content()) for link in document.xpath(ARTICLE_META_LINKS)]
+            fields = (title.text_content() if title is not None else None, meta, script.text if script is not None else None, meta_links)
+            # O texto vem da mesma árvore, depois de lidos os campos acima
+            etree.strip_elements(document, etree.Comment, *HIDDEN_TAGS, with_tail=False)
+            for element in document.xpath(GENERATED_XPATH):
+                element.drop_tree()
+            return _article_fields(*fields, collapse_whitespace(' '.join(document.itertext())))
+    return _article_from_soup(BeautifulSoup(content, REWRITE_BACKEND))
+
+def extract_text(content):
+    """Texto visível de um documento HTML, ignorando scripts, estilos, navegação e trechos gerados."""
+    if lxml is not None and fast_backend() == 'lxml':
+        try:
+            document = lxml.html.document_fromstring(content)
+        except (etree.ParserError, ValueError):
+            pass
+        else:
+            etree.strip_elements(document, etree.Comment, *HIDDEN_TAGS, with_tail=False)
+            for element in document.xpath(GENERATED_XPATH):
+                element.drop_tree()
+            return collapse_whitespace(' '.join(document.itertext()))
+    return extract_text_from_soup(BeautifulSoup(content, REWRITE_BACKEND))
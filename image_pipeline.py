@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Versões otimizadas e responsivas das imagens de assets/imagens.
+
+Cada imagem é convertida para WebP (e AVIF, se o Pillow tiver suporte) em
+várias larguras (RESPONSIVE_WIDTHS, nunca maiores que a original). As
+variantes são nomeadas pelo hash do conteúdo da imagem original
+(assets/img/<hash>-<largura>.<formato>), então:
+
+- imagens que não mudaram desde a última execução não são decodificadas de
+  novo (basta que suas variantes já existam);
+- cópias idênticas de uma imagem (mesmo conteúdo com outro nome) geram as
+  variantes uma única vez.
+
+O manifesto assets/data/images.json liga cada imagem original às suas
+variantes e dimensões. Os scripts de build o usam para gravar os cards com
+srcset/sizes e width/height explícitos (image_attributes), dentro de um
+<picture> com a fonte AVIF quando ela existe (picture); sem o manifesto, os
+cards continuam apontando só para a imagem original. As imagens originais
+nunca são alteradas.
+
+Requer Pillow (pip install pillow).
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+from html import escape
+from urllib.parse import unquote, urlsplit
+from parallel_build import add_jobs_argument
+from safe_write import write_if_changed
+from site_urls import SITE_HOSTS
+from build_profile import BuildProfiler, add_profile_argument, profile_stage
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+SOURCE_DIR = os.path.join('assets', 'imagens')
+OUTPUT_DIR = os.path.join('assets', 'img')
+MANIFEST_PATH = os.path.join('assets', 'data', 'images.json')
+MANIFEST_VERSION = 1
+
+SOURCE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+# Um card ocupa no máximo ~400px de largura (até 3x isso em telas de alta densidade)
+RESPONSIVE_WIDTHS = (320, 640, 960)
+# Qualidade e esforço de compressão: os níveis mais lentos do WebP (method 6)
+# e do AVIF (speed padrão) custam ~3x o tempo por poucos por cento de tamanho
+ENCODER_OPTIONS = {
+    'webp': {'quality': 80, 'method': 4},
+    'avif': {'quality': 55, 'speed': 8},
+}
+# Largura ocupada por um card na grade (.articles-grid, mínimo de 350px por coluna)
+CARD_SIZES = '(max-width: 768px) 100vw, (max-width: 1200px) 50vw, 400px'
+
+_manifest = None
+_manifest_version = None
+
+def output_formats():
+    """Formatos gerados: WebP sempre, AVIF quando o Pillow consegue gravá-lo."""
+    Image.init()
+    return ['avif', 'webp'] if 'AVIF' in Image.SAVE else ['webp']
+
+def image_hash(path):
+    """Hash do conteúdo de uma imagem (os 16 primeiros dígitos do SHA-256)."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+def variant_path(digest, width, image_format):
+    """Caminho de uma variante no disco."""
+    return os.path.join(OUTPUT_DIR, f'{digest}-{width}.{image_format}')
+
+def variant_url(path):
+    """URL de uma variante a partir da raiz do site."""
+    return '/' + path.replace(os.path.sep, '/')
+
+def target_widths(width):
+    """Larguras geradas para uma imagem de largura `width` (a própria, se for menor que a maior)."""
+    widths = [target for target in RESPONSIVE_WIDTHS if target <= width]
+    if width < RESPONSIVE_WIDTHS[-1]:
+        widths.append(width)
+    return widths
+
+def encode_variants(task):
+    """Decodifica uma imagem e grava suas variantes (executado em paralelo com --jobs).
+
+    Retorna (entrada do manifesto, None) ou (None, mensagem de erro).
+    """
+    source, digest, formats = task
+    try:
+        with profile_stage('decode'), Image.open(source) as original:
+            image = ImageOps.exif_transpose(original)
+            image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+        width, height = image.size
+        sources = {image_format: [] for image_format in formats}
+        for target in target_widths(width):
+            target_height = max(1, round(height * target / width))
+            with profile_stage('resize'):
+                resized = image if target == width else image.resize((target, target_height), Image.LANCZOS)
+            for image_format in formats:
+                with profile_stage('encode'):
+                    buffer = io.BytesIO()
+                    resized.save(buffer, image_format.upper(), **ENCODER_OPTIONS[image_format])
+                path = variant_path(digest, target, image_format)
+                with profile_stage('write'):
+                    write_if_changed(path, buffer.getvalue())
+                sources[image_format].append([target, variant_url(path)])
+    except Exception as e:
+        return None, str(e)
+    return {'width': width, 'height': height, 'sources': sources}, None
+
+def find_images(directory=SOURCE_DIR):
+    """Imagens originais, em ordem, com caminhos relativos à raiz do site."""
+    images = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.lower().endswith(SOURCE_EXTENSIONS):
+                images.append(os.path.join(root, filename))
+    return images
+
+def entry_is_current(entry, formats):
+    """True se as variantes de uma entrada do manifesto seguem a configuração atual e estão no disco."""
+    if sorted(entry['sources']) != sorted(formats):
+        return False
+    widths = target_widths(entry['width'])
+    return all(
+        [width for width, _ in variants] == widths
+        and all(os.path.exists(url.lstrip('/').replace('/', os.path.sep)) for _, url in variants)
+        for variants in entry['sources'].values()
+    )
+
+def read_manifest(path=MANIFEST_PATH):
+    """Manifesto gravado pela última execução (vazio se não houver)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {'images': {}, 'variants': {}}
+    if data.get('version') != MANIFEST_VERSION:
+        return {'images': {}, 'variants': {}}
+    return data
+
+def remove_stale_variants(variants, directory=OUTPUT_DIR):
+    """Remove variantes de imagens que não existem mais. Retorna quantas foram removidas."""
+    keep = {
+        os.path.basename(url)
+        for entry in variants.values() for sources in entry['sources'].values() for _, url in sources
+    }
+    removed = 0
+    if os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            if filename not in keep:
+                os.remove(os.path.join(directory, filename))
+                removed += 1
+    return removed
+
+def build_images(jobs=1, profile=None):
+    """Gera as variantes de todas as imagens e atualiza o manifesto."""
+    profiler = BuildProfiler('image_pipeline', profile, jobs)
+    if Image is None:
+        print("❌ Pillow não está instalado (pip install pillow); imagens não processadas")
+        return None
+    formats = output_formats()
+    print(f"🖼️  Otimizando imagens de {SOURCE_DIR} ({', '.join(formats)})...")
+
+    previous = read_manifest()
+    images = {}
+    variants = {}
+    pending = {}  # hash -> imagem original que será decodificada
+    for source in find_images():
+        key = source.replace(os.path.sep, '/')
+        with profiler.article(source), profiler.stage('hash'):
+            digest = image_hash(source)
+        images[key] = digest
+        if digest in variants or digest in pending:
+            continue
+        entry = previous['variants'].get(digest)
+        if entry and entry_is_current(entry, formats):
+            variants[digest] = entry
+        else:
+            pending[digest] = source
+
+    tasks = [(source, digest, formats) for digest, source in pending.items()]
+    for (source, digest, _), (entry, error) in zip(tasks, profiler.map(encode_variants, tasks, jobs)):
+        if entry is None:
+            print(f"❌ Erro ao processar {source}: {error}")
+            continue
+        print(f"  ✓ {source}")
+        variants[digest] = entry
+    images = {key: digest for key, digest in images.items() if digest in variants}
+
+    with profiler.stage('manifest'):
+        manifest = {'version': MANIFEST_VERSION, 'images': images, 'variants': variants}
+        write_if_changed(MANIFEST_PATH, json.dumps(manifest, ensure_ascii=False, sort_keys=True, indent=1))
+        removed = remove_stale_variants(variants)
+
+    duplicates = len(images) - len(set(images.values()))
+    print(f"\n📊 Imagens: {len(images)} | Processadas: {len(pending)} | Reaproveitadas: {len(variants) - len(pending)}")
+    print(f"   ♊ Cópias idênticas: {duplicates} | 🗑️  Variantes removidas: {removed}")
+    profiler.finish()
+    return manifest
+
+# --- Uso das variantes nos cards ---
+
+def load_image_manifest(path=MANIFEST_PATH):
+    """Manifesto de imagens, lido uma única vez por processo (até reset_image_manifest)."""
+    global _manifest, _manifest_version
+    if _manifest is None:
+        _manifest = read_manifest(path)
+        data = json.dumps(_manifest, sort_keys=True, ensure_ascii=False)
+        _manifest_version = hashlib.sha256(data.encode('utf-8')).hexdigest()[:12]
+    return _manifest
+
+def image_manifest_version():
+    """Hash do manifesto em uso: muda quando as variantes de alguma imagem mudam."""
+    load_image_manifest()
+    return _manifest_version
+
+def reset_image_manifest():
+    """Descarta o manifesto em memória; a próxima consulta o lê de novo do disco."""
+    global _manifest, _manifest_version
+    _manifest = _manifest_version = None
+
+def image_key(image_url):
+    """Caminho (relativo à raiz do site) de uma URL de imagem do próprio site, ou None."""
+    parts = urlsplit(image_url)
+    if parts.netloc not in SITE_HOSTS:
+        return None
+    path = unquote(parts.path)
+    while path.startswith(('../', './')):
+        path = path.split('/', 1)[1]
+    return path.lstrip('/')
+
+def responsive_image(image_url):
+    """Variantes e dimensões de uma imagem, ou None se ela não foi processada."""
+    manifest = load_image_manifest()
+    digest = manifest['images'].get(image_key(image_url))
+    return manifest['variants'].get(digest) if digest else None
+
+def srcset(variants):
+    """Valor do atributo srcset de uma lista de variantes [[largura, url], ...]."""
+    return ', '.join(f'{url} {width}w' for width, url in variants)
+
+def image_attributes(image_url, sizes=CARD_SIZES):
+    """Atributos srcset/sizes/width/height de um <img>, já escapados ('' se não houver variantes).
+
+    O srcset usa WebP, aceito por todos os navegadores atuais; o atributo src
+    continua apontando para a imagem original.
+    """
+    entry = responsive_image(image_url)
+    if not entry or 'webp' not in entry['sources']:
+        return ''
+    return (
+        f' srcset="{escape(srcset(entry["sources"]["webp"]))}" sizes="{escape(sizes)}"'
+        f' width="{entry["width"]}" height="{entry["height"]}"'
+    )
+
+def picture(img_html, image_url, sizes=CARD_SIZES):
+    """Envolve um <img> em <picture> com as variantes AVIF, se houver; senão devolve o <img>."""
+    entry = responsive_image(image_url)
+    if not entry or 'avif' not in entry['sources']:
+        return img_html
+    source = f'<source type="image/avif" srcset="{escape(srcset(entry["sources"]["avif"]))}" sizes="{escape(sizes)}">'
+    return f'<picture>{source}{img_html}</picture>'
+
+def card_image_data(image_url):
+    """Campos de imagem responsiva para os cards montados no navegador ({} se não houver variantes)."""
+    entry = responsive_image(image_url)
+    if not entry or 'webp' not in entry['sources']:
+        return {}
+    data = {
+        'srcset': srcset(entry['sources']['webp']), 'sizes': CARD_SIZES,
+        'width': entry['width'], 'height': entry['height'],
+    }
+    if 'avif' in entry['sources']:
+        data['srcset_avif'] = srcset(entry['sources']['avif'])
+    return data
+
+def image_signature(image_url):
+    """Identifica as variantes usadas por uma imagem (muda quando o card precisa ser regravado)."""
+    entry = responsive_image(image_url)
+    return entry['sources'] if entry else None
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera versões otimizadas e responsivas das imagens do blog.')
+    add_jobs_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    build_images(jobs=args.jobs, profile=args.profile)
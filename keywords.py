@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Palavras-chave dos artigos, calculadas por TF-IDF sobre todo o acervo.
+
+A contagem de termos é feita por artigo (e fica no cache de metadados, no
+campo `terms`, com os KEYWORD_CANDIDATES termos mais frequentes). Depois que
+os metadados de todos os artigos foram coletados, `assign_corpus_keywords`
+pondera essas contagens pela raridade de cada termo no acervo (IDF), de modo
+que palavras presentes em quase todos os artigos ("inteligência", "empresa",
+textos fixos do template) deixam de dominar as palavras-chave usadas na
+pontuação de artigos relacionados.
+
+As contagens são mantidas esparsas (um dicionário por artigo), o que para o
+tamanho do blog é mais rápido que montar matrizes e não exige dependências.
+"""
+
+import math
+import re
+from collections import Counter
+
+MIN_WORD_LENGTH = 4
+NUM_KEYWORDS = 5
+KEYWORD_CANDIDATES = 50  # termos mais frequentes guardados por artigo
+
+PUNCTUATION = re.compile(r'[^\w\s]')
+
+# Palavras funcionais do português (só as com MIN_WORD_LENGTH letras ou mais
+# importam; as menores já são descartadas pelo tamanho)
+STOPWORDS = frozenset("""
+    o a os as um uma uns umas de do da dos das no na nos nas ao aos à às pelo
+    pela pelos pelas por para em que com se não e é são mas ou
+
+    ainda algo alguém algum alguma algumas alguns além antes apenas após aqui
+    assim até através bastante bem cada coisa coisas como contra contudo
+    cujo cuja cujos cujas depois desde dessa desse desta deste dessas desses
+    destas destes disso disto dela dele delas deles demais dentro durante
+    então entre essa esse esta este essas esses estas estes isso isto aquela
+    aquele aquelas aqueles aquilo está estão estava estavam esteja estejam
+    estar estou estamos esteve estiveram foram fosse fossem fora ser sendo
+    sido será serão seria seriam seja sejam somos sou temos tenho tinha
+    tinham tiver tiveram teve terá terão teria teriam tendo haver havia
+    houve haja pode podem poderá poderão poderia poderiam podendo deve devem
+    deverá deveria faz fazem fazer feito feita fazendo vai vão vamos
+    mais menos muito muita muitos muitas pouco pouca poucos poucas quanto
+    quanta quantos quantas quase mesmo mesma mesmos mesmas outro outra
+    outros outras própria próprio próprias próprios qual quais qualquer
+    quaisquer quando quem onde porque porquê pois porém sobre sob sem
+    também tampouco tanto tanta tantos tantas toda todo todas todos tudo
+    nada nenhum nenhuma nunca sempre já agora hoje ontem amanhã ali
+    lá cá seu sua seus suas meu minha meus minhas nosso nossa nossos nossas
+    vosso vossa teu tua você vocês eles elas nele nela neles nelas nesse
+    nessa nesses nessas neste nesta nestes nestas nisso nisto num numa
+    àquela àquele daquela daquele naquela naquele tais tal vez vezes
+    enquanto embora caso conforme segundo cerca tipo forma maneira
+""".split())
+
+def tokenize(text, min_length=MIN_WORD_LENGTH):
+    """Palavras relevantes do texto, em minúsculas e sem pontuação."""
+    words = PUNCTUATION.sub('', text.lower()).split()
+    return [word for word in words if len(word) >= min_length and word not in STOPWORDS]
+
+def term_counts(text, limit=KEYWORD_CANDIDATES):
+    """Os `limit` termos mais frequentes do texto, com suas contagens."""
+    return dict(Counter(tokenize(text)).most_common(limit))
+
+def extract_keywords(text, num_keywords=NUM_KEYWORDS):
+    """Palavras-chave de um texto isolado (apenas pela frequência dos termos)."""
+    return [word for word, _ in Counter(tokenize(text)).most_common(num_keywords)]
+
+def document_frequencies(terms_by_id):
+    """Em quantos artigos cada termo aparece."""
+    frequencies = Counter()
+    for terms in terms_by_id.values():
+        frequencies.update(terms.keys())
+    return frequencies
+
+def inverse_document_frequencies(terms_by_id):
+    """IDF de cada termo; termos presentes em todos os artigos têm peso zero."""
+    total = len(terms_by_id)
+    return {
+        term: math.log((1 + total) / (1 + count))
+        for term, count in document_frequencies(terms_by_id).items()
+    }
+
+def tfidf_keywords(terms_by_id, num_keywords=NUM_KEYWORDS):
+    """Palavras-chave de cada artigo por TF-IDF sobre todo o conjunto.
+
+    `terms_by_id` mapeia cada artigo às contagens de `term_counts`. Empates
+    (inclusive quando há um único artigo) mantêm a ordem de frequência.
+    """
+    idf = inverse_document_frequencies(terms_by_id)
+    keywords = {}
+    for article_id, terms in terms_by_id.items():
+        ranked = sorted(
+            enumerate(terms.items()),
+            key=lambda item: (-item[1][1] * idf[item[1][0]], item[0])
+        )
+        keywords[article_id] = [term for _, (term, _) in ranked[:num_keywords]]
+    return keywords
+
+def tfidf_vectors(terms_by_id):
+    """Vetor TF-IDF esparso e normalizado (norma 1) de cada artigo.
+
+    Cada vetor é um dicionário termo -> peso; o produto escalar de dois
+    vetores é a similaridade de cosseno entre os artigos.
+    """
+    idf = inverse_document_frequencies(terms_by_id)
+    vectors = {}
+    for article_id, terms in terms_by_id.items():
+        weights = {term: count * idf[term] for term, count in terms.items() if idf[term] > 0}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+        vectors[article_id] = {term: weight / norm for term, weight in weights.items()} if norm else {}
+    return vectors
+
+def assign_corpus_keywords(article_data, num_keywords=NUM_KEYWORDS):
+    """Substitui o campo `keywords` de cada artigo pelas palavras-chave TF-IDF do acervo."""
+    terms_by_id = {article_id: data['terms'] for article_id, data in article_data.items() if 'terms' in data}
+    for article_id, keywords in tfidf_keywords(terms_by_id, num_keywords).items():
+        article_data[article_id]['keywords'] = keywords
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Teste de carga do api_server.py.
+
+Abre --concurrency conexões keep-alive (asyncio, só biblioteca padrão) e
+envia --requests requisições no total, misturando POST /api/related-articles
+(artigos de articles/) e GET /api/search (palavras dos títulos, inclusive
+prefixos). Ao final imprime requisições por segundo, status e a latência
+p50/p90/p99/máxima de cada rota; com --output, grava o resultado em JSON.
+
+Com --unique, cada requisição é diferente das anteriores sempre que possível
+(mede o servidor sem o cache LRU); o padrão repete as consultas como um
+tráfego real.
+
+Uso:
+    python api_server.py --port 8081 &
+    python load_test.py --url http://127.0.0.1:8081 --requests 5000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from urllib.parse import quote, urlsplit
+from safe_write import atomic_write
+
+ARTICLES_DIR = 'articles'
+SEARCH_SHARE = 0.5  # fração das requisições que são buscas
+
+def percentile(values, fraction):
+    """Percentil (método do valor mais próximo) de uma lista ordenada."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+def build_workload(total, unique=False, seed=0):
+    """Lista de (rota, método, alvo, corpo) com as requisições do teste."""
+    rng = random.Random(seed)
+    articles = sorted(filename for filename in os.listdir(ARTICLES_DIR) if filename.endswith('.html'))
+    words = sorted({
+        word.lower() for filename in articles
+        for word in filename[:-len('.html')].split('-') if len(word) >= 4 and word.isalpha()
+    })
+    if not articles or not words:
+        raise SystemExit('Nenhum artigo encontrado em articles/')
+    if unique:
+        rng.shuffle(articles)
+        rng.shuffle(words)
+
+    workload = []
+    for number in range(total):
+        if rng.random() < SEARCH_SHARE:
+            word = words[number % len(words)] if unique else rng.choice(words)
+            # Metade das buscas tem duas palavras, com a última incompleta
+            if rng.random() < 0.5:
+                word = f'{rng.choice(words)} {word[:max(3, len(word) - 2)]}'
+            workload.append(('search', 'GET', f'/api/search?q={quote(word)}', b''))
+        else:
+            filename = articles[number % len(articles)] if unique else rng.choice(articles)
+            body = json.dumps({
+                'current_path': f'/{ARTICLES_DIR}/{filename}',
+                'current_title': filename[:-len('.html')].replace('-', ' '),
+                'current_category': '',
+            }).encode('utf-8')
+            workload.append(('related', 'POST', '/api/related-articles', body))
+    return workload
+
+async def worker(host, port, queue, results):
+    """Envia requisições da fila por uma conexão keep-alive, medindo cada uma."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            try:
+                route, method, target, body = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            request = (
+                f'{method} {target} HTTP/1.1\r\nHost: {host}\r\n'
+                f'Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n'
+            ).encode('latin-1') + body
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b'\r\n\r\n')
+            lines = head.decode('latin-1').split('\r\n')
+            status = int(lines[0].split(' ')[1])
+            length = next((int(line.split(':', 1)[1]) for line in lines if line.lower().startswith('content-length:')), 0)
+            await reader.readexactly(length)
+            results.append((route, status, time.perf_counter() - started))
+            if any(line.lower() == 'connection: close' for line in lines):
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+    finally:
+        writer.close()
+
+async def run_load_test(url, workload, concurrency):
+    """Executa o teste e retorna (resultados, duração em segundos)."""
+    parts = urlsplit(url)
+    queue = asyncio.Queue()
+    for item in workload:
+        queue.put_nowait(item)
+    results = []
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(parts.hostname, parts.port or 80, queue, results) for _ in range(concurrency)))
+    return results, time.perf_counter() - started
+
+def summarize(results, duration):
+    """Totais e percentis de latência (em ms) por rota e no geral."""
+    latencies = defaultdict(list)
+    for route, _, latency in results:
+        latencies[route].append(latency * 1000)
+        latencies['total'].append(latency * 1000)
+    routes = {}
+    for route, values in sorted(latencies.items(), key=lambda item: (item[0] == 'total', item[0])):
+        values.sort()
+        routes[route] = {
+            'requests': len(values),
+            'p50': round(percentile(values, 0.50), 3),
+            'p90': round(percentile(values, 0.90), 3),
+            'p99': round(percentile(values, 0.99), 3),
+            'max': round(values[-1], 3),
+        }
+    return {
+        'requests': len(results),
+        'duration': round(duration, 3),
+        'requests_per_second': round(len(results) / duration, 1) if duration else 0,
+        'status': dict(Counter(str(status) for _, status, _ in results)),
+        'routes': routes,
+    }
+
+def main(url, total, concurrency, unique=False, output=None):
+    workload = build_workload(total, unique)
+    print(f"🔥 {len(workload)} requisições em {concurrency} conexões para {url}...")
+    results, duration = asyncio.run(run_load_test(url, workload, concurrency))
+    summary = summarize(results, duration)
+
+    print(f"\n📊 {summary['requests']} requisições em {summary['duration']:.2f}s ({summary['requests_per_second']:.0f} req/s) | Status: {summary['status']}")
+    print(f"{'Rota':<10}{'Requisições':>13}{'p50 (ms)':>11}{'p90 (ms)':>11}{'p99 (ms)':>11}{'máx (ms)':>11}")
+    for route, row in summary['routes'].items():
+        print(f"{route:<10}{row['requests']:>13}{row['p50']:>11.2f}{row['p90']:>11.2f}{row['p99']:>11.2f}{row['max']:>11.2f}")
+    if output:
+        atomic_write(output, json.dumps(summary, indent=2))
+        print(f"Resultado gravado em {output}")
+    return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Teste de carga do api_server.py (latência p50/p99).')
+    parser.add_argument('--url', default='http://127.0.0.1:8081', help='endereço do servidor (padrão: http://127.0.0.1:8081)')
+    parser.add_argument('--requests', type=int, default=2000, help='total de requisições (padrão: 2000)')
+    parser.add_argument('--concurrency', type=int, default=20, help='conexões simultâneas (padrão: 20)')
+    parser.add_argument('--unique', action='store_true', help='evita repetir consultas (mede o servidor sem o cache LRU)')
+    parser.add_argument('--output', help='grava o resultado em JSON neste caminho')
+    args = parser.parse_args()
+    main(args.url, args.requests, args.concurrency, unique=args.unique, output=args.output)
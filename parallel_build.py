@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Execução paralela do processamento por artigo.
+
+O parsing com html.parser é Python puro e limitado pela CPU; com `--jobs N`
+o trabalho de cada artigo é distribuído entre N processos, enquanto as etapas
+globais (índice de relacionados, index.html, sitemap) continuam no processo
+principal.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+def add_jobs_argument(parser):
+    """Adiciona a opção --jobs a um ArgumentParser."""
+    parser.add_argument(
+        '--jobs', '-j', type=int, default=1, metavar='N',
+        help='número de processos para o trabalho por artigo (0 = todos os núcleos; padrão: 1)'
+    )
+
+def resolve_jobs(jobs):
+    """Converte o valor de --jobs no número efetivo de processos."""
+    if jobs is None or jobs < 0:
+        return 1
+    if jobs == 0:
+        return os.cpu_count() or 1
+    return jobs
+
+def map_articles(func, items, jobs=1):
+    """Aplica `func` a cada item, em paralelo quando jobs > 1, preservando a ordem."""
+    items = list(items)
+    jobs = min(resolve_jobs(jobs), len(items))
+    if jobs <= 1:
+        return [func(item) for item in items]
+
+    # Evita que a saída pendente do processo principal seja duplicada nos filhos
+    sys.stdout.flush()
+    sys.stderr.flush()
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
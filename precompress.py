@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Cópias pré-comprimidas (.gz e .br) das páginas e arquivos estáticos do site.
+
+Cada arquivo HTML, CSS, JS, XML (sitemap) e JSON de assets/data ganha, ao
+lado, as versões gzip (nível 9) e brotli (qualidade 11), para que o
+servidor ou a CDN as entregue sem comprimir a cada requisição (gzip_static
+/ brotli_static no nginx, por exemplo). As cópias são gravadas sem data
+(mtime 0), então o mesmo conteúdo sempre gera os mesmos bytes.
+
+As cópias não são versionadas (*.gz e *.br estão no .gitignore): o GitHub
+Pages comprime as respostas por conta própria e nunca entrega esses
+arquivos. No CI, a etapa serve apenas ao relatório de compressão; para um
+servidor com gzip_static/brotli_static, rode o script no artefato publicado.
+
+O hash do conteúdo de cada arquivo fica em .cache/precompress.json: apenas
+os arquivos que mudaram desde a última execução são comprimidos de novo, e
+cópias de arquivos que não existem mais são removidas. Ao final é impresso
+(e gravado em .cache/compression_report.json) o relatório de compressão por
+tipo de arquivo.
+
+O brotli é opcional (pip install brotli); sem ele, só as cópias .gz são
+geradas.
+
+Uso:
+    python precompress.py --jobs 0
+"""
+
+import argparse
+import gzip
+import json
+import os
+from collections import defaultdict
+from article_cache import CACHE_DIR, content_hash
+from asset_graph import format_bytes, site_files
+from parallel_build import add_jobs_argument
+from safe_write import atomic_write, write_if_changed
+from build_profile import BuildProfiler, add_profile_argument, profile_stage
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATE_PATH = os.path.join(CACHE_DIR, 'precompress.json')
+REPORT_PATH = os.path.join(CACHE_DIR, 'compression_report.json')
+STATE_VERSION = 1
+
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.xml')
+COMPRESSIBLE_DIRS = {'.json': 'assets/data/'}  # extensões comprimidas apenas dentro de um diretório
+EXCLUDED_PREFIXES = ('templates/',)
+MIN_SIZE = 1024  # abaixo disso a cópia comprimida não compensa uma requisição a menos
+ENCODINGS = ('gzip', 'brotli')
+SUFFIXES = {'gzip': '.gz', 'brotli': '.br'}
+
+def is_compressible(path):
+    """True se o arquivo publicado deve ter cópias comprimidas."""
+    if path.startswith(EXCLUDED_PREFIXES):
+        return False
+    extension = os.path.splitext(path)[1].lower()
+    if extension in COMPRESSIBLE_DIRS:
+        return path.startswith(COMPRESSIBLE_DIRS[extension])
+    return extension in COMPRESSIBLE_EXTENSIONS
+
+def active_encodings():
+    """Codificações disponíveis neste ambiente."""
+    return [encoding for encoding in ENCODINGS if encoding != 'brotli' or brotli is not None]
+
+def compress(data, encoding):
+    """Conteúdo comprimido com a maior compressão de cada formato."""
+    if encoding == 'gzip':
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    return brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+
+def compress_file(task):
+    """Grava as cópias comprimidas de um arquivo (executado em paralelo com --jobs).
+
+    Retorna ({codificação: tamanho}, None) ou (None, mensagem de erro). Uma
+    cópia que não fica menor que o original não é gravada (tamanho None).
+    """
+    path, encodings = task
+    try:
+        with profile_stage('read'), open(path, 'rb') as f:
+            data = f.read()
+        sizes = {}
+        for encoding in encodings:
+            with profile_stage(encoding):
+                compressed = compress(data, encoding)
+            sibling = path + SUFFIXES[encoding]
+            if len(compressed) < len(data):
+                with profile_stage('write'):
+                    write_if_changed(sibling, compressed)
+                sizes[encoding] = len(compressed)
+            else:
+                remove_file(sibling)
+                sizes[encoding] = None
+    except Exception as e:
+        return None, str(e)
+    return sizes, None
+
+def remove_file(path):
+    """Remove um arquivo, se existir. Retorna True se removeu."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+def entry_is_current(path, entry, digest, encodings):
+    """True se as cópias registradas foram geradas deste conteúdo e continuam no disco."""
+    if entry is None or entry['hash'] != digest or sorted(entry['sizes']) != sorted(encodings):
+        return False
+    return all(
+        size is None or os.path.exists(path + SUFFIXES[encoding])
+        for encoding, size in entry['sizes'].items()
+    )
+
+def read_state(path=STATE_PATH):
+    """Hashes e tamanhos registrados pela última execução."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get('entries', {}) if data.get('version') == STATE_VERSION else {}
+
+def remove_stale_copies(files, targets):
+    """Remove cópias comprimidas de arquivos que não existem mais ou deixaram de ser comprimidos."""
+    removed = 0
+    for path in files:
+        for suffix in SUFFIXES.values():
+            if path.endswith(suffix) and is_compressible(path[:-len(suffix)]) and path[:-len(suffix)] not in targets:
+                removed += remove_file(path)
+    return removed
+
+def compression_report(entries):
+    """Totais por tipo de arquivo: arquivos, bytes originais e bytes de cada codificação."""
+    totals = defaultdict(lambda: {'files': 0, 'original': 0, **{encoding: 0 for encoding in ENCODINGS}})
+    for path, entry in entries.items():
+        for key in (os.path.splitext(path)[1].lower(), 'total'):
+            row = totals[key]
+            row['files'] += 1
+            row['original'] += entry['size']
+            for encoding, size in entry['sizes'].items():
+                # Sem cópia comprimida, o servidor entrega o original
+                row[encoding] += entry['size'] if size is None else size
+    return dict(sorted(totals.items(), key=lambda item: (item[0] == 'total', item[0])))
+
+def print_report(report, encodings):
+    """Imprime o relatório de compressão em forma de tabela."""
+    print(f"{'Tipo':<8}{'Arquivos':>10}{'Original':>12}" + ''.join(f"{encoding:>12}{'%':>8}" for encoding in encodings))
+    for extension, row in report.items():
+        line = f"{extension:<8}{row['files']:>10}{format_bytes(row['original']):>12}"
+        for encoding in encodings:
+            ratio = row[encoding] / row['original'] * 100 if row['original'] else 0
+            line += f"{format_bytes(row[encoding]):>12}{ratio:>7.1f}%"
+        print(line)
+
+def build_precompressed(jobs=1, profile=None):
+    """Comprime os arquivos que mudaram e imprime o relatório de compressão."""
+    profiler = BuildProfiler('precompress', profile, jobs)
+    encodings = active_encodings()
+    print(f"🗜️  Pré-comprimindo páginas e arquivos estáticos ({', '.join(encodings)})...")
+    if brotli is None:
+        print("⚠️  brotli não está instalado (pip install brotli); apenas cópias .gz serão geradas")
+
+    previous = read_state()
+    entries = {}
+    pending = []
+    with profiler.stage('hash'):
+        files = site_files()
+        for path in files:
+            if not is_compressible(path) or os.path.getsize(path) < MIN_SIZE:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            digest = content_hash(data)
+            entry = previous.get(path)
+            if entry_is_current(path, entry, digest, encodings):
+                entries[path] = entry
+            else:
+                entries[path] = {'hash': digest, 'size': len(data), 'sizes': {}}
+                pending.append(path)
+
+    errors = 0
+    tasks = [(path, encodings) for path in pending]
+    for path, (sizes, error) in zip(pending, profiler.map(compress_file, tasks, jobs)):
+        if sizes is None:
+            print(f"❌ Erro ao comprimir {path}: {error}")
+            del entries[path]
+            errors += 1
+            continue
+        entries[path]['sizes'] = sizes
+
+    with profiler.stage('cleanup'):
+        removed = remove_stale_copies(files, entries)
+        atomic_write(STATE_PATH, json.dumps({'version': STATE_VERSION, 'entries': entries}, ensure_ascii=False))
+        report = compression_report(entries)
+        atomic_write(REPORT_PATH, json.dumps(report, indent=2))
+
+    print(f"\n📊 Arquivos: {len(entries)} | Comprimidos: {len(pending) - errors} | Inalterados: {len(entries) - len(pending) + errors} | 🗑️  Cópias removidas: {removed}")
+    print_report(report, encodings)
+    print(f"Relatório gravado em {REPORT_PATH}")
+    profiler.finish()
+    return report
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Gera cópias .gz e .br das páginas e arquivos estáticos do site.')
+    add_jobs_argument(parser)
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    build_precompressed(jobs=args.jobs, profile=args.profile)
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Motor compartilhado de artigos relacionados.
+
+Em vez de comparar cada artigo com todos os outros, monta índices invertidos
+(tag -> artigos, categoria -> artigos, palavra-chave -> artigos) e pontua
+apenas os candidatos que compartilham alguma característica com o artigo
+alvo. Os pesos, o ranking e os critérios de desempate são os mesmos do
+algoritmo original: maior pontuação primeiro e, em caso de empate, a ordem em
+que os artigos aparecem em `article_data`.
+
+Com a opção --similarity, a pontuação também considera a similaridade de
+cosseno entre os vetores TF-IDF dos textos (SimilarityIndex), o que desfaz
+os muitos empates entre artigos com as mesmas tags e categoria. Os pesos de
+tags, categoria e palavras-chave continuam somados como bônus.
+
+As listas calculadas também são publicadas como arquivos JSON estáticos
+(um por artigo, em assets/data/related/), lidos pelo blog-global.js para
+atualizar os cards sem regravar o HTML dos artigos.
+"""
+
+import heapq
+import json
+import os
+from array import array
+from collections import defaultdict
+from article_cache import fingerprint
+from image_pipeline import card_image_data, image_signature
+from keywords import tfidf_vectors
+from safe_write import write_if_changed
+
+TAG_WEIGHT = 3       # Correspondência de tags (peso alto)
+CATEGORY_WEIGHT = 2  # Correspondência de categoria (peso médio)
+KEYWORD_WEIGHT = 1   # Correspondência de palavras-chave (peso baixo)
+SIMILARITY_WEIGHT = 10  # Similaridade de cosseno (0 a 1) no modo --similarity
+
+# Termos presentes em mais que esta fração dos artigos não entram no índice de
+# similaridade: pesam pouco no cosseno e têm as listas de artigos mais longas
+MAX_DOCUMENT_FREQUENCY = 0.5
+# Artigos guardados por termo (os de maior peso): limita o custo de cada busca
+# em acervos muito grandes; abaixo disso o cosseno é exato
+MAX_POSTINGS = 1000
+
+RELATED_INDEX_DIR = os.path.join('assets', 'data', 'related')
+RELATED_INDEX_VERSION = 1
+
+class RelatedArticlesIndex:
+    """Índices invertidos de tags, categorias e palavras-chave para busca de relacionados."""
+
+    def __init__(self, article_data):
+        self.article_data = article_data
+        self.order = {}
+        self.tag_index = defaultdict(list)
+        self.category_index = defaultdict(list)
+        self.keyword_index = defaultdict(list)
+
+        for position, (article_id, data) in enumerate(article_data.items()):
+            self.order[article_id] = position
+            for tag in set(data['tags']):
+                self.tag_index[tag].append(article_id)
+            self.category_index[data['category']].append(article_id)
+            for keyword in set(data['keywords']):
+                self.keyword_index[keyword].append(article_id)
+
+    def scores(self, article_id):
+        """Pontua os artigos que compartilham ao menos uma característica com o alvo."""
+        target = self.article_data[article_id]
+        scores = defaultdict(int)
+
+        for tag in set(target['tags']):
+            for other_id in self.tag_index.get(tag, ()):
+                scores[other_id] += TAG_WEIGHT
+
+        for other_id in self.category_index.get(target['category'], ()):
+            scores[other_id] += CATEGORY_WEIGHT
+
+        for keyword in set(target['keywords']):
+            for other_id in self.keyword_index.get(keyword, ()):
+                scores[other_id] += KEYWORD_WEIGHT
+
+        scores.pop(article_id, None)
+        return scores
+
+    def find(self, article_id, num_related=3):
+        """Retorna os IDs dos `num_related` artigos mais relacionados ao alvo."""
+        scores = self.scores(article_id)
+        order = self.order
+        related = heapq.nsmallest(
+            num_related, scores.items(), key=lambda item: (-item[1], order[item[0]])
+        )
+        related_ids = [other_id for other_id, _ in related]
+
+        # Completa com artigos sem nenhuma característica em comum (pontuação zero),
+        # na ordem original, como fazia a ordenação de todos os artigos
+        if len(related_ids) < num_related:
+            for other_id in self.article_data:
+                if len(related_ids) >= num_related:
+                    break
+                if other_id != article_id and other_id not in scores:
+                    related_ids.append(other_id)
+
+        return related_ids
+
+class SimilarityIndex(RelatedArticlesIndex):
+    """RelatedArticlesIndex que soma a similaridade de cosseno entre os textos.
+
+    Os vetores TF-IDF vêm das contagens de termos (`terms`) dos metadados. O
+    índice invertido guarda, para cada termo, os artigos e pesos em arrays
+    compactos; o cosseno de um artigo com todos os outros é a soma, sobre os
+    seus termos, dessas listas, sem nunca montar a matriz artigo x artigo.
+    """
+
+    def __init__(self, article_data, weight=SIMILARITY_WEIGHT, max_df=MAX_DOCUMENT_FREQUENCY, max_postings=MAX_POSTINGS):
+        super().__init__(article_data)
+        self.weight = weight
+        self.ids = list(article_data)
+        self.vectors = tfidf_vectors({article_id: data.get('terms', {}) for article_id, data in article_data.items()})
+        max_articles = max(2, int(max_df * len(self.ids)))
+
+        postings = defaultdict(lambda: (array('i'), array('d')))
+        for position, article_id in enumerate(self.ids):
+            for term, term_weight in self.vectors[article_id].items():
+                positions, weights = postings[term]
+                positions.append(position)
+                weights.append(term_weight)
+        # Termos de um único artigo não aproximam ninguém; os muito comuns são descartados
+        self.postings = {}
+        for term, (positions, weights) in postings.items():
+            if not 1 < len(positions) <= max_articles:
+                continue
+            if len(positions) > max_postings:
+                kept = sorted(heapq.nlargest(max_postings, range(len(weights)), key=weights.__getitem__))
+                positions = array('i', (positions[i] for i in kept))
+                weights = array('d', (weights[i] for i in kept))
+            self.postings[term] = (positions, weights)
+
+    def similarities(self, article_id):
+        """Similaridade de cosseno do artigo com cada artigo que compartilha algum termo."""
+        ids = self.ids
+        similarities = defaultdict(float)
+        for term, term_weight in self.vectors.get(article_id, {}).items():
+            entry = self.postings.get(term)
+            if entry is None:
+                continue
+            for position, other_weight in zip(*entry):
+                similarities[ids[position]] += term_weight * other_weight
+        similarities.pop(article_id, None)
+        return similarities
+
+    def scores(self, article_id):
+        scores = super().scores(article_id)
+        for other_id, similarity in self.similarities(article_id).items():
+            scores[other_id] += self.weight * similarity
+        return scores
+
+def build_related_index(article_data, similarity=False):
+    """Índice de relacionados no modo escolhido (--similarity ou só tags/categoria)."""
+    if similarity:
+        return SimilarityIndex(article_data)
+    return RelatedArticlesIndex(article_data)
+
+def add_similarity_argument(parser):
+    """Adiciona a opção --similarity a um ArgumentParser."""
+    parser.add_argument(
+        '--similarity', action='store_true',
+        help='pontua os artigos relacionados também pela similaridade do texto (TF-IDF e cosseno)'
+    )
+
+def find_related_articles(article_id, article_data, num_related=3):
+    """Encontra artigos relacionados baseados em tags e conteúdo.
+
+    Para consultas de muitos artigos sobre o mesmo conjunto, crie um
+    `RelatedArticlesIndex` uma única vez e use `find`.
+    """
+    return RelatedArticlesIndex(article_data).find(article_id, num_related)
+
+def related_articles_signature(related_ids, article_data):
+    """Assinatura de tudo o que os cards de relacionados gravam em um artigo.
+
+    Compartilhada pelo update_script.py e pelo generate_related_articles.py:
+    se a assinatura guardada no cache de metadados é a mesma, o artigo não
+    precisa ser renderizado de novo.
+    """
+    cards = []
+    for related_id in related_ids:
+        if related_id in article_data:
+            article = article_data[related_id]
+            card = [
+                related_id, article['path'], article['image_url'], article['title'],
+                article['excerpt'][:150], article['author'], article['publish_date'].strftime('%Y-%m-%d'),
+            ]
+            variants = image_signature(article['image_url'])
+            if variants:
+                card.append(variants)
+            cards.append(card)
+    return fingerprint(cards)
+
+def related_card(article, format_date):
+    """Dados de um card de artigo relacionado, como exibidos no HTML dos artigos."""
+    # Corrige URLs de imagem se necessário (relativas ao diretório articles/)
+    image_url = article['image_url']
+    if not image_url.startswith(('http://', 'https://', '/')):
+        image_url = image_url if '../' in image_url else '../' + image_url
+    card = {
+        'path': '/' + article['path'].lstrip('/'),
+        'title': article['title'],
+        'excerpt': article['excerpt'][:150] + '...',
+        'image_url': image_url,
+        'author': article['author'],
+        'publish_date': article['publish_date'].strftime('%Y-%m-%d'),
+        'formatted_date': format_date(article['publish_date']),
+    }
+    # srcset, dimensões e variantes AVIF, quando a imagem foi otimizada
+    card.update(card_image_data(article['image_url']))
+    return card
+
+def write_related_index(related_by_id, article_data, format_date, directory=RELATED_INDEX_DIR):
+    """Grava o JSON de artigos relacionados de cada artigo em `directory`.
+
+    Cada arquivo (<id do artigo>.json) traz a versão do formato e os cards já
+    prontos. Só arquivos cujo conteúdo mudou são regravados, e arquivos de
+    artigos que não existem mais são removidos. Retorna quantos foram gravados.
+    """
+    os.makedirs(directory, exist_ok=True)
+    written = 0
+    for article_id, related_ids in related_by_id.items():
+        data = json.dumps({
+            'version': RELATED_INDEX_VERSION,
+            'related': [related_card(article_data[related_id], format_date) for related_id in related_ids if related_id in article_data],
+        }, ensure_ascii=False, separators=(',', ':'))
+        if write_if_changed(os.path.join(directory, f'{article_id}.json'), data):
+            written += 1
+    
+    for filename in os.listdir(directory):
+        if filename.endswith('.json') and filename[:-len('.json')] not in related_by_id:
+            os.remove(os.path.join(directory, filename))
+    return written
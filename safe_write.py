@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Camada de gravação compartilhada pelos scripts que regravam HTML.
+
+Antes de gravar, o conteúdo novo é comparado (por hash) com o que já está no
+disco: se for idêntico, o arquivo não é tocado, preservando o mtime (usado
+como data de publicação de reserva) e evitando diffs vazios no git. Mudanças
+reais são gravadas em um arquivo temporário no mesmo diretório e movidas com
+os.replace, para que uma interrupção no meio da execução nunca deixe um
+arquivo truncado.
+"""
+
+import hashlib
+import os
+import tempfile
+
+def file_hash(path):
+    """Hash SHA-256 do conteúdo de um arquivo, ou None se ele não existir."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def atomic_write(path, content, encoding='utf-8'):
+    """Grava `content` em `path` via arquivo temporário + rename."""
+    data = content.encode(encoding) if isinstance(content, str) else content
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    try:
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        # Mesma permissão que open() usaria para um arquivo novo
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def replace_if_changed(tmp_path, path):
+    """Move um arquivo temporário já gravado para `path`, a menos que seja idêntico.
+
+    Para gravações em streaming (como o sitemap). Retorna True se `path` mudou.
+    """
+    if file_hash(tmp_path) == file_hash(path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+def write_if_changed(path, content, encoding='utf-8'):
+    """Grava `content` em `path` apenas se diferir do que está no disco.
+
+    Retorna True se o arquivo foi gravado e False se já estava atualizado.
+    """
+    data = content.encode(encoding) if isinstance(content, str) else content
+    if file_hash(path) == hashlib.sha256(data).hexdigest():
+        return False
+    atomic_write(path, data)
+    return True
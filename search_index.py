@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Índice de busca pré-calculado, lido pelo blog-global.js.
+
+O índice invertido cobre o título, o resumo, a categoria e as tags de cada
+artigo, mais os termos mais frequentes do corpo (os mesmos `terms` que o
+cache de metadados já guarda para as palavras-chave). A tokenização é a de
+keywords.tokenize, com os acentos removidos depois ("inteligência" e
+"inteligencia" são o mesmo termo).
+
+Os termos são divididos em arquivos pelo prefixo de SHARD_PREFIX_LENGTH
+letras (assets/data/search/<prefixo>.json), então o navegador baixa apenas os
+arquivos dos termos da busca. Os artigos (título, URL, resumo e data) ficam
+em blocos de DOCS_PER_SHARD (assets/data/search/docs/<bloco>.json), baixados
+só para os resultados exibidos. O assets/data/search/index.json traz o hash
+de cada arquivo, as stopwords e os parâmetros da tokenização, para que o
+JavaScript normalize a busca exatamente como o build.
+
+Cada artigo recebe um número fixo, lido dos blocos já gravados: artigos novos
+entram no fim (do mais antigo para o mais recente) e os removidos deixam um
+buraco (null), então publicar um artigo só altera os arquivos dos termos dele
+e o último bloco de artigos.
+"""
+
+import bisect
+import json
+import math
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from article_cache import content_hash
+from keywords import STOPWORDS, tokenize
+from safe_write import write_if_changed
+
+SEARCH_INDEX_DIR = os.path.join('assets', 'data', 'search')
+SEARCH_INDEX_VERSION = 2
+MANIFEST_FILENAME = 'index.json'
+DOCS_DIR = 'docs'
+DOCS_PER_SHARD = 100
+# Títulos, resumos e tags aceitam palavras curtas, para siglas como "IA" e "EUA"
+SEARCH_MIN_WORD_LENGTH = 2
+SHARD_PREFIX_LENGTH = 2
+EXCERPT_LENGTH = 160
+
+FIELD_WEIGHTS = {'title': 8, 'tags': 4, 'category': 4, 'excerpt': 2}
+MAX_BODY_WEIGHT = 4  # ocorrências no corpo contadas até este limite
+
+SHARD_UNSAFE = re.compile(r'[^a-z0-9]')
+SITE_TITLE_SUFFIX = re.compile(r'\s+-\s+IAUTOMATIZE Blog$', re.IGNORECASE)
+
+def article_title(article):
+    """Título do artigo sem o nome do site (presente em quase todos e inútil na busca)."""
+    return SITE_TITLE_SUFFIX.sub('', article['title'])
+
+def fold(term):
+    """Termo sem acentos ("inteligência" -> "inteligencia")."""
+    return ''.join(char for char in unicodedata.normalize('NFD', term) if not unicodedata.combining(char))
+
+def search_terms(text, min_length=SEARCH_MIN_WORD_LENGTH):
+    """Termos de busca de um texto."""
+    return [fold(term) for term in tokenize(text, min_length)]
+
+def shard_key(term):
+    """Nome do arquivo do índice que contém o termo (caracteres fora de a-z0-9 viram _)."""
+    return SHARD_UNSAFE.sub('_', term[:SHARD_PREFIX_LENGTH])
+
+def document_weights(article):
+    """Peso de cada termo em um artigo: soma dos pesos dos campos em que aparece."""
+    weights = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = article_title(article) if field == 'title' else article.get(field) or ''
+        text = ' '.join(value) if isinstance(value, list) else value
+        for term in set(search_terms(text)):
+            weights[term] += weight
+    for term, count in article.get('terms', {}).items():
+        weights[fold(term)] += min(count, MAX_BODY_WEIGHT)
+    return weights
+
+def article_url(article):
+    """URL do artigo, como gravada no índice."""
+    return '/' + article['path'].lstrip('/')
+
+def doc_numbers(article_data, previous=()):
+    """{URL: número} de cada artigo, mantendo os números de `previous`.
+
+    `previous` é a URL de cada número já usado (None para artigos removidos).
+    Artigos novos recebem os números seguintes, do mais antigo para o mais
+    recente (número maior = mais recente, o desempate do navegador), e
+    números de artigos removidos não são reaproveitados.
+    """
+    known = {url: number for number, url in enumerate(previous) if url is not None}
+    # Data sem a hora: artigos sem datePublished usam a data de modificação do
+    # arquivo, que muda a cada gravação
+    articles = sorted(article_data.values(), key=lambda article: (article['publish_date'].date(), article['path']))
+    numbers = {}
+    next_number = len(previous)
+    for article in articles:
+        url = article_url(article)
+        if url in known:
+            numbers[url] = known[url]
+        else:
+            numbers[url] = next_number
+            next_number += 1
+    return numbers
+
+def build_search_index(article_data, format_date, previous=()):
+    """(artigos, arquivos do índice) a partir dos metadados de todos os artigos.
+
+    `artigos` é indexado pelo número de cada artigo (doc_numbers), com None
+    nos números de artigos removidos. Cada arquivo do índice mapeia termo ->
+    [artigo, peso, artigo, peso, ...].
+    """
+    numbers = doc_numbers(article_data, previous)
+    docs = [None] * max(len(previous), max(numbers.values(), default=-1) + 1)
+    shards = defaultdict(lambda: defaultdict(list))
+    for article in sorted(article_data.values(), key=lambda article: numbers[article_url(article)]):
+        number = numbers[article_url(article)]
+        excerpt = article['excerpt']
+        if len(excerpt) > EXCERPT_LENGTH:
+            excerpt = excerpt[:EXCERPT_LENGTH].rsplit(' ', 1)[0] + '...'
+        docs[number] = [article_title(article), article_url(article), excerpt, format_date(article['publish_date'])]
+        for term, weight in sorted(document_weights(article).items()):
+            shards[shard_key(term)][term].extend((number, weight))
+    return docs, {key: dict(sorted(terms.items())) for key, terms in shards.items()}
+
+class SearchIndex:
+    """Busca sobre o índice em memória, com as mesmas regras do blog-global.js.
+
+    O último termo da busca vale como prefixo ("robotax" encontra
+    "robotaxi"); a pontuação de cada artigo é a soma de peso x idf dos
+    termos, e artigos com todos os termos vêm antes dos demais (no empate,
+    o mais recente).
+    """
+
+    def __init__(self, docs, shards):
+        self.docs = docs
+        self.count = sum(doc is not None for doc in docs)
+        self.terms = {term: postings for terms in shards.values() for term, postings in terms.items()}
+        self.sorted_terms = sorted(self.terms)
+
+    def matching_terms(self, term, prefix):
+        """Termos do índice iguais a `term` ou, com `prefix`, começados por ele."""
+        if not prefix:
+            return [term] if term in self.terms else []
+        start = bisect.bisect_left(self.sorted_terms, term)
+        end = bisect.bisect_left(self.sorted_terms, term + '\uffff', start)
+        return self.sorted_terms[start:end]
+
+    def term_scores(self, term, prefix):
+        """Pontuação de cada artigo para um termo da busca."""
+        scores = {}
+        for candidate in self.matching_terms(term, prefix):
+            postings = self.terms[candidate]
+            idf = math.log(1 + self.count / (len(postings) / 2))
+            for position in range(0, len(postings), 2):
+                doc, score = postings[position], postings[position + 1] * idf
+                scores[doc] = max(scores.get(doc, 0), score)
+        return scores
+
+    def search(self, query, limit=8):
+        """Até `limit` artigos para a busca, como (título, URL, resumo, data)."""
+        terms = search_terms(query)
+        totals = Counter()
+        matches = Counter()
+        for position, term in enumerate(terms):
+            for doc, score in self.term_scores(term, position == len(terms) - 1).items():
+                totals[doc] += score
+                matches[doc] += 1
+        complete = [doc for doc in totals if matches[doc] == len(terms)]
+        ranked = sorted(complete or totals, key=lambda doc: (-totals[doc], -doc))
+        return [self.docs[doc] for doc in ranked[:limit]]
+
+def _read_json(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def read_docs(directory=SEARCH_INDEX_DIR):
+    """Artigos gravados nos blocos de `directory`, indexados pelo número (None nos buracos)."""
+    docs_dir = os.path.join(directory, DOCS_DIR)
+    if not os.path.isdir(docs_dir):
+        return []
+    docs = []
+    for filename in os.listdir(docs_dir):
+        try:
+            data = _read_json(os.path.join(docs_dir, filename))
+            start = int(filename[:-len('.json')]) * DOCS_PER_SHARD
+        except (OSError, ValueError):
+            continue
+        if data.get('version') != SEARCH_INDEX_VERSION:
+            continue
+        if len(docs) < start + len(data['docs']):
+            docs.extend([None] * (start + len(data['docs']) - len(docs)))
+        docs[start:start + len(data['docs'])] = data['docs']
+    return docs
+
+def load_search_index(directory=SEARCH_INDEX_DIR):
+    """SearchIndex montado a partir do índice gravado em `directory`."""
+    manifest = _read_json(os.path.join(directory, MANIFEST_FILENAME))
+    if manifest.get('version') != SEARCH_INDEX_VERSION:
+        raise ValueError(f"versão {manifest.get('version')} do índice de busca não suportada")
+    shards = {key: _read_json(os.path.join(directory, f'{key}.json'))['terms'] for key in manifest['shards']}
+    return SearchIndex(read_docs(directory), shards)
+
+def write_search_index(article_data, format_date, directory=SEARCH_INDEX_DIR):
+    """Grava o índice de busca em `directory`. Retorna quantos arquivos mudaram.
+
+    Os números dos artigos vêm dos blocos já gravados (doc_numbers). Só
+    arquivos cujo conteúdo mudou são regravados, e arquivos de prefixos e
+    blocos que não existem mais são removidos. O index.json traz o hash de
+    cada arquivo, usado pelo navegador para não reaproveitar uma versão
+    anterior.
+    """
+    previous = [doc[1] if doc else None for doc in read_docs(directory)]
+    docs, shards = build_search_index(article_data, format_date, previous)
+    docs_dir = os.path.join(directory, DOCS_DIR)
+    os.makedirs(docs_dir, exist_ok=True)
+    written = 0
+    versions = {}
+    for key, terms in shards.items():
+        data = json.dumps({'version': SEARCH_INDEX_VERSION, 'terms': terms}, ensure_ascii=False, separators=(',', ':'))
+        versions[key] = content_hash(data)[:12]
+        if write_if_changed(os.path.join(directory, f'{key}.json'), data):
+            written += 1
+
+    doc_versions = []
+    for start in range(0, len(docs), DOCS_PER_SHARD):
+        data = json.dumps({'version': SEARCH_INDEX_VERSION, 'docs': docs[start:start + DOCS_PER_SHARD]}, ensure_ascii=False, separators=(',', ':'))
+        doc_versions.append(content_hash(data)[:12])
+        if write_if_changed(os.path.join(docs_dir, f'{start // DOCS_PER_SHARD}.json'), data):
+            written += 1
+
+    manifest = json.dumps({
+        'version': SEARCH_INDEX_VERSION,
+        'count': sum(doc is not None for doc in docs),
+        'min_length': SEARCH_MIN_WORD_LENGTH,
+        'prefix_length': SHARD_PREFIX_LENGTH,
+        'docs_per_shard': DOCS_PER_SHARD,
+        'stopwords': sorted(STOPWORDS),
+        'shards': dict(sorted(versions.items())),
+        'docs': doc_versions,
+    }, ensure_ascii=False, separators=(',', ':'))
+    if write_if_changed(os.path.join(directory, MANIFEST_FILENAME), manifest):
+        written += 1
+
+    for filename in os.listdir(directory):
+        if filename.endswith('.json') and filename != MANIFEST_FILENAME and filename[:-len('.json')] not in shards:
+            os.remove(os.path.join(directory, filename))
+    for filename in os.listdir(docs_dir):
+        if filename not in {f'{number}.json' for number in range(len(doc_versions))}:
+            os.remove(os.path.join(docs_dir, filename))
+    return written
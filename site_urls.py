@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+URLs das páginas estáticas de categorias e tags.
+
+Cada categoria e cada tag tem sua própria página pré-renderizada em
+/categorias/<slug>/ e /tags/<slug>/. Os links antigos no formato
+/?categoria=<slug> e /?tag=<slug> (filtrados no navegador pelo
+blog-global.js) são convertidos para essas páginas.
+"""
+
+import re
+import unicodedata
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+CATEGORIES_DIR = 'categorias'
+TAGS_DIR = 'tags'
+LEGACY_LISTING_PARAMS = {'categoria': CATEGORIES_DIR, 'tag': TAGS_DIR}
+SITE_HOSTS = ('', 'blog.iautomatize.com')
+# Imagem dos cards de artigos sem og:image nem imagem no corpo
+DEFAULT_IMAGE_URL = '/logo.webp'
+
+def slugify(name):
+    """Gera o slug ASCII de uma categoria ou tag ("Inteligência Artificial" -> "inteligencia-artificial")."""
+    name = unicodedata.normalize('NFKD', unquote(name)).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9_.-]+', '-', name.lower()).strip('-.')
+
+def listing_url(directory, name):
+    """URL da página estática de uma categoria ou tag."""
+    return f'/{directory}/{quote(slugify(name))}/'
+
+def category_url(category):
+    """URL da página estática de uma categoria."""
+    return listing_url(CATEGORIES_DIR, category)
+
+def tag_url(tag):
+    """URL da página estática de uma tag."""
+    return listing_url(TAGS_DIR, tag)
+
+def legacy_listing_url(href):
+    """Converte um link /?categoria=... ou /?tag=... na URL estática; None se não for um."""
+    parts = urlsplit(href)
+    if parts.netloc not in SITE_HOSTS or parts.path not in ('', '/'):
+        return None
+    query = parse_qs(parts.query)
+    for param, directory in LEGACY_LISTING_PARAMS.items():
+        if query.get(param) and slugify(query[param][0]):
+            return listing_url(directory, query[param][0])
+    return None
+
+def rewrite_legacy_listing_links(soup):
+    """Aponta os links antigos de filtro para as páginas estáticas. Retorna quantos mudaram."""
+    changed = 0
+    for link in soup.find_all('a', href=True):
+        new_href = legacy_listing_url(link['href'])
+        if new_href and new_href != link['href']:
+            link['href'] = new_href
+            changed += 1
+    return changed
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Gerador de sitemap em streaming.
+
+O sitemap é gerado a partir do conjunto de artigos (não do sitemap anterior):
+uma única <url> por artigo, com <lastmod> vindo da data real de publicação ou
+de modificação. As URLs são gravadas diretamente no arquivo, sem montar uma
+árvore XML em memória. Ao ultrapassar 50.000 URLs ou 50 MB por arquivo, o
+sitemap é dividido automaticamente em partes (sitemap-1.xml, sitemap-2.xml...)
+e o arquivo principal passa a ser um índice de sitemaps.
+"""
+
+import os
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+from safe_write import replace_if_changed
+
+MAX_URLS_PER_SITEMAP = 50000
+MAX_BYTES_PER_SITEMAP = 50 * 1024 * 1024
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = '</urlset>\n'
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = '</sitemapindex>\n'
+
+def article_url(domain, path):
+    """Monta a URL canônica (percent-encoded) de um artigo."""
+    path = path.replace('\\', '/').lstrip('/')
+    return f"{domain}/{quote(path, safe='/')}"
+
+def article_lastmod(article):
+    """Data de modificação do artigo, ou a de publicação se não houver."""
+    dates = [date for date in (article.get('publish_date'), article.get('modified_date')) if date]
+    return max(dates) if dates else None
+
+def _url_entry(loc, lastmod):
+    entry = f'  <url>\n    <loc>{escape(loc)}</loc>\n'
+    if lastmod:
+        entry += f'    <lastmod>{lastmod.strftime("%Y-%m-%d")}</lastmod>\n'
+    return entry + '  </url>\n'
+
+class SitemapWriter:
+    """Grava URLs de sitemap em streaming, dividindo em partes quando necessário."""
+
+    def __init__(self, sitemap_path, base_url, max_urls=MAX_URLS_PER_SITEMAP, max_bytes=MAX_BYTES_PER_SITEMAP):
+        # base_url é a URL pública do diretório onde o sitemap é publicado
+        self.sitemap_path = sitemap_path
+        self.base_url = base_url.rstrip('/')
+        self.max_urls = max_urls
+        self.max_bytes = max_bytes
+        self.directory = os.path.dirname(sitemap_path) or '.'
+        self.stem = os.path.splitext(os.path.basename(sitemap_path))[0]
+        self.url_count = 0
+        self.shards = []  # (caminho final, caminho temporário, maior lastmod)
+        self._file = None
+        self._shard_urls = 0
+        self._shard_bytes = 0
+        self._shard_lastmod = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def _open_shard(self):
+        os.makedirs(self.directory, exist_ok=True)
+        final_path = os.path.join(self.directory, f'{self.stem}-{len(self.shards) + 1}.xml')
+        tmp_path = final_path + '.tmp'
+        self._file = open(tmp_path, 'w', encoding='utf-8')
+        self._file.write(XML_HEADER + URLSET_OPEN)
+        self._shard_urls = 0
+        self._shard_bytes = len((XML_HEADER + URLSET_OPEN + URLSET_CLOSE).encode('utf-8'))
+        self._shard_lastmod = None
+        self.shards.append([final_path, tmp_path, None])
+
+    def _close_shard(self):
+        self._file.write(URLSET_CLOSE)
+        self._file.close()
+        self._file = None
+        self.shards[-1][2] = self._shard_lastmod
+
+    def add(self, loc, lastmod=None):
+        """Acrescenta uma URL ao sitemap."""
+        entry = _url_entry(loc, lastmod)
+        size = len(entry.encode('utf-8'))
+        if self._file is not None and (
+            self._shard_urls >= self.max_urls or self._shard_bytes + size > self.max_bytes
+        ):
+            self._close_shard()
+        if self._file is None:
+            self._open_shard()
+        self._file.write(entry)
+        self._shard_urls += 1
+        self._shard_bytes += size
+        if lastmod and (self._shard_lastmod is None or lastmod > self._shard_lastmod):
+            self._shard_lastmod = lastmod
+        self.url_count += 1
+
+    def close(self):
+        """Finaliza os arquivos: um único sitemap ou um índice de sitemaps."""
+        if self._file is None and not self.shards:
+            self._open_shard()
+        if self._file is not None:
+            self._close_shard()
+
+        self._remove_stale_shards()
+        if len(self.shards) == 1:
+            _, tmp_path, _ = self.shards[0]
+            replace_if_changed(tmp_path, self.sitemap_path)
+            return
+
+        for final_path, tmp_path, _ in self.shards:
+            replace_if_changed(tmp_path, final_path)
+        tmp_index = self.sitemap_path + '.tmp'
+        with open(tmp_index, 'w', encoding='utf-8') as f:
+            f.write(XML_HEADER + INDEX_OPEN)
+            for final_path, _, lastmod in self.shards:
+                loc = f'{self.base_url}/{os.path.basename(final_path)}'
+                f.write(f'  <sitemap>\n    <loc>{escape(loc)}</loc>\n')
+                if lastmod:
+                    f.write(f'    <lastmod>{lastmod.strftime("%Y-%m-%d")}</lastmod>\n')
+                f.write('  </sitemap>\n')
+            f.write(INDEX_CLOSE)
+        replace_if_changed(tmp_index, self.sitemap_path)
+
+    def _remove_stale_shards(self):
+        # Partes de uma execução anterior que gerou mais arquivos do que esta
+        shard_count = len(self.shards) if len(self.shards) > 1 else 0
+        number = shard_count + 1
+        while True:
+            stale_path = os.path.join(self.directory, f'{self.stem}-{number}.xml')
+            if not os.path.exists(stale_path):
+                break
+            os.remove(stale_path)
+            number += 1
+
+    def _discard(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        for _, tmp_path, _ in self.shards:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+def write_sitemap(articles, sitemap_path, domain, home_lastmod=None):
+    """Gera o sitemap do blog a partir dos metadados dos artigos.
+
+    `articles` é consumido uma única vez, na ordem dada (pode ser um cursor
+    do catálogo). A página inicial vem primeiro, com `home_lastmod` (em geral
+    a data do artigo mais recente, ArticleCatalog.last_modified()). Retorna o
+    número de URLs gravadas.
+    """
+    sitemap_dir = os.path.dirname(sitemap_path).replace(os.path.sep, '/')
+    sitemap_url = f'{domain}/{sitemap_dir}' if sitemap_dir else domain
+
+    seen = set()
+    with SitemapWriter(sitemap_path, sitemap_url) as writer:
+        writer.add(domain, home_lastmod)
+        seen.add(domain)
+        for article in articles:
+            url = article_url(domain, article['path'])
+            if url in seen:
+                continue
+            seen.add(url)
+            writer.add(url, article_lastmod(article))
+    return writer.url_count
@@ -0,0 +1,37 @@
+import os
+import sys
+
+import pytest
+
+# Os módulos do build ficam na raiz do repositório
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from benchmark_build import generate_corpus  # noqa: E402
+from card_templates import reset_render_caches  # noqa: E402
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Site sintético (benchmark_build.py) como diretório de trabalho dos scripts."""
+    generate_corpus(str(tmp_path), 40, seed=7)
+    monkeypatch.chdir(tmp_path)
+    reset_render_caches()
+    yield tmp_path
+    reset_render_caches()
+
+
+def snapshot(root):
+    """{caminho relativo: st_mtime_ns} dos arquivos do site, fora do .cache."""
+    times = {}
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name != '.cache']
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            times[os.path.relpath(path, root)] = os.stat(path).st_mtime_ns
+    return times
+
+
+def written_since(root, before):
+    """Arquivos criados ou regravados desde `before` (um snapshot)."""
+    return {path for path, mtime in snapshot(root).items() if before.get(path) != mtime}
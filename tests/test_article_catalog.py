@@ -0,0 +1,92 @@
+from datetime import datetime
+
+import pytest
+
+from article_catalog import ArticleCatalog
+
+
+def article(slug, day, category, tags, title=None):
+    return {
+        'path': f'articles/{slug}.html', 'title': title or slug.replace('-', ' ').title(), 'author': 'IAutomatize',
+        'excerpt': f'Resumo de {slug}.', 'image_url': f'/assets/imagens/{slug}.webp', 'category': category,
+        'tags': tags, 'publish_date': datetime(2025, 6, day, 9), 'modified_date': None,
+    }
+
+
+@pytest.fixture
+def catalog():
+    catalog = ArticleCatalog(':memory:')
+    yield catalog
+    catalog.close()
+
+
+@pytest.fixture
+def data():
+    # Ordem do diretório: desempate das listagens
+    return {
+        'tesla-robotaxi': article('tesla-robotaxi', 10, 'Veículos Autônomos', ['Tesla', 'Robotaxi']),
+        'waymo-phoenix': article('waymo-phoenix', 12, 'Veículos Autônomos', ['Waymo', 'robotaxi']),
+        'chips-nvidia': article('chips-nvidia', 12, 'Inteligência Artificial', ['Nvidia', 'Chips']),
+        'gpt-5': article('gpt-5', 1, 'Inteligência Artificial', ['OpenAI']),
+    }
+
+
+BODIES = {
+    'tesla-robotaxi': 'A Tesla lançou o serviço de robotáxi em Austin.',
+    'waymo-phoenix': 'A Waymo amplia a frota em Phoenix.',
+    'chips-nvidia': 'A Nvidia apresentou novos chips para data centers.',
+    'gpt-5': 'A OpenAI anunciou o GPT-5.',
+}
+
+
+def test_listings(catalog, data):
+    assert catalog.sync(data, BODIES) == 4
+    assert catalog.latest() == ['waymo-phoenix', 'chips-nvidia', 'tesla-robotaxi', 'gpt-5']
+    assert catalog.latest(2) == ['waymo-phoenix', 'chips-nvidia']
+    assert catalog.in_category('veiculos-autonomos') == ['waymo-phoenix', 'tesla-robotaxi']
+    # "Robotaxi" e "robotaxi" são a mesma tag
+    assert catalog.with_tag('robotaxi') == ['waymo-phoenix', 'tesla-robotaxi']
+    assert catalog.categories() == {'veiculos-autonomos': ('Veículos Autônomos', 2), 'inteligencia-artificial': ('Inteligência Artificial', 2)}
+    assert catalog.tags()['robotaxi'] == ('Robotaxi', 2)
+    assert catalog.published_since(datetime(2025, 6, 10)) == ['waymo-phoenix', 'chips-nvidia', 'tesla-robotaxi']
+    assert catalog.recent(2, now=datetime(2025, 6, 13, 18)) == ['waymo-phoenix', 'chips-nvidia']
+
+
+def test_articles_rows(catalog, data):
+    catalog.sync(data)
+    rows = catalog.articles(['gpt-5', 'inexistente', 'tesla-robotaxi'])
+    assert [row['id'] for row in rows] == ['gpt-5', 'tesla-robotaxi']
+    assert rows[0]['publish_date'] == datetime(2025, 6, 1, 9)
+    assert rows[1]['category_slug'] == 'veiculos-autonomos'
+
+
+def test_iter_latest_and_last_modified(catalog, data):
+    assert catalog.last_modified() is None
+    data['gpt-5']['modified_date'] = datetime(2025, 6, 20, 8)
+    catalog.sync(data)
+    assert [row['id'] for row in catalog.iter_latest()] == catalog.latest()
+    assert catalog.last_modified() == datetime(2025, 6, 20, 8)
+
+
+def test_search(catalog, data):
+    catalog.sync(data, BODIES)
+    assert catalog.search('') == []
+    assert catalog.search('Tesla')[0] == 'tesla-robotaxi'
+    if catalog.fts:
+        # Prefixo na última palavra e acentos ignorados no corpo
+        assert catalog.search('robota') == ['tesla-robotaxi']
+        assert catalog.search('data cent') == ['chips-nvidia']
+
+
+def test_sync_only_changes_what_changed(catalog, data):
+    catalog.sync(data, BODIES, {article_id: f'hash-{article_id}' for article_id in data})
+    assert catalog.sync(data) == 0
+
+    data['gpt-5']['tags'] = ['OpenAI', 'GPT']
+    del data['chips-nvidia']
+    assert catalog.sync(data, hashes={'gpt-5': 'novo-hash', 'waymo-phoenix': 'hash-waymo-phoenix'}) == 2
+    assert catalog.with_tag('gpt') == ['gpt-5']
+    assert 'chips-nvidia' not in catalog.latest()
+    assert catalog.hashes() == {'tesla-robotaxi': 'hash-tesla-robotaxi', 'waymo-phoenix': 'hash-waymo-phoenix', 'gpt-5': 'novo-hash'}
+    if catalog.fts:
+        assert catalog.search('nvidia') == []
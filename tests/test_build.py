@@ -0,0 +1,41 @@
+import io
+import os
+import re
+from contextlib import redirect_stdout
+
+import generate_related_articles
+from card_templates import reset_render_caches
+from conftest import snapshot, written_since
+from update_script import update_files
+
+
+def build():
+    """Os dois scripts que gravam os artigos, na ordem do CI."""
+    with redirect_stdout(io.StringIO()):
+        reset_render_caches()
+        generate_related_articles.main()
+        reset_render_caches()
+        update_files()[3].close()
+
+
+def test_noop_rebuild_writes_nothing(site):
+    # Um artigo sem datePublished usa a data de modificação do arquivo
+    path = os.path.join('articles', sorted(os.listdir('articles'))[0])
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(re.sub(r'\s*"datePublished": "[^"]*",', '', html))
+
+    build()
+    before = snapshot(site)
+    build()
+    assert written_since(site, before) == set()
+
+
+def test_related_cards_link_from_articles_dir(site):
+    build()
+    path = os.path.join('articles', sorted(os.listdir('articles'))[0])
+    with open(path, 'r', encoding='utf-8') as f:
+        section = f.read().split('id="related-articles"', 1)[1]
+    hrefs = re.findall(r'<a href="([^"]*)"', section.split('</section>', 1)[0])
+    assert hrefs and all(href.startswith('/articles/') for href in hrefs), hrefs
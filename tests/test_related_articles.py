@@ -0,0 +1,48 @@
+from related_articles import RelatedArticlesIndex, SimilarityIndex, find_related_articles
+
+
+def article(tags=(), category='', keywords=(), terms=None):
+    return {'tags': list(tags), 'category': category, 'keywords': list(keywords), 'terms': terms or {}}
+
+
+def test_weights_tags_over_category_over_keywords():
+    data = {
+        'alvo': article(['ia'], 'tecnologia', ['robô']),
+        'palavra': article(keywords=['robô']),
+        'categoria': article(category='tecnologia'),
+        'tag': article(['ia']),
+    }
+    assert find_related_articles('alvo', data) == ['tag', 'categoria', 'palavra']
+
+
+def test_scores_add_up():
+    data = {
+        'alvo': article(['ia', 'carros'], 'tecnologia'),
+        'uma-tag-e-categoria': article(['ia'], 'tecnologia'),   # 3 + 2
+        'duas-tags': article(['ia', 'carros']),                 # 3 + 3
+    }
+    assert RelatedArticlesIndex(data).scores('alvo') == {'duas-tags': 6, 'uma-tag-e-categoria': 5}
+
+
+def test_ties_follow_article_data_order():
+    data = {'c': article(['ia']), 'alvo': article(['ia']), 'a': article(['ia']), 'b': article(['ia'])}
+    assert find_related_articles('alvo', data) == ['c', 'a', 'b']
+    reordered = {'b': data['b'], 'alvo': data['alvo'], 'a': data['a'], 'c': data['c']}
+    assert find_related_articles('alvo', reordered) == ['b', 'a', 'c']
+
+
+def test_completes_with_unrelated_articles_in_order():
+    data = {'x': article(['outro']), 'alvo': article(['ia']), 'y': article(['ia']), 'z': article()}
+    assert find_related_articles('alvo', data, num_related=3) == ['y', 'x', 'z']
+    assert find_related_articles('alvo', data, num_related=1) == ['y']
+
+
+def test_similarity_breaks_ties():
+    data = {
+        'alvo': article(['ia'], terms={'robotaxi': 3, 'waymo': 2}),
+        'primeiro': article(['ia'], terms={'chips': 3}),
+        'parecido': article(['ia'], terms={'robotaxi': 2, 'waymo': 1}),
+        'outro': article(terms={'chips': 1, 'banco': 1}),
+    }
+    assert RelatedArticlesIndex(data).find('alvo', 2) == ['primeiro', 'parecido']
+    assert SimilarityIndex(data).find('alvo', 2) == ['parecido', 'primeiro']
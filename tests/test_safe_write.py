@@ -0,0 +1,28 @@
+import os
+
+from safe_write import write_if_changed
+
+
+def test_writes_new_file(tmp_path):
+    path = tmp_path / 'sub' / 'file.txt'
+    assert write_if_changed(str(path), 'conteúdo')
+    assert path.read_text(encoding='utf-8') == 'conteúdo'
+
+
+def test_skips_identical_content(tmp_path):
+    path = tmp_path / 'file.txt'
+    write_if_changed(str(path), 'igual')
+    mtime = os.stat(path).st_mtime_ns
+    assert not write_if_changed(str(path), 'igual')
+    assert not write_if_changed(str(path), 'igual'.encode('utf-8'))
+    assert os.stat(path).st_mtime_ns == mtime
+
+
+def test_replaces_changed_content_keeping_mode(tmp_path):
+    path = tmp_path / 'file.txt'
+    write_if_changed(str(path), 'antes')
+    os.chmod(path, 0o640)
+    assert write_if_changed(str(path), 'depois')
+    assert path.read_text(encoding='utf-8') == 'depois'
+    assert os.stat(path).st_mode & 0o777 == 0o640
+    assert os.listdir(tmp_path) == ['file.txt']
@@ -0,0 +1,101 @@
+import json
+import os
+from datetime import datetime
+
+from conftest import snapshot, written_since
+from search_index import (
+    DOCS_DIR, MANIFEST_FILENAME, SearchIndex, build_search_index, doc_numbers, document_weights, load_search_index,
+    shard_key, write_search_index,
+)
+
+
+def article(slug, title, day, category='Tecnologia', tags=(), terms=None):
+    return {
+        'path': f'articles/{slug}.html', 'title': f'{title} - IAUTOMATIZE Blog', 'excerpt': f'Resumo de {title}.',
+        'category': category, 'tags': list(tags), 'terms': terms or {}, 'publish_date': datetime(2025, 1, day, 10),
+    }
+
+
+def format_date(date):
+    return date.strftime('%d/%m/%Y')
+
+
+def corpus():
+    return {
+        'robotaxi': article('robotaxi', 'Robotaxi da Tesla', 3, 'Veículos Autônomos', ['Tesla']),
+        'chips': article('chips', 'Chips de inteligência artificial', 1, tags=['IA', 'Hardware']),
+        'waymo': article('waymo', 'Waymo amplia robotaxis', 2, 'Veículos Autônomos', terms={'robotaxi': 3}),
+    }
+
+
+def test_shard_key():
+    assert shard_key('robotaxi') == 'ro'
+    assert shard_key('ia') == 'ia'
+    assert shard_key('5g') == '5g'
+    assert shard_key('ñu') == '_u'
+
+
+def test_numbers_are_append_only():
+    data = corpus()
+    numbers = doc_numbers(data)
+    # Do mais antigo para o mais recente
+    assert numbers == {'/articles/chips.html': 0, '/articles/waymo.html': 1, '/articles/robotaxi.html': 2}
+
+    data['novo'] = article('novo', 'Novo artigo', 1)
+    previous = ['/articles/chips.html', '/articles/waymo.html', '/articles/robotaxi.html']
+    assert doc_numbers(data, previous)['/articles/novo.html'] == 3
+
+    del data['chips']
+    renumbered = doc_numbers(data, [None, *previous[1:], '/articles/novo.html'])
+    assert renumbered == {'/articles/waymo.html': 1, '/articles/robotaxi.html': 2, '/articles/novo.html': 3}
+
+
+def test_search_ranking():
+    index = SearchIndex(*build_search_index(corpus(), format_date))
+    # Prefixo no último termo; "waymo" tem o termo também no corpo
+    assert [doc[1] for doc in index.search('robotax')] == ['/articles/waymo.html', '/articles/robotaxi.html']
+    assert [doc[1] for doc in index.search('inteligencia')] == ['/articles/chips.html']
+    # Acentos e stopwords não importam
+    assert index.search('inteligência artificial') == index.search('a inteligencia artificial')
+    # No empate, o mais recente primeiro
+    assert [doc[1] for doc in index.search('veiculos autonomos')] == ['/articles/robotaxi.html', '/articles/waymo.html']
+    assert index.search('') == []
+
+
+def test_written_index_matches_memory(tmp_path):
+    data = corpus()
+    write_search_index(data, format_date, str(tmp_path))
+    loaded = load_search_index(str(tmp_path))
+    in_memory = SearchIndex(*build_search_index(data, format_date))
+    for query in ('robotax', 'tesla', 'chips ia', 'hardware'):
+        assert loaded.search(query) == in_memory.search(query)
+    with open(tmp_path / MANIFEST_FILENAME, encoding='utf-8') as f:
+        manifest = json.load(f)
+    assert manifest['count'] == 3
+    assert set(manifest['shards']) == {name[:-len('.json')] for name in os.listdir(tmp_path) if name != MANIFEST_FILENAME and name.endswith('.json')}
+
+
+def test_new_article_only_rewrites_its_files(tmp_path):
+    data = corpus()
+    assert write_search_index(data, format_date, str(tmp_path)) > 0
+    assert write_search_index(data, format_date, str(tmp_path)) == 0
+
+    before = snapshot(tmp_path)
+    data['novo'] = article('novo', 'Zebra', 20)
+    write_search_index(data, format_date, str(tmp_path))
+    # Os arquivos dos termos do artigo novo, o bloco de artigos e o manifesto
+    shards = {f'{shard_key(term)}.json' for term in document_weights(data['novo'])}
+    assert 'ze.json' in shards and len(shards) < len(os.listdir(tmp_path)) - 2
+    assert written_since(tmp_path, before) == shards | {os.path.join(DOCS_DIR, '0.json'), MANIFEST_FILENAME}
+    assert load_search_index(str(tmp_path)).search('zebra')[0][1] == '/articles/novo.html'
+
+
+def test_removed_article_leaves_a_hole(tmp_path):
+    data = corpus()
+    write_search_index(data, format_date, str(tmp_path))
+    del data['chips']
+    write_search_index(data, format_date, str(tmp_path))
+    index = load_search_index(str(tmp_path))
+    assert index.docs[0] is None and index.count == 2
+    assert index.search('chips') == []
+    assert not os.path.exists(tmp_path / 'ch.json')
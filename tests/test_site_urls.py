@@ -0,0 +1,49 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+
+import pytest
+
+from conftest import REPO_DIR
+from site_urls import category_url, legacy_listing_url, slugify, tag_url
+
+NAMES = [
+    'Inteligência Artificial', 'Carros Autônomos', '  IA & Robótica  ', 'C++', 'Web3.0', '.NET',
+    'São Paulo!', '', 'Ação_Rápida', 'ﬁnanças', 'Ñandú — Über',
+]
+
+
+@pytest.mark.parametrize('name, slug', [
+    ('Inteligência Artificial', 'inteligencia-artificial'),
+    ('  IA & Robótica  ', 'ia-robotica'),
+    ('C++', 'c'),
+    ('Web3.0', 'web3.0'),
+    ('.NET', 'net'),
+    ('Ação_Rápida', 'acao_rapida'),
+    ('ﬁnanças', 'financas'),
+    ('Intelig%C3%AAncia', 'inteligencia'),
+    ('', ''),
+])
+def test_slugify(name, slug):
+    assert slugify(name) == slug
+
+
+def test_listing_urls():
+    assert category_url('Inteligência Artificial') == '/categorias/inteligencia-artificial/'
+    assert tag_url('Carros Autônomos') == '/tags/carros-autonomos/'
+    assert legacy_listing_url('/?categoria=Rob%C3%B3tica') == '/categorias/robotica/'
+    assert legacy_listing_url('https://blog.iautomatize.com/?tag=IA') == '/tags/ia/'
+    assert legacy_listing_url('https://example.com/?tag=IA') is None
+    assert legacy_listing_url('/?tag=%21%21') is None
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node não instalado')
+def test_slugify_matches_javascript():
+    # O blog-global.js redireciona os links antigos com a sua própria cópia do slugify
+    with open(os.path.join(REPO_DIR, 'assets', 'js', 'blog-global.js'), 'r', encoding='utf-8') as f:
+        source = re.search(r'^function slugify\(name\) \{.*?^\}', f.read(), re.MULTILINE | re.DOTALL).group(0)
+    script = f'{source}\nconsole.log(JSON.stringify({json.dumps(NAMES)}.map(slugify)));'
+    result = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+    assert json.loads(result.stdout) == [slugify(name) for name in NAMES]
@@ -0,0 +1,67 @@
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from sitemap import MAX_BYTES_PER_SITEMAP, MAX_URLS_PER_SITEMAP, SitemapWriter, write_sitemap
+
+NS = {'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+BASE_URL = 'https://blog.iautomatize.com'
+
+
+def locs(path, tag):
+    return [element.text for element in ET.parse(path).getroot().findall(f'sm:{tag}/sm:loc', NS)]
+
+
+def write_urls(path, count, **limits):
+    with SitemapWriter(str(path), BASE_URL, **limits) as writer:
+        for number in range(count):
+            writer.add(f'{BASE_URL}/articles/{number}.html', datetime(2025, 1, 1 + number % 28))
+    return writer
+
+
+def test_single_file_below_limits(tmp_path):
+    path = tmp_path / 'sitemap.xml'
+    writer = write_urls(path, 5)
+    assert writer.url_count == 5
+    assert len(locs(path, 'url')) == 5
+    assert sorted(os.listdir(tmp_path)) == ['sitemap.xml']
+
+
+def test_default_limits_follow_the_protocol():
+    writer = SitemapWriter('sitemap.xml', BASE_URL)
+    assert (writer.max_urls, writer.max_bytes) == (MAX_URLS_PER_SITEMAP, MAX_BYTES_PER_SITEMAP) == (50000, 50 * 1024 * 1024)
+
+
+def test_splits_by_url_count(tmp_path):
+    path = tmp_path / 'sitemap.xml'
+    write_urls(path, 7, max_urls=3)
+    assert locs(path, 'sitemap') == [f'{BASE_URL}/sitemap-{number}.xml' for number in (1, 2, 3)]
+    assert [len(locs(tmp_path / f'sitemap-{number}.xml', 'url')) for number in (1, 2, 3)] == [3, 3, 1]
+
+
+def test_splits_by_size(tmp_path):
+    path = tmp_path / 'sitemap.xml'
+    write_urls(path, 10, max_bytes=500)
+    shards = sorted(name for name in os.listdir(tmp_path) if name.startswith('sitemap-'))
+    assert len(shards) > 1
+    assert all(os.path.getsize(tmp_path / name) <= 500 for name in shards)
+    assert sum(len(locs(tmp_path / name, 'url')) for name in shards) == 10
+
+
+def test_removes_stale_shards(tmp_path):
+    path = tmp_path / 'sitemap.xml'
+    write_urls(path, 7, max_urls=3)
+    write_urls(path, 2, max_urls=3)
+    assert sorted(os.listdir(tmp_path)) == ['sitemap.xml']
+    assert len(locs(path, 'url')) == 2
+
+
+def test_unchanged_sitemap_is_not_rewritten(tmp_path):
+    path = tmp_path / 'sitemap.xml'
+    articles = [{'path': 'articles/ação.html', 'publish_date': datetime(2025, 3, 1), 'modified_date': datetime(2025, 3, 2)}]
+    assert write_sitemap(iter(articles), str(path), BASE_URL, datetime(2025, 3, 2)) == 2
+    mtime = os.stat(path).st_mtime_ns
+    write_sitemap(iter(articles), str(path), BASE_URL, datetime(2025, 3, 2))
+    assert os.stat(path).st_mtime_ns == mtime
+    assert locs(path, 'url') == [BASE_URL, f'{BASE_URL}/articles/a%C3%A7%C3%A3o.html']
+    assert sorted(os.listdir(tmp_path)) == ['sitemap.xml']
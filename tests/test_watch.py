@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from conftest import snapshot, written_since
+from update_script import IncrementalBuild, listing_slugs, update_files
+
+
+@pytest.fixture
+def build(site, capsys):
+    build = IncrementalBuild(*update_files())
+    capsys.readouterr()
+    yield build
+    build.catalog.close()
+
+
+def first_article():
+    filename = sorted(os.listdir('articles'))[0]
+    return filename[:-len('.html')], os.path.join('articles', filename)
+
+
+def test_touch_rewrites_nothing(site, build):
+    _, path = first_article()
+    before = snapshot(site)
+    os.utime(path)
+    build.apply(*build.poll())
+    assert written_since(site, before) == {path}
+
+
+def test_edit_rewrites_only_affected_files(site, build):
+    article_id, path = first_article()
+    title = build.article_data[article_id]['title']
+    shown_in = build.shown_in()[article_id]
+    previous_related = dict(build.related_by_id)
+    before = snapshot(site)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(html.replace(title, f'{title} revisado'))
+    build.apply(*build.poll())
+    written = written_since(site, before)
+
+    # O artigo, os que o exibem entre os relacionados e os que ganharam outros relacionados
+    related_changed = {
+        article_id for article_id, related_ids in build.related_by_id.items()
+        if previous_related.get(article_id) != related_ids
+    }
+    expected_articles = {os.path.join('articles', f'{id_}.html') for id_ in {article_id} | shown_in | related_changed}
+    assert shown_in
+    assert {path for path in written if path.startswith('articles' + os.sep)} == expected_articles
+
+    # Só as listagens em que o artigo aparece, além dos índices estáticos e do sitemap
+    categories, tags = listing_slugs(build.article_data[article_id])
+    listings = {os.path.join('categorias', slug) for slug in categories} | {os.path.join('tags', slug) for slug in tags}
+    for path in written - expected_articles:
+        if path.startswith(('categorias' + os.sep, 'tags' + os.sep)):
+            assert os.path.join(*path.split(os.sep)[:2]) in listings, path
+        else:
+            assert path == 'index.html' or path.startswith(('page' + os.sep, os.path.join('assets', 'data'), os.path.join('config', 'sitemap'))), path
@@ -1,8 +1,28 @@
 import os
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+import argparse
+import copy
+import shutil
+import time
+from datetime import datetime
+from bs4 import Comment
+from html import escape
 import re
-from collections import Counter
+from collections import defaultdict
+from urllib.parse import quote
+from article_cache import ArticleMetadataCache, content_hash
+from article_catalog import ArticleCatalog
+from related_articles import (
+    add_similarity_argument, build_related_index, find_related_articles, related_articles_signature, write_related_index,
+)
+from search_index import write_search_index
+from parallel_build import add_jobs_argument
+from sitemap import write_sitemap
+from site_urls import CATEGORIES_DIR, DEFAULT_IMAGE_URL, TAGS_DIR, category_url, slugify, tag_url
+from safe_write import write_if_changed
+from build_profile import BuildProfiler, add_profile_argument, profile_stage
+from keywords import NUM_KEYWORDS, assign_corpus_keywords, term_counts
+from card_templates import render_breadcrumbs, render_listing_card, render_related_card, reset_render_caches, splice_fragments
+from html_backend import extract_text, parse_article, parse_html
 
 # Tradução manual dos meses para português
 MESES_PT = [
@@ -15,123 +35,95 @@ def formatar_data_pt(dt):
 
 def extract_text_from_html(html_content):
     """Extrai texto puro do HTML de um artigo."""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    # Remove scripts, styles, etc.
-    for script in soup(["script", "style", "header", "footer", "nav"]):
-        script.extract()
-    text = soup.get_text(separator=' ')
-    # Limpa espaços extras
-    text = re.sub(r'\s+', ' ', text).strip()
-    return text
-
-def extract_keywords(text, num_keywords=5):
-    """Extrai palavras-chave do texto."""
-    # Remove pontuação e converte para minúsculas
-    text = re.sub(r'[^\w\s]', '', text.lower())
-    
-    # Remove stopwords em português
-    stopwords = ["o", "a", "os", "as", "um", "uma", "uns", "umas", "de", "do", "da", "dos", "das", 
-                "no", "na", "nos", "nas", "ao", "aos", "à", "às", "pelo", "pela", "por", "para", 
-                "em", "que", "com", "se", "não", "e", "é", "são", "mas", "ou"]
-    
-    words = [word for word in text.split() if word not in stopwords and len(word) > 3]
-    
-    # Conta frequência
-    word_counts = Counter(words)
-    
-    # Retorna as mais frequentes
-    return [word for word, _ in word_counts.most_common(num_keywords)]
-
-def find_related_articles(article_id, article_data, num_related=3):
-    """Encontra artigos relacionados baseados em tags e conteúdo."""
-    target = article_data[article_id]
-    scores = {}
-    
-    for id, data in article_data.items():
-        if id == article_id:
-            continue
-        
-        score = 0
-        
-        # Correspondência de tags (peso alto)
-        common_tags = set(target['tags']).intersection(set(data['tags']))
-        score += len(common_tags) * 3
-        
-        # Correspondência de categoria (peso médio)
-        if target['category'] == data['category']:
-            score += 2
-        
-        # Correspondência de palavras-chave (peso baixo)
-        common_keywords = set(target['keywords']).intersection(set(data['keywords']))
-        score += len(common_keywords)
-        
-        scores[id] = score
-    
-    # Ordena por pontuação e retorna os top N
-    related = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:num_related]
-    return [article_id for article_id, _ in related]
-
-def get_article_metadata(file_path):
-    """Extrai metadados completos de um arquivo HTML de artigo."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        soup = BeautifulSoup(f, 'html.parser')
+    return extract_text(html_content)
+
+def read_article_source(file_path):
+    """Lê o HTML bruto de um artigo."""
+    with profile_stage('read'), open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+def read_article(file_path):
+    """Lê e faz o parsing de um artigo uma única vez."""
+    content = read_article_source(file_path)
+    with profile_stage('parse'):
+        return parse_html(content)
+
+def write_article(file_path, soup, fragments=None):
+    """Grava a árvore do artigo no disco se o HTML mudou.
+
+    Os marcadores <!--slot:...--> deixados na árvore são substituídos pelos
+    fragmentos já renderizados de `fragments`. Retorna (HTML, gravado), onde
+    `gravado` é False se o arquivo já tinha exatamente esse conteúdo.
+    """
+    with profile_stage('write'):
+        content = splice_fragments(str(soup), fragments)
+        return content, write_if_changed(file_path, content)
+
+def get_article_metadata(file_path, content=None, document=None):
+    """Extrai metadados completos de um arquivo HTML de artigo.
+
+    Os campos vêm de `document` (html_backend.parse_article) ou, sem ele, de
+    um único parsing de `content` (lido do arquivo se não for fornecido).
+    """
+    if document is None:
+        if content is None:
+            content = read_article_source(file_path)
+        with profile_stage('parse'):
+            document = parse_article(content)
+    meta = document['meta']
 
     # --- Extração de Metadados ---
-    title_tag = soup.find('title')
-    title = title_tag.text.strip() if title_tag else ''
+    title = (document['title'] or '').strip()
 
     # Extração de keywords (tags)
-    meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
     tags = []
-    if meta_keywords and meta_keywords.get('content'):
-        tags = [tag.strip() for tag in meta_keywords['content'].split(',')]
+    if meta.get(('name', 'keywords')):
+        tags = [tag.strip() for tag in meta[('name', 'keywords')].split(',')]
     
     # Busca por categoria de múltiplas formas
-    meta_category = soup.find('meta', attrs={'name': 'category'})
     category = 'Tecnologia'  # Categoria padrão
     
-    if meta_category and meta_category.get('content'):
-        category = meta_category['content'].strip()
+    if meta.get(('name', 'category')):
+        category = meta[('name', 'category')].strip()
     else:
         # Tenta extrair da meta description ou do OG description
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content') and 'Em ' in meta_desc['content']:
-            category = meta_desc['content'].split('Em ')[1].split('.')[0]
+        meta_desc = meta.get(('name', 'description'))
+        if meta_desc and 'Em ' in meta_desc:
+            category = meta_desc.split('Em ')[1].split('.')[0]
         else:
             # Tenta extrair do artigo mesmo
-            article_meta = soup.select('.article-meta a')
-            for a in article_meta:
-                if 'href' in a.attrs and '#' in a['href']:
-                    category = a.text.strip()
+            for href, text in document['meta_links']:
+                if href is not None and '#' in href:
+                    category = text.strip()
                     break
             else:
                 # Se tudo falhar, usa a primeira tag como categoria
                 category = tags[0] if tags else 'Tecnologia'
 
-    meta_author = soup.find('meta', attrs={'name': 'author'})
     author = 'IAUTOMATIZE'  # Autor padrão
-    if meta_author and meta_author.get('content'):
-        author = meta_author['content'].strip()
+    if meta.get(('name', 'author')):
+        author = meta[('name', 'author')].strip()
     
-    meta_description = soup.find('meta', attrs={'name': 'description'})
     excerpt = ''
-    if meta_description and meta_description.get('content'):
-        excerpt = meta_description['content'].strip()
+    if meta.get(('name', 'description')):
+        excerpt = meta[('name', 'description')].strip()
 
-    meta_image = soup.find('meta', attrs={'property': 'og:image'})
-    image_url = '../assets/images/articles/default.jpg'  # URL padrão
-    if meta_image and meta_image.get('content'):
-        image_url = meta_image['content'].strip()
+    image_url = DEFAULT_IMAGE_URL  # URL padrão
+    if meta.get(('property', 'og:image')):
+        image_url = meta[('property', 'og:image')].strip()
 
     # Tenta extrair a data do JSON-LD, se existir
+    # (aceita tanto "2025-07-30" quanto "2025-07-30T00:00:00Z")
     publish_date = None
-    script_ld = soup.find('script', attrs={'type': 'application/ld+json'})
-    if script_ld:
+    modified_date = None
+    if document['json_ld']:
         import json
         try:
-            json_data = json.loads(script_ld.string)
+            json_data = json.loads(document['json_ld'])
             if 'datePublished' in json_data:
-                publish_date = datetime.strptime(json_data['datePublished'], '%Y-%m-%d')
+                publish_date = datetime.strptime(json_data['datePublished'][:10], '%Y-%m-%d')
+            if 'dateModified' in json_data:
+                modified_date = datetime.strptime(json_data['dateModified'][:10], '%Y-%m-%d')
         except (json.JSONDecodeError, ValueError):
             pass
     
@@ -139,9 +131,9 @@ def get_article_metadata(file_path):
     if not publish_date:
         publish_date = datetime.fromtimestamp(os.path.getmtime(file_path))
 
-    # Extrai texto para análise de palavras-chave
-    text = extract_text_from_html(str(soup))
-    keywords = extract_keywords(text)
+    # Texto para análise de palavras-chave (da mesma árvore)
+    with profile_stage('keywords'):
+        terms = term_counts(document['text'])
 
     return {
         'title': title,
@@ -151,339 +143,742 @@ def get_article_metadata(file_path):
         'excerpt': excerpt,
         'image_url': image_url,
         'publish_date': publish_date,
+        'modified_date': modified_date,
         'path': file_path.replace(os.path.sep, '/'),
-        'keywords': keywords
+        'terms': terms,
+        # Provisórias: substituídas pelas palavras-chave TF-IDF do acervo em update_files
+        'keywords': list(terms)[:NUM_KEYWORDS]
     }
 
+def add_breadcrumbs_to_soup(soup, metadata, file_path, fragments):
+    """Insere breadcrumbs na árvore do artigo. Retorna True se a árvore mudou.
+
+    A árvore recebe um marcador; o HTML dos breadcrumbs vai para `fragments`
+    e é inserido por write_article.
+    """
+    # Verificar se breadcrumbs já existem
+    if soup.select('.breadcrumbs'):
+        print(f"Breadcrumbs já existem em {file_path}")
+        return False
+    
+    # Inserir após o header e antes do main
+    header = soup.find('header')
+    main = soup.find('main')
+    
+    if header and main:
+        # Inserir após o header
+        header.insert_after(Comment('slot:breadcrumbs'))
+    elif main:
+        # Se não encontrar header, inserir antes do main
+        main.insert_before(Comment('slot:breadcrumbs'))
+    else:
+        print(f"Não foi possível encontrar local para inserir breadcrumbs em {file_path}")
+        return False
+    
+    fragments['breadcrumbs'] = render_breadcrumbs(metadata)
+    return True
+
 def add_breadcrumbs_to_article(file_path, metadata):
     """Adiciona breadcrumbs navegáveis ao artigo com base em seus metadados."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
-        
-        # Verificar se breadcrumbs já existem
-        if soup.select('.breadcrumbs'):
-            print(f"Breadcrumbs já existem em {file_path}")
-            return
-        
-        # Obter informações para breadcrumbs
-        title = metadata.get('title', 'Artigo')
-        category = metadata.get('category', 'Geral')
-        
-        # Criar URL segura para a categoria
-        safe_category = category.lower().replace(" ", "-")
-        
-        # Criar elemento breadcrumbs com parâmetro de URL para categoria
-        breadcrumbs_html = f'''
-        <nav aria-label="Breadcrumb" class="breadcrumbs">
-          <div class="container">
-            <ol itemscope itemtype="https://schema.org/BreadcrumbList">
-              <li itemprop="itemListElement" itemscope itemtype="https://schema.org/ListItem">
-                <a itemprop="item" href="/">
-                  <span itemprop="name">Home</span>
-                </a>
-                <meta itemprop="position" content="1" />
-              </li>
-              <li itemprop="itemListElement" itemscope itemtype="https://schema.org/ListItem">
-                <a itemprop="item" href="/?categoria={safe_category}">
-                  <span itemprop="name">{category}</span>
-                </a>
-                <meta itemprop="position" content="2" />
-              </li>
-              <li itemprop="itemListElement" itemscope itemtype="https://schema.org/ListItem">
-                <span itemprop="name">{title.split(" - ")[0].strip()}</span>
-                <meta itemprop="position" content="3" />
-              </li>
-            </ol>
-          </div>
-        </nav>
-        '''
-        
-        breadcrumbs_soup = BeautifulSoup(breadcrumbs_html, 'html.parser')
-        
-        # Inserir após o header e antes do main
-        header = soup.find('header')
-        main = soup.find('main')
-        
-        if header and main:
-            # Inserir após o header
-            header.insert_after(breadcrumbs_soup)
-        elif main:
-            # Se não encontrar header, inserir antes do main
-            main.insert_before(breadcrumbs_soup)
-        else:
-            print(f"Não foi possível encontrar local para inserir breadcrumbs em {file_path}")
-            return
-        
-        # Salvar o arquivo atualizado
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
-            
-        print(f"Breadcrumbs adicionados com sucesso em {file_path}")
-        
+        soup = read_article(file_path)
+        fragments = {}
+        if add_breadcrumbs_to_soup(soup, metadata, file_path, fragments) and write_article(file_path, soup, fragments)[1]:
+            print(f"Breadcrumbs adicionados com sucesso em {file_path}")
     except Exception as e:
         print(f"Erro ao adicionar breadcrumbs em {file_path}: {str(e)}")
 
+def related_cards(related_ids, all_articles_data):
+    """HTML dos cards dos artigos relacionados (cada card é renderizado uma vez por build)."""
+    return [
+        render_related_card(all_articles_data[related_id], formatar_data_pt)
+        for related_id in related_ids if related_id in all_articles_data
+    ]
+
+def add_related_articles_to_soup(soup, file_path, cards, fragments):
+    """Preenche a seção de artigos relacionados na árvore. Retorna True se a árvore mudou.
+
+    `cards` é o HTML já renderizado dos cards (related_cards); a árvore
+    recebe um marcador e o HTML vai para `fragments`, inserido por write_article.
+    """
+    # Encontrar a seção de artigos relacionados
+    related_section = soup.find('section', id='related-articles')
+    if not related_section:
+        print(f"Seção de artigos relacionados não encontrada em {file_path}")
+        return False
+    
+    articles_grid = related_section.find('div', class_='articles-grid')
+    if not articles_grid:
+        print(f"Grid de artigos não encontrado em {file_path}")
+        return False
+    
+    # Limpar conteúdo existente
+    articles_grid.clear()
+    
+    if not cards:
+        # Se não há artigos relacionados, adicionar mensagem
+        no_related_msg = soup.new_tag('p')
+        no_related_msg.string = "Nenhum artigo relacionado encontrado no momento."
+        no_related_msg['style'] = "text-align: center; color: #666; font-style: italic;"
+        articles_grid.append(no_related_msg)
+    else:
+        articles_grid.append(Comment('slot:related-articles'))
+        fragments['related-articles'] = ''.join(cards)
+    
+    return True
+
 def add_related_articles_to_article(file_path, article_data, all_articles_data):
     """Adiciona artigos relacionados ao final do artigo."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            soup = BeautifulSoup(content, 'html.parser')
-        
-        # Obter o ID do artigo (nome do arquivo sem extensão)
+        soup = read_article(file_path)
         article_id = os.path.basename(file_path).replace('.html', '')
-        
-        # Encontrar artigos relacionados
         related_ids = find_related_articles(article_id, all_articles_data, num_related=3)
-        
-        # Encontrar a seção de artigos relacionados
-        related_section = soup.find('section', id='related-articles')
-        if not related_section:
-            print(f"Seção de artigos relacionados não encontrada em {file_path}")
-            return
-        
-        articles_grid = related_section.find('div', class_='articles-grid')
-        if not articles_grid:
-            print(f"Grid de artigos não encontrado em {file_path}")
-            return
-        
-        # Limpar conteúdo existente
-        articles_grid.clear()
-        
-        if not related_ids:
-            # Se não há artigos relacionados, adicionar mensagem
-            no_related_msg = soup.new_tag('p')
-            no_related_msg.string = "Nenhum artigo relacionado encontrado no momento."
-            no_related_msg.style = "text-align: center; color: #666; font-style: italic;"
-            articles_grid.append(no_related_msg)
-        else:
-            # Adicionar artigos relacionados
-            for related_id in related_ids:
-                if related_id in all_articles_data:
-                    related_article = all_articles_data[related_id]
-                    
-                    # Criar card do artigo relacionado
-                    article_card = soup.new_tag('article', **{'class': 'article-card fade-in-on-scroll'})
-                    
-                    # Corrige URLs de imagem se necessário
-                    image_url = related_article['image_url']
-                    if not image_url.startswith(('http://', 'https://', '/')):
-                        image_url = image_url if '../' in image_url else '../' + image_url
-                    
-                    # Criar HTML do card
-                    card_html = f'''
-                        <div class="article-image">
-                            <a href="{related_article['path']}">
-                                <img src="{image_url}" alt="{related_article['title']}" loading="lazy">
-                            </a>
-                        </div>
-                        <div class="article-content">
-                            <h3><a href="{related_article['path']}">{related_article['title']}</a></h3>
-                            <p class="article-excerpt">{related_article['excerpt'][:150]}...</p>
-                            <div class="article-meta">
-                                <span>Por {related_article['author']}</span>
-                                <time datetime="{related_article['publish_date'].strftime('%Y-%m-%d')}">
-                                    {formatar_data_pt(related_article['publish_date'])}
-                                </time>
-                            </div>
-                        </div>
-                    '''
-                    
-                    article_card.append(BeautifulSoup(card_html, 'html.parser'))
-                    articles_grid.append(article_card)
-        
-        # Salvar o arquivo atualizado
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(str(soup))
-            
-        print(f"Artigos relacionados adicionados com sucesso em {file_path}")
-        
+        fragments = {}
+        cards = related_cards(related_ids, all_articles_data)
+        if add_related_articles_to_soup(soup, file_path, cards, fragments) and write_article(file_path, soup, fragments)[1]:
+            print(f"Artigos relacionados adicionados com sucesso em {file_path}")
     except Exception as e:
         print(f"Erro ao adicionar artigos relacionados em {file_path}: {str(e)}")
 
-def update_files():
-    """Função principal para atualizar o index.html e sitemap.xml."""
-    articles_dir = 'articles'
-    all_articles_metadata = []
-    all_articles_data = {}  # Para análise de artigos relacionados
+# --- Páginas de listagem (home paginada, categorias e tags) ---
+ARTICLES_PER_PAGE = 12    # Cards por página da home e do arquivo (/page/N/)
+HOME_CATEGORY_LIMIT = 12  # Categorias exibidas na home; a lista completa fica em /categorias/
+HOME_TAG_LIMIT = 40       # Tags exibidas na home; a lista completa fica em /tags/
+ROOT_RELATIVE_SKIP = ('/', 'http://', 'https://', 'mailto:', 'tel:', 'data:', 'javascript:')
+
+def render_article_card(article, root=''):
+    """Gera o HTML do card de um artigo para as páginas de listagem."""
+    return render_listing_card(article, formatar_data_pt, root)
+
+def render_category_card(category):
+    """Gera o HTML do card de uma categoria."""
+    # Criar URL da página estática da categoria
+    safe_category = escape(category_url(category))
+    category = escape(category)
+    return (
+        f'<div class="category-card fade-in-on-scroll"><a class="category-link" href="{safe_category}">'
+        f'<i class="fas fa-robot"></i><h3>{category}</h3><p>Artigos sobre {category}</p></a></div>\n'
+    )
+
+def render_tag_link(tag):
+    """Gera o HTML do link de uma tag."""
+    # Criar URL da página estática da tag
+    safe_tag = escape(tag_url(tag))
+    return f'<a class="tag-link" href="{safe_tag}">{escape(tag)}</a>\n'
+
+def render_more_link(href, label):
+    """Gera o link "ver todos" exibido abaixo de uma listagem resumida."""
+    return f'<p class="listing-more"><a class="btn btn-primary" href="{href}">{escape(label)}</a></p>\n'
+
+def page_url(page_number, base_url='/'):
+    """URL de uma página de uma listagem paginada (a página 1 é a própria `base_url`)."""
+    return base_url if page_number == 1 else f'{base_url}page/{page_number}/'
+
+def render_pagination(current_page, total_pages, base_url='/'):
+    """Gera a navegação entre as páginas de uma listagem paginada."""
+    if total_pages <= 1:
+        return ''
+    items = []
+    if current_page > 1:
+        items.append(f'<a class="pagination-link" href="{page_url(current_page - 1, base_url)}" rel="prev">&laquo; Anteriores</a>')
+    window = range(max(1, current_page - 2), min(total_pages, current_page + 2) + 1)
+    previous = 0
+    for page_number in sorted({1, total_pages, *window}):
+        if page_number - previous > 1:
+            items.append('<span class="pagination-gap">&hellip;</span>')
+        if page_number == current_page:
+            items.append(f'<span aria-current="page" class="pagination-link active">{page_number}</span>')
+        else:
+            items.append(f'<a class="pagination-link" href="{page_url(page_number, base_url)}">{page_number}</a>')
+        previous = page_number
+    if current_page < total_pages:
+        items.append(f'<a class="pagination-link" href="{page_url(current_page + 1, base_url)}" rel="next">Próximas &raquo;</a>')
+    return '<nav aria-label="Paginação" class="pagination">' + ''.join(items) + '</nav>\n'
+
+def root_relative(url):
+    """Converte um link relativo à raiz do site em um link absoluto (/...)."""
+    if not url or url.startswith(ROOT_RELATIVE_SKIP):
+        return url
+    return '/' + url
+
+def build_page_shell(index_soup, keep_sections=None, root_links=False):
+    """Cria o esqueleto HTML de uma página de listagem a partir do index.html.
+
+    Mantém no <main> apenas as seções de `keep_sections` (todas, se None),
+    esvazia os contêineres de listagem e deixa neles marcadores
+    <!--slot:...--> que são preenchidos por fill_page_shell. Com `root_links`,
+    os links relativos passam a apontar para a raiz do site, para páginas
+    publicadas em subdiretórios.
+    """
+    shell = copy.copy(index_soup)
+    main = shell.find('main')
+    if main and keep_sections is not None:
+        for section in main.find_all('section', recursive=False):
+            if section.get('id') not in keep_sections:
+                section.decompose()
     
-    # Coleta metadados de todos os artigos
-    for filename in os.listdir(articles_dir):
-        if filename.endswith('.html'):
-            file_path = os.path.join(articles_dir, filename)
-            try:
-                metadata = get_article_metadata(file_path)
-                all_articles_metadata.append(metadata)
-                
-                # Adicionar breadcrumbs ao artigo
-                add_breadcrumbs_to_article(file_path, metadata)
-                
-                # Adicionar ao dicionário para análise de artigos relacionados
-                article_id = filename.replace('.html', '')
-                all_articles_data[article_id] = metadata
-                
-                print(f"Processado: {filename}")
-            except Exception as e:
-                print(f"Erro ao processar {filename}: {str(e)}")
+    # Remove paginação e links "ver todos" gerados na execução anterior
+    for generated in shell.select('.pagination, .listing-more'):
+        generated.decompose()
+    
+    for container_id in ('recent-articles-container', 'categories-container', 'tags-container'):
+        container = shell.find(id=container_id)
+        if container:
+            container.clear()
+            container.append(Comment(f'slot:{container_id}'))
+            container.insert_after(Comment(f'slot:{container_id}:after'))
+    
+    if keep_sections is not None:
+        if shell.title:
+            shell.title.clear()
+            shell.title.append(Comment('slot:title'))
+        heading = main.find(class_='section-title') if main else None
+        if heading:
+            heading.clear()
+            heading.append(Comment('slot:heading'))
     
-    # Ordena todos os artigos por data de publicação (mais recentes primeiro)
-    all_articles_metadata.sort(key=lambda x: x['publish_date'], reverse=True)
+    if root_links:
+        for attribute in ('href', 'src'):
+            for element in shell.find_all(attrs={attribute: True}):
+                element[attribute] = root_relative(element[attribute])
+    
+    return str(shell)
 
-    # Adicionar artigos relacionados a cada artigo
-    print("\n=== Adicionando artigos relacionados ===")
-    for filename in os.listdir(articles_dir):
-        if filename.endswith('.html'):
-            file_path = os.path.join(articles_dir, filename)
-            add_related_articles_to_article(file_path, all_articles_data, all_articles_data)
+def fill_page_shell(shell_html, slots):
+    """Preenche os marcadores <!--slot:...--> de um esqueleto de página."""
+    return re.sub(r'<!--slot:([\w:-]+)-->', lambda match: slots.get(match.group(1), ''), shell_html)
+
+def write_page(path, html):
+    """Grava uma página gerada (se mudou), criando o diretório se necessário."""
+    return write_if_changed(path, html)
+
+def remove_stale_archive_pages(total_pages, directory=''):
+    """Remove páginas de uma listagem que sobraram de uma execução com mais páginas."""
+    page_number = total_pages + 1
+    while os.path.exists(os.path.join(directory, 'page', str(page_number), 'index.html')):
+        os.remove(os.path.join(directory, 'page', str(page_number), 'index.html'))
+        os.rmdir(os.path.join(directory, 'page', str(page_number)))
+        page_number += 1
+    if total_pages <= 1 and os.path.isdir(os.path.join(directory, 'page')) and not os.listdir(os.path.join(directory, 'page')):
+        os.rmdir(os.path.join(directory, 'page'))
+
+def paginate(articles):
+    """Divide uma lista de artigos em páginas de ARTICLES_PER_PAGE."""
+    return [
+        articles[start:start + ARTICLES_PER_PAGE]
+        for start in range(0, len(articles), ARTICLES_PER_PAGE)
+    ] or [[]]
+
+def write_article_listing(shell, directory, heading, articles, site_title):
+    """Gera as páginas paginadas de uma categoria ou tag em `directory`."""
+    base_url = '/' + directory.replace(os.path.sep, '/') + '/'
+    pages = paginate(articles)
+    for page_number, page_articles in enumerate(pages, start=1):
+        suffix = f' - Página {page_number}' if page_number > 1 else ''
+        path = os.path.join(directory, 'index.html') if page_number == 1 else os.path.join(directory, 'page', str(page_number), 'index.html')
+        write_page(path, fill_page_shell(shell, {
+            'title': escape(f'{heading}{suffix} - {site_title}'),
+            'heading': escape(heading + suffix),
+            'recent-articles-container': ''.join(render_article_card(article, root='/') for article in page_articles),
+            'recent-articles-container:after': render_pagination(page_number, len(pages), quote(base_url)),
+        }))
+    remove_stale_archive_pages(len(pages), directory)
+
+def remove_stale_listing_dirs(directory, slugs):
+    """Remove páginas de categorias ou tags que não existem mais."""
+    if not os.path.isdir(directory):
+        return
+    for entry in os.listdir(directory):
+        path = os.path.join(directory, entry)
+        if entry not in slugs and os.path.isfile(os.path.join(path, 'index.html')):
+            shutil.rmtree(path)
+
+def update_listing_pages(catalog, all_articles_data, changed_categories=None, changed_tags=None):
+    """Gera a home paginada (index.html e page/N/), as listagens de categorias e
+    tags e a página estática de cada categoria e de cada tag.
 
-    # --- Atualiza o index.html ---
+    A ordem dos artigos e os artigos de cada categoria e tag vêm das consultas
+    ao catálogo (`catalog`, já sincronizado com `all_articles_data`). Com
+    `changed_categories` / `changed_tags` (conjuntos de slugs), só as páginas
+    dessas categorias e tags são regeneradas.
+    """
+    with open('index.html', 'r', encoding='utf-8') as f:
+        index_soup = parse_html(f.read())
+    site_title = 'IAUTOMATIZE Blog'
+    
+    pages = paginate([all_articles_data[article_id] for article_id in catalog.latest()])
+    total_pages = len(pages)
+    
+    # {slug: (nome mais usado, número de artigos)}
+    categories = catalog.categories()
+    tags = catalog.tags()
+    all_categories = sorted(name for name, _ in categories.values())
+    all_tags = sorted(name for name, _ in tags.values())
+    top_categories = [name for name, _ in sorted(categories.values(), key=lambda item: (-item[1], item[0]))[:HOME_CATEGORY_LIMIT]]
+    top_tags = [name for name, _ in sorted(tags.values(), key=lambda item: (-item[1], item[0]))[:HOME_TAG_LIMIT]]
+    
+    # --- Home: artigos mais recentes, categorias e tags principais ---
+    home_html = fill_page_shell(build_page_shell(index_soup), {
+        'recent-articles-container': ''.join(render_article_card(article) for article in pages[0]),
+        'recent-articles-container:after': render_pagination(1, total_pages),
+        'categories-container': ''.join(render_category_card(category) for category in top_categories),
+        'categories-container:after': render_more_link(f'/{CATEGORIES_DIR}/', f'Ver todas as {len(all_categories)} categorias'),
+        'tags-container': ''.join(render_tag_link(tag) for tag in top_tags),
+        'tags-container:after': render_more_link(f'/{TAGS_DIR}/', f'Ver todas as {len(all_tags)} tags'),
+    })
+    write_page('index.html', home_html)
+    print(f"Adicionados {len(pages[0])} artigos à seção de últimas notícias")
+    
+    # --- Arquivo de notícias: /page/2/, /page/3/, ... ---
+    archive_shell = build_page_shell(index_soup, keep_sections={'ultimas-noticias'}, root_links=True)
+    for page_number in range(2, total_pages + 1):
+        write_page(os.path.join('page', str(page_number), 'index.html'), fill_page_shell(archive_shell, {
+            'title': escape(f'Últimas Notícias - Página {page_number} - {site_title}'),
+            'heading': escape(f'Últimas Notícias - Página {page_number}'),
+            'recent-articles-container': ''.join(render_article_card(article, root='/') for article in pages[page_number - 1]),
+            'recent-articles-container:after': render_pagination(page_number, total_pages),
+        }))
+    remove_stale_archive_pages(total_pages)
+    print(f"Geradas {total_pages} páginas de notícias")
+    
+    # --- Listagens completas de categorias e tags ---
+    categories_shell = build_page_shell(index_soup, keep_sections={'categorias'}, root_links=True)
+    write_page(os.path.join(CATEGORIES_DIR, 'index.html'), fill_page_shell(categories_shell, {
+        'title': escape(f'Categorias - {site_title}'),
+        'heading': 'Categorias',
+        'categories-container': ''.join(render_category_card(category) for category in all_categories),
+    }))
+    print(f"Adicionadas {len(all_categories)} categorias")
+    
+    tags_shell = build_page_shell(index_soup, keep_sections={'tags'}, root_links=True)
+    write_page(os.path.join(TAGS_DIR, 'index.html'), fill_page_shell(tags_shell, {
+        'title': escape(f'Tags - {site_title}'),
+        'heading': 'Tags',
+        'tags-container': ''.join(render_tag_link(tag) for tag in all_tags),
+    }))
+    print(f"Adicionadas {len(all_tags)} tags")
+    
+    # --- Páginas estáticas de cada categoria e de cada tag ---
+    for slug, (category, _) in categories.items():
+        if changed_categories is not None and slug not in changed_categories:
+            continue
+        articles = [all_articles_data[article_id] for article_id in catalog.in_category(slug)]
+        write_article_listing(archive_shell, os.path.join(CATEGORIES_DIR, slug), f'Categoria: {category}', articles, site_title)
+    remove_stale_listing_dirs(CATEGORIES_DIR, categories)
+    print(f"Geradas {len(categories)} páginas de categorias")
+    
+    for slug, (tag, _) in tags.items():
+        if changed_tags is not None and slug not in changed_tags:
+            continue
+        articles = [all_articles_data[article_id] for article_id in catalog.with_tag(slug)]
+        write_article_listing(archive_shell, os.path.join(TAGS_DIR, slug), f'Tag: {tag}', articles, site_title)
+    remove_stale_listing_dirs(TAGS_DIR, tags)
+    print(f"Geradas {len(tags)} páginas de tags")
+
+def parse_article_metadata(task):
+    """Extrai os metadados de um artigo já lido (executado em paralelo com --jobs).
+
+    Retorna (metadados, texto do corpo, erro): o texto, usado pelo catálogo,
+    sai do mesmo parsing que os metadados e as palavras-chave.
+    """
+    file_path, content = task
     try:
-        with open('index.html', 'r+', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
-
-            # --- Popula a seção de "Últimas Notícias" ---
-            recent_articles_container = soup.find(id='recent-articles-container')
-            if recent_articles_container:
-                recent_articles_container.clear() # Limpa a área
-                
-                # Pega os artigos dos últimos 3 dias (ou os 3 mais recentes, se menos de 3 disponíveis)
-                tres_dias_atras = datetime.now() - timedelta(days=3)
-                artigos_recentes = [a for a in all_articles_metadata if a['publish_date'] >= tres_dias_atras]
-                if len(artigos_recentes) < 3:
-                    artigos_recentes = all_articles_metadata[:3]  # Garante pelo menos 3 cards
-                
-                for article in artigos_recentes:
-                    date_str = formatar_data_pt(article['publish_date'])
-                    category = article['category']
-                    
-                    # Criar URL segura para a categoria
-                    safe_category = category.lower().replace(" ", "-")
-                    
-                    # Adicionar data-category ao card
-                    article_card = soup.new_tag('article', **{
-                        'class': 'article-card fade-in-on-scroll', 
-                        'data-category': safe_category
-                    })
-                    
-                    # Corrige URLs de imagem se necessário
-                    image_url = article['image_url']
-                    if not image_url.startswith(('http://', 'https://', '/')):
-                        image_url = image_url if '../' in image_url else '../' + image_url
-                    
-                    article_card.append(BeautifulSoup(f'''
-                        <div class="article-image">
-                            <a href="{article['path']}"><img src="{image_url}" alt="{article['title']}" loading="lazy"></a>
-                        </div>
-                        <div class="article-content">
-                            <h3><a href="{article['path']}">{article['title']}</a></h3>
-                            <p class="article-excerpt">{article['excerpt']}</p>
-                            <div class="article-meta">
-                                <span>Por {article['author']}</span>
-                                <time datetime="{article['publish_date'].strftime('%Y-%m-%d')}">{date_str}</time>
-                                <span class="article-category">Em <a href="/?categoria={safe_category}">{category}</a></span>
-                            </div>
-                        </div>
-                    ''', 'html.parser'))
-                    
-                    recent_articles_container.append(article_card)
-                
-                print(f"Adicionados {len(artigos_recentes)} artigos à seção de últimas notícias")
-
-            # Popula a seção de Categorias
-            categories_container = soup.find(id='categories-container')
-            if categories_container:
-                categories_container.clear()
-                all_categories = sorted(list(set(article['category'] for article in all_articles_metadata if article['category'])))
-                for category in all_categories:
-                    # Criar URL segura para a categoria
-                    safe_category = category.lower().replace(" ", "-")
-                    
-                    card = soup.new_tag('div', **{'class': 'category-card fade-in-on-scroll'})
-                    card.append(BeautifulSoup(f'''<a href="/?categoria={safe_category}" class="category-link"><i class="fas fa-robot"></i><h3>{category}</h3><p>Artigos sobre {category}</p></a>''', 'html.parser'))
-                    categories_container.append(card)
-                print(f"Adicionadas {len(all_categories)} categorias")
-
-            # Popula a seção de Tags
-            tags_container = soup.find(id='tags-container')
-            if tags_container:
-                tags_container.clear()
-                all_tags = sorted(list(set(tag for article in all_articles_metadata for tag in article['tags'])))
-                for tag in all_tags:
-                    # Criar URL segura para a tag
-                    safe_tag = tag.lower().replace(" ", "-")
-                    tag_link = soup.new_tag('a', href=f'/?tag={safe_tag}', **{'class': 'tag-link'})
-                    tag_link.string = tag
-                    tags_container.append(tag_link)
-                print(f"Adicionadas {len(all_tags)} tags")
-            
-            f.seek(0)
-            f.write(str(soup.prettify(formatter='html5')))
-            f.truncate()
-            
+        with profile_stage('metadata'):
+            with profile_stage('parse'):
+                document = parse_article(content)
+            return get_article_metadata(file_path, document=document), document['text'], None
+    except Exception as e:
+        return None, None, str(e)
+
+def render_article(task):
+    """Aplica breadcrumbs e artigos relacionados a um artigo e grava o arquivo se ele mudou.
+
+    Recebe os cards relacionados já renderizados (no processo principal, uma
+    vez por build), para que possa ser executado em um processo separado.
+    Retorna o hash do conteúdo gravado, None se o arquivo não foi alterado,
+    ou False em caso de erro. Os metadados não são extraídos de novo: o
+    <head> e o texto não mudam (breadcrumbs e relacionados ficam fora do
+    texto), então os de `metadata` valem para o conteúdo gravado.
+    """
+    file_path, metadata, cards = task
+    try:
+        soup = read_article(file_path)
+        fragments = {}
+        with profile_stage('render'):
+            changed = add_breadcrumbs_to_soup(soup, metadata, file_path, fragments)
+            if add_related_articles_to_soup(soup, file_path, cards, fragments):
+                changed = True
+        if not changed:
+            return None
+        content, written = write_article(file_path, soup, fragments)
+        if written:
+            print(f"Artigos relacionados adicionados com sucesso em {file_path}")
+        else:
+            print(f"Artigos relacionados inalterados em {file_path}")
+        return content_hash(content)
+    except Exception as e:
+        print(f"Erro ao adicionar artigos relacionados em {file_path}: {str(e)}")
+        return False
+
+def render_related_articles(related_by_id, all_articles_data, metadata_cache, profiler, jobs=1, force=()):
+    """Grava breadcrumbs e artigos relacionados nos artigos de `related_by_id`.
+
+    Artigos cujos relacionados gravados têm a mesma assinatura são pulados,
+    exceto os caminhos de `force` (parseados nesta execução). Retorna
+    {caminho: hash do conteúdo gravado} dos artigos regravados, cujos
+    metadados ficam no cache sob esse hash.
+    """
+    tasks = []
+    signatures = {}
+    for article_id, related_ids in related_by_id.items():
+        file_path = os.path.join('articles', f'{article_id}.html')
+        with profile_stage('related'):
+            signature = related_articles_signature(related_ids, all_articles_data)
+        # Conteúdo e relacionados iguais aos da última execução: nada a fazer
+        if file_path not in force and metadata_cache.related_signature(file_path) == signature:
+            print(f"Artigos relacionados inalterados em {file_path}")
+            continue
+        with profile_stage('render'):
+            cards = related_cards(related_ids, all_articles_data)
+        tasks.append((file_path, all_articles_data[article_id], cards))
+        signatures[file_path] = signature
+    
+    rendered = {}
+    for task, result in zip(tasks, profiler.map(render_article, tasks, jobs)):
+        file_path = task[0]
+        if result is False:
+            continue
+        if result is not None:
+            metadata_cache.put(file_path, result, task[1])
+            rendered[file_path] = result
+        metadata_cache.set_related_signature(file_path, signatures[file_path])
+    return rendered
+
+def write_site_indexes(all_articles_data, related_by_id, catalog, profiler, changed_categories=None, changed_tags=None):
+    """Grava os índices JSON, as páginas de listagem e o sitemap a partir dos metadados.
+
+    As listagens e o sitemap consultam o catálogo, que deve estar sincronizado
+    com `all_articles_data`.
+    """
+    # --- Índice estático de artigos relacionados (lido pelo blog-global.js) ---
+    try:
+        with profiler.stage('related_json'):
+            written = write_related_index(related_by_id, all_articles_data, formatar_data_pt)
+        print(f"Índice de artigos relacionados atualizado: {written} arquivos gravados")
+    except Exception as e:
+        print(f"Erro ao atualizar o índice de artigos relacionados: {str(e)}")
+
+    # --- Índice de busca (lido pelo blog-global.js) ---
+    try:
+        with profiler.stage('search'):
+            written = write_search_index(all_articles_data, formatar_data_pt)
+        print(f"Índice de busca atualizado: {written} arquivos gravados")
+    except Exception as e:
+        print(f"Erro ao atualizar o índice de busca: {str(e)}")
+
+    # --- Atualiza o index.html e as páginas de listagem ---
+    try:
+        with profiler.stage('index'):
+            update_listing_pages(catalog, all_articles_data, changed_categories, changed_tags)
     except Exception as e:
         print(f"Erro ao atualizar index.html: {str(e)}")
 
     # --- Atualiza o sitemap.xml ---
+    # Gerado a partir dos artigos atuais (uma URL por artigo), em streaming
     sitemap_path = 'config/sitemap.xml'
     try:
-        if os.path.exists(sitemap_path) and os.path.getsize(sitemap_path) > 10:
-            with open(sitemap_path, 'r', encoding='utf-8') as f:
-                sitemap_content = f.read()
-                try:
-                    sitemap_soup = BeautifulSoup(sitemap_content, 'xml')
-                    if not sitemap_soup.find('urlset'):
-                        raise ValueError("Sitemap não contém elemento urlset")
-                except Exception:
-                    # Se o parsing falhar, cria um novo sitemap
-                    sitemap_soup = BeautifulSoup('<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"></urlset>', 'xml')
-        else:
-            # Cria um novo sitemap
-            sitemap_soup = BeautifulSoup('<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"></urlset>', 'xml')
-            
-        existing_urls = [loc.text for loc in sitemap_soup.find_all('loc')]
-        urlset = sitemap_soup.find('urlset')
-
         # Domínio do blog - IMPORTANTE: ALTERE PARA SEU DOMÍNIO REAL
         domain = "https://blog.iautomatize.com"  # Substitua pelo seu domínio real
-        
-        # Adiciona a URL da página inicial
-        if domain not in existing_urls:
-            url_element = sitemap_soup.new_tag('url')
-            loc_element = sitemap_soup.new_tag('loc')
-            loc_element.string = domain
-            lastmod_element = sitemap_soup.new_tag('lastmod')
-            lastmod_element.string = datetime.now().strftime('%Y-%m-%d')
-            url_element.append(loc_element)
-            url_element.append(lastmod_element)
-            urlset.append(url_element)
-
-        # Adiciona URLs dos artigos
-        for article in all_articles_metadata:
-            # Formata a URL corretamente
-            article_path = article['path'].replace('\\', '/')
-            url = f"{domain}/{article_path}"
-            
-            if url not in existing_urls:
-                url_element = sitemap_soup.new_tag('url')
-                
-                loc_element = sitemap_soup.new_tag('loc')
-                loc_element.string = url
-                url_element.append(loc_element)
-                
-                lastmod_element = sitemap_soup.new_tag('lastmod')
-                lastmod_element.string = article['publish_date'].strftime('%Y-%m-%d')
-                url_element.append(lastmod_element)
-                
-                urlset.append(url_element)
-        
-        with open(sitemap_path, 'w', encoding='utf-8') as f:
-            f.write(str(sitemap_soup.prettify()))
-        print(f"Sitemap atualizado com {len(sitemap_soup.find_all('url'))} URLs")
+        with profiler.stage('sitemap'):
+            url_count = write_sitemap(catalog.iter_latest(), sitemap_path, domain, catalog.last_modified())
+        print(f"Sitemap atualizado com {url_count} URLs")
             
     except Exception as e:
         print(f"Erro ao atualizar sitemap.xml: {str(e)}")
 
+def article_filenames(articles_dir='articles'):
+    """Arquivos de artigo na ordem de listagem do diretório.
+
+    É o critério de desempate dos relacionados e das listagens, então todo
+    código que monta os metadados do acervo deve usar esta mesma ordem.
+    """
+    return [filename for filename in os.listdir(articles_dir) if filename.endswith('.html')]
+
+def update_files(jobs=1, profile=None, similarity=False):
+    """Função principal para atualizar o index.html e sitemap.xml.
+
+    Com `jobs` > 1, o parsing e a renderização de cada artigo são distribuídos
+    entre processos; as etapas globais continuam no processo principal. Com
+    `profile` (caminho do relatório, ou '' para o padrão), o tempo de cada
+    etapa é medido e um relatório JSON é gravado ao final. Com `similarity`,
+    os artigos relacionados também são pontuados pela similaridade do texto.
+    
+    Retorna (metadados por artigo, relacionados por artigo, cache de
+    metadados, catálogo), o estado usado pelo modo --watch.
+    """
+    profiler = BuildProfiler('update_script', profile, jobs)
+    articles_dir = 'articles'
+    all_articles_data = {}  # Para análise de artigos relacionados
+    
+    article_files = article_filenames(articles_dir)
+    metadata_cache = ArticleMetadataCache('update_script_metadata')
+    catalog = ArticleCatalog()
+    catalog_hashes = catalog.hashes()
+    bodies = {}  # Texto do corpo dos artigos que mudaram desde a última sincronização do catálogo
+    hashes = {}  # Hash de cada artigo como está gravado em disco
+    
+    # Coleta metadados de todos os artigos (apenas arquivos novos ou alterados são parseados)
+    collected = {}
+    pending = []
+    for filename in article_files:
+        file_path = os.path.join(articles_dir, filename)
+        try:
+            with profiler.article(file_path):
+                content = read_article_source(file_path)
+        except Exception as e:
+            print(f"Erro ao processar {filename}: {str(e)}")
+            continue
+        with profiler.stage('cache'):
+            digest = content_hash(content)
+            metadata = metadata_cache.get(file_path, digest)
+        article_id = filename.replace('.html', '')
+        hashes[article_id] = digest
+        if metadata is None:
+            pending.append((filename, file_path, digest, content))
+            continue
+        collected[filename] = metadata
+        if catalog_hashes.get(article_id) != digest:
+            with profiler.stage('catalog'):
+                bodies[article_id] = extract_text(content)
+    
+    # Um único parsing por artigo alterado fornece metadados, termos e o texto do catálogo;
+    # a árvore de reescrita é montada apenas na renderização
+    results = profiler.map(parse_article_metadata, [(file_path, content) for _, file_path, _, content in pending], jobs)
+    parsed = {file_path for _, file_path, _, _ in pending}
+    for (filename, file_path, digest, _), (metadata, text, error) in zip(pending, results):
+        if metadata is None:
+            print(f"Erro ao processar {filename}: {error}")
+            continue
+        metadata_cache.put(file_path, digest, metadata)
+        collected[filename] = metadata
+        bodies[filename.replace('.html', '')] = text
+    
+    # Mantém a ordem de listagem do diretório (usada como critério de desempate)
+    for filename in article_files:
+        if filename in collected:
+            # Adicionar ao dicionário para análise de artigos relacionados
+            article_id = filename.replace('.html', '')
+            all_articles_data[article_id] = collected[filename]
+            
+            print(f"Processado: {filename}")
+    
+    print(f"Cache de metadados: {metadata_cache.hits} reaproveitados, {metadata_cache.misses} parseados")
+    
+    with profiler.stage('keywords'):
+        assign_corpus_keywords(all_articles_data)
+
+    # Adicionar breadcrumbs e artigos relacionados a cada artigo, gravando cada arquivo no máximo uma vez
+    print("\n=== Adicionando artigos relacionados ===")
+    with profiler.stage('related'):
+        related_index = build_related_index(all_articles_data, similarity)
+    related_by_id = {}
+    for filename in article_files:
+        file_path = os.path.join(articles_dir, filename)
+        article_id = filename.replace('.html', '')
+        if article_id not in all_articles_data:
+            with profiler.article(file_path):
+                add_related_articles_to_article(file_path, all_articles_data, all_articles_data)
+            continue
+        with profiler.stage('related'):
+            related_by_id[article_id] = related_index.find(article_id, num_related=3)
+    rendered = render_related_articles(related_by_id, all_articles_data, metadata_cache, profiler, jobs, force=parsed)
+    # O catálogo guarda o hash do arquivo final; o texto extraído continua válido,
+    # já que breadcrumbs e relacionados ficam fora dele
+    for file_path, digest in rendered.items():
+        hashes[os.path.basename(file_path)[:-len('.html')]] = digest
+    
+    print(f"Metadados alterados desde a última execução: {len(metadata_cache.changed())}")
+    with profiler.stage('cache'):
+        metadata_cache.save()
+    with profiler.stage('catalog'):
+        changes = catalog.sync(all_articles_data, bodies, hashes)
+    print(f"Catálogo de artigos: {changes} artigos alterados, {len(bodies)} textos indexados")
+    
+    write_site_indexes(all_articles_data, related_by_id, catalog, profiler)
+    
+    profiler.finish()
+    return all_articles_data, related_by_id, metadata_cache, catalog
+
+# --- Modo --watch: rebuild incremental a cada artigo publicado ---
+WATCH_INTERVAL = 1.0  # segundos entre verificações do diretório articles/
+
+def article_signatures(articles_dir='articles'):
+    """{nome do arquivo: (tamanho, data de modificação)} de cada artigo."""
+    signatures = {}
+    with os.scandir(articles_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.html'):
+                stat = entry.stat()
+                signatures[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return signatures
+
+def listing_slugs(metadata):
+    """(slugs de categoria, slugs de tags) das listagens em que um artigo aparece."""
+    return {slugify(metadata['category'])}, {slugify(tag) for tag in metadata['tags']}
+
+class IncrementalBuild:
+    """Estado do build mantido em memória pelo modo --watch.
+
+    Guarda os metadados de todos os artigos e os relacionados de cada um; o
+    grafo reverso (artigo -> artigos que o exibem entre os relacionados)
+    indica quais artigos precisam ser regravados quando um artigo muda.
+    """
+
+    def __init__(self, article_data, related_by_id, metadata_cache, catalog, jobs=1, similarity=False, articles_dir='articles'):
+        self.article_data = article_data
+        self.related_by_id = related_by_id
+        self.metadata_cache = metadata_cache
+        self.catalog = catalog
+        self.jobs = jobs
+        self.similarity = similarity
+        self.articles_dir = articles_dir
+        self.signatures = article_signatures(articles_dir)
+
+    def shown_in(self):
+        """Grafo reverso dos relacionados: artigo -> artigos em que ele aparece."""
+        graph = defaultdict(set)
+        for article_id, related_ids in self.related_by_id.items():
+            for related_id in related_ids:
+                graph[related_id].add(article_id)
+        return graph
+
+    def poll(self):
+        """(assinaturas atuais, arquivos novos ou alterados, arquivos removidos)."""
+        current = article_signatures(self.articles_dir)
+        changed = {filename for filename, signature in current.items() if self.signatures.get(filename) != signature}
+        return current, changed, set(self.signatures) - set(current)
+
+    def apply(self, current, changed, removed):
+        """Atualiza só o que depende dos arquivos alterados e removidos.
+
+        Regrava os artigos alterados, os artigos cuja lista de relacionados
+        mudou e os que exibem um artigo alterado; os índices JSON, a home e
+        o sitemap; e só as páginas das categorias e tags (antigas e novas)
+        dos artigos alterados. Os fragmentos renderizados e o manifesto de
+        imagens são descartados antes, como em um processo novo.
+        """
+        started = time.perf_counter()
+        reset_render_caches()
+        profiler = BuildProfiler('update_script', None, self.jobs)
+        shown_in = self.shown_in()
+        changed_ids = set()
+        changed_categories, changed_tags = set(), set()
+        parsed = set()
+        bodies, hashes = {}, {}
+        catalog_hashes = self.catalog.hashes()
+        for filename in sorted(changed | removed):
+            article_id = filename[:-len('.html')]
+            file_path = os.path.join(self.articles_dir, filename)
+            if article_id in self.article_data:
+                categories, tags = listing_slugs(self.article_data[article_id])
+                changed_categories |= categories
+                changed_tags |= tags
+            changed_ids.add(article_id)
+            if filename in removed:
+                self.article_data.pop(article_id, None)
+                self.metadata_cache.discard(file_path)
+                print(f"Removido: {filename}")
+                continue
+            try:
+                content = read_article_source(file_path)
+            except Exception as e:
+                print(f"Erro ao processar {filename}: {str(e)}")
+                self.article_data.pop(article_id, None)
+                continue
+            digest = content_hash(content)
+            hashes[article_id] = digest
+            metadata = self.metadata_cache.get(file_path, digest)
+            if metadata is None:
+                metadata, text, error = parse_article_metadata((file_path, content))
+                if metadata is None:
+                    print(f"Erro ao processar {filename}: {error}")
+                    self.article_data.pop(article_id, None)
+                    continue
+                self.metadata_cache.put(file_path, digest, metadata)
+                bodies[article_id] = text
+            elif catalog_hashes.get(article_id) != digest:
+                bodies[article_id] = extract_text(content)
+            self.article_data[article_id] = metadata
+            parsed.add(file_path)
+            categories, tags = listing_slugs(metadata)
+            changed_categories |= categories
+            changed_tags |= tags
+            print(f"Processado: {filename}")
+
+        # Mesma ordem de um build completo (ordem do diretório, critério de desempate)
+        order = [filename[:-len('.html')] for filename in article_filenames(self.articles_dir)]
+        self.article_data = {article_id: self.article_data[article_id] for article_id in order if article_id in self.article_data}
+        assign_corpus_keywords(self.article_data)
+        related_index = build_related_index(self.article_data, self.similarity)
+        previous_related = self.related_by_id
+        self.related_by_id = {article_id: related_index.find(article_id, num_related=3) for article_id in self.article_data}
+
+        affected = {
+            article_id for article_id, related_ids in self.related_by_id.items()
+            if article_id in changed_ids or previous_related.get(article_id) != related_ids
+        }
+        for article_id in changed_ids:
+            affected |= shown_in.get(article_id, set())
+        affected &= set(self.related_by_id)
+        rendered = render_related_articles(
+            {article_id: self.related_by_id[article_id] for article_id in affected},
+            self.article_data, self.metadata_cache, profiler, self.jobs, force=parsed,
+        )
+        # Só o hash muda com a gravação; os metadados são os do parsing acima
+        for file_path, digest in rendered.items():
+            hashes[os.path.basename(file_path)[:-len('.html')]] = digest
+        self.metadata_cache.save()
+        self.catalog.sync(self.article_data, bodies, hashes)
+        write_site_indexes(self.article_data, self.related_by_id, self.catalog, profiler, changed_categories, changed_tags)
+
+        # Arquivos regravados aqui não contam como alterações na próxima verificação
+        self.signatures = dict(current)
+        latest = article_signatures(self.articles_dir)
+        for file_path in rendered:
+            filename = os.path.basename(file_path)
+            if filename in latest:
+                self.signatures[filename] = latest[filename]
+        print(f"\nRebuild incremental: {len(changed_ids)} artigos alterados, {len(rendered)} artigos renderizados, "
+              f"{len(changed_categories)} categorias e {len(changed_tags)} tags em {time.perf_counter() - started:.2f}s")
+
+def watch_files(jobs=1, profile=None, similarity=False, interval=WATCH_INTERVAL):
+    """Build completo seguido de rebuilds incrementais a cada artigo novo, alterado ou removido."""
+    build = IncrementalBuild(*update_files(jobs, profile, similarity), jobs=jobs, similarity=similarity)
+    print(f"\n=== Observando {build.articles_dir}/ (Ctrl+C para encerrar) ===")
+    try:
+        while True:
+            time.sleep(interval)
+            current, changed, removed = build.poll()
+            if not (changed or removed):
+                continue
+            # Espera o arquivo parar de mudar (editor ou git ainda gravando)
+            time.sleep(interval)
+            if article_signatures(build.articles_dir) != current:
+                continue
+            print(f"\n=== {len(changed)} artigos novos ou alterados, {len(removed)} removidos ===")
+            build.apply(current, changed, removed)
+    except KeyboardInterrupt:
+        print("\nModo watch encerrado")
+
 if __name__ == '__main__':
-    update_files()
+    parser = argparse.ArgumentParser(description='Atualiza artigos, index.html e sitemap.xml do blog.')
+    add_jobs_argument(parser)
+    add_profile_argument(parser)
+    add_similarity_argument(parser)
+    parser.add_argument('--watch', action='store_true', help='após o build, observa articles/ e refaz só o que cada artigo alterado afeta')
+    parser.add_argument('--interval', type=float, default=WATCH_INTERVAL, help=f'segundos entre verificações no modo --watch (padrão: {WATCH_INTERVAL})')
+    args = parser.parse_args()
+    if args.watch:
+        watch_files(jobs=args.jobs, profile=args.profile, similarity=args.similarity, interval=args.interval)
+    else:
+        update_files(jobs=args.jobs, profile=args.profile, similarity=args.similarity)